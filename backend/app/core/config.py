@@ -22,6 +22,70 @@ class Settings(BaseModel):
     OPENROUTER_API_KEY: Optional[str] = None
     OPENROUTER_SITE_URL: Optional[str] = "http://localhost:3000"
     OPENROUTER_SITE_NAME: Optional[str] = "Scriptodon Test Automation Platform"
+    OPENROUTER_BASE_URL: str = "https://openrouter.ai/api/v1"
+    
+    # Outbound HTTP client (shared, pooled)
+    HTTP_CONNECT_TIMEOUT: float = 10.0
+    HTTP_READ_TIMEOUT: float = 120.0
+    HTTP_MAX_CONNECTIONS: int = 100
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    HTTP_KEEPALIVE_EXPIRY: float = 30.0
+    HTTP2_ENABLED: bool = True
+    
+    # LLM response cache
+    LLM_CACHE_ENABLED: bool = True
+    LLM_CACHE_PATH: str = "llm_cache.db"
+    LLM_CACHE_TTL_SECONDS: int = 7 * 24 * 60 * 60  # 7 days
+    LLM_CACHE_MAX_ENTRIES: int = 5000
+    LLM_CACHE_MAX_BYTES: int = 200 * 1024 * 1024  # 200MB
+    
+    # Model routing: requests go to the fastest healthy model of LLM_MODELS (comma-separated)
+    LLM_MODELS: str = "qwen/qwen-2.5-72b-instruct:free"
+    LLM_REQUEST_TIMEOUT_SECONDS: float = 120.0  # per model attempt, then the next model is tried
+    LLM_HEDGING_ENABLED: bool = False  # also ask the next model once the first passes its p95 latency
+    LLM_ROUTER_EWMA_ALPHA: float = 0.3
+    LLM_ROUTER_MAX_ERROR_RATE: float = 0.5  # error-rate EWMA at which a model is skipped
+    LLM_ROUTER_COOLDOWN_SECONDS: float = 30.0  # before a skipped model is tried again
+    LLM_ROUTER_STALE_MINUTES: float = 30.0  # unused this long, a model's latency is measured afresh
+    
+    # OpenRouter request scheduling: client-side rate limits (0 = off), retries and circuit breaker
+    LLM_RATE_LIMIT_RPM: int = 0
+    LLM_RATE_LIMIT_TPM: int = 0
+    LLM_MAX_RETRIES: int = 3
+    LLM_RETRY_BASE_SECONDS: float = 1.0
+    LLM_RETRY_MAX_SECONDS: float = 30.0  # a longer Retry-After fails the attempt instead
+    LLM_CIRCUIT_FAILURE_THRESHOLD: int = 5  # consecutive 5xx/connection errors/timeouts per model
+    LLM_CIRCUIT_RESET_SECONDS: float = 30.0
+    
+    # LLM token budgets and usage accounting
+    LLM_CONTEXT_TOKENS: int = 32768  # context window of models not listed in LLM_CONTEXT_WINDOWS
+    LLM_CONTEXT_WINDOWS: str = ""  # per-model overrides, "model=tokens,model=tokens"
+    LLM_MAX_COMPLETION_TOKENS: int = 4096  # reserved for the answer and sent as max_tokens
+    LLM_USAGE_ACCOUNTING: bool = True  # one llm_usage row per completion
+    
+    # Chunked test generation for large Swagger specs
+    GENERATION_CHUNK_SIZE: int = 20  # endpoints per LLM call
+    GENERATION_CHUNK_CONCURRENCY: int = 4
+    SPEC_INDEX_CACHE_SIZE: int = 16  # parsed Swagger specs kept in memory, keyed by content hash
+    
+    # Background jobs
+    JOB_WORKERS: int = 4
+    JOB_QUEUE_PERSISTENT: bool = True
+    JOB_QUEUE_DB_PATH: str = "jobs.db"
+    JOB_CONCURRENCY_TEST_GENERATION: int = 2
+    JOB_CONCURRENCY_TEST_EXECUTION: int = 2
+    JOB_CONCURRENCY_SCRIPT_GENERATION: int = 2
+    
+    # Script execution
+    EXECUTION_MAX_WORKERS: int = 0  # 0 = number of CPU cores
+    EXECUTION_TIMEOUT_SECONDS: float = 300.0
+    EXECUTION_MEMORY_LIMIT_MB: int = 2048  # 0 = unlimited
+    EXECUTION_MAX_OUTPUT_BYTES: int = 1024 * 1024
+    EXECUTION_ENV_PASSTHROUGH: str = ""  # extra environment variables scripts may see, comma-separated
+    EXECUTION_SHARDS: int = 4
+    EXECUTION_RESULT_BATCH_SIZE: int = 50
+    EXECUTION_DEFAULT_CASE_SECONDS: float = 1.0  # predicted duration for cases with no history
+    EXECUTION_FLAKY_THRESHOLD: float = 0.2  # share of pass/fail flips that marks a case flaky
     
     # File Upload
     UPLOAD_DIR: str = "uploads"
@@ -29,11 +93,30 @@ class Settings(BaseModel):
     
     # Database
     DATABASE_URL: str = "sqlite:///./scritodon.db"
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_RECYCLE: int = 1800  # seconds
+    DB_POOL_TIMEOUT: int = 30  # seconds
+    SQLITE_WAL_ENABLED: bool = True
+    SQLITE_SYNCHRONOUS: str = "NORMAL"
+    SQLITE_MMAP_SIZE: int = 256 * 1024 * 1024  # 256MB
+    SQLITE_CACHE_SIZE_KB: int = 64 * 1024  # 64MB page cache per connection
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    
+    # Write coalescing (groups small commits into one transaction per tick)
+    WRITE_COALESCING_ENABLED: bool = False
+    WRITE_COALESCING_INTERVAL_MS: int = 20
+    WRITE_COALESCING_MAX_BATCH: int = 200
     
     # Jira Configuration
     JIRA_SERVER_URL: Optional[str] = None
     JIRA_USERNAME: Optional[str] = None
     JIRA_API_TOKEN: Optional[str] = None
+    JIRA_SEARCH_PAGE_SIZE: int = 100  # issues per /rest/api/3/search page
+    JIRA_SEARCH_CONCURRENCY: int = 4  # pages fetched in parallel
+    JIRA_SEARCH_MAX_ISSUES: int = 1000  # cap per bulk import
+    JIRA_WEBHOOK_SECRET: Optional[str] = None  # when set, /api/jira/webhook requires it
+    JIRA_ACCEPTANCE_CRITERIA_FIELD: Optional[str] = None  # custom field id, e.g. customfield_10035
     
     # Environment
     ENVIRONMENT: str = "development"
@@ -44,10 +127,77 @@ def get_settings():
         OPENROUTER_API_KEY=os.getenv("OPENROUTER_API_KEY"),
         OPENROUTER_SITE_URL=os.getenv("OPENROUTER_SITE_URL", "http://localhost:3000"),
         OPENROUTER_SITE_NAME=os.getenv("OPENROUTER_SITE_NAME", "Scriptodon Test Automation Platform"),
+        OPENROUTER_BASE_URL=os.getenv("OPENROUTER_BASE_URL", "https://openrouter.ai/api/v1"),
+        HTTP_CONNECT_TIMEOUT=float(os.getenv("HTTP_CONNECT_TIMEOUT", "10")),
+        HTTP_READ_TIMEOUT=float(os.getenv("HTTP_READ_TIMEOUT", "120")),
+        HTTP_MAX_CONNECTIONS=int(os.getenv("HTTP_MAX_CONNECTIONS", "100")),
+        HTTP_MAX_KEEPALIVE_CONNECTIONS=int(os.getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", "20")),
+        HTTP_KEEPALIVE_EXPIRY=float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "30")),
+        HTTP2_ENABLED=os.getenv("HTTP2_ENABLED", "true").lower() == "true",
+        LLM_CACHE_ENABLED=os.getenv("LLM_CACHE_ENABLED", "true").lower() == "true",
+        LLM_CACHE_PATH=os.getenv("LLM_CACHE_PATH", "llm_cache.db"),
+        LLM_CACHE_TTL_SECONDS=int(os.getenv("LLM_CACHE_TTL_SECONDS", str(7 * 24 * 60 * 60))),
+        LLM_CACHE_MAX_ENTRIES=int(os.getenv("LLM_CACHE_MAX_ENTRIES", "5000")),
+        LLM_CACHE_MAX_BYTES=int(os.getenv("LLM_CACHE_MAX_BYTES", str(200 * 1024 * 1024))),
+        LLM_MODELS=os.getenv("LLM_MODELS", "qwen/qwen-2.5-72b-instruct:free"),
+        LLM_REQUEST_TIMEOUT_SECONDS=float(os.getenv("LLM_REQUEST_TIMEOUT_SECONDS", "120")),
+        LLM_HEDGING_ENABLED=os.getenv("LLM_HEDGING_ENABLED", "false").lower() == "true",
+        LLM_ROUTER_EWMA_ALPHA=float(os.getenv("LLM_ROUTER_EWMA_ALPHA", "0.3")),
+        LLM_ROUTER_MAX_ERROR_RATE=float(os.getenv("LLM_ROUTER_MAX_ERROR_RATE", "0.5")),
+        LLM_ROUTER_COOLDOWN_SECONDS=float(os.getenv("LLM_ROUTER_COOLDOWN_SECONDS", "30")),
+        LLM_ROUTER_STALE_MINUTES=float(os.getenv("LLM_ROUTER_STALE_MINUTES", "30")),
+        LLM_RATE_LIMIT_RPM=int(os.getenv("LLM_RATE_LIMIT_RPM", "0")),
+        LLM_RATE_LIMIT_TPM=int(os.getenv("LLM_RATE_LIMIT_TPM", "0")),
+        LLM_MAX_RETRIES=int(os.getenv("LLM_MAX_RETRIES", "3")),
+        LLM_RETRY_BASE_SECONDS=float(os.getenv("LLM_RETRY_BASE_SECONDS", "1")),
+        LLM_RETRY_MAX_SECONDS=float(os.getenv("LLM_RETRY_MAX_SECONDS", "30")),
+        LLM_CIRCUIT_FAILURE_THRESHOLD=int(os.getenv("LLM_CIRCUIT_FAILURE_THRESHOLD", "5")),
+        LLM_CIRCUIT_RESET_SECONDS=float(os.getenv("LLM_CIRCUIT_RESET_SECONDS", "30")),
+        LLM_CONTEXT_TOKENS=int(os.getenv("LLM_CONTEXT_TOKENS", "32768")),
+        LLM_CONTEXT_WINDOWS=os.getenv("LLM_CONTEXT_WINDOWS", ""),
+        LLM_MAX_COMPLETION_TOKENS=int(os.getenv("LLM_MAX_COMPLETION_TOKENS", "4096")),
+        LLM_USAGE_ACCOUNTING=os.getenv("LLM_USAGE_ACCOUNTING", "true").lower() == "true",
+        GENERATION_CHUNK_SIZE=int(os.getenv("GENERATION_CHUNK_SIZE", "20")),
+        GENERATION_CHUNK_CONCURRENCY=int(os.getenv("GENERATION_CHUNK_CONCURRENCY", "4")),
+        SPEC_INDEX_CACHE_SIZE=int(os.getenv("SPEC_INDEX_CACHE_SIZE", "16")),
+        JOB_WORKERS=int(os.getenv("JOB_WORKERS", "4")),
+        JOB_QUEUE_PERSISTENT=os.getenv("JOB_QUEUE_PERSISTENT", "true").lower() == "true",
+        JOB_QUEUE_DB_PATH=os.getenv("JOB_QUEUE_DB_PATH", "jobs.db"),
+        JOB_CONCURRENCY_TEST_GENERATION=int(os.getenv("JOB_CONCURRENCY_TEST_GENERATION", "2")),
+        JOB_CONCURRENCY_TEST_EXECUTION=int(os.getenv("JOB_CONCURRENCY_TEST_EXECUTION", "2")),
+        JOB_CONCURRENCY_SCRIPT_GENERATION=int(os.getenv("JOB_CONCURRENCY_SCRIPT_GENERATION", "2")),
+        EXECUTION_MAX_WORKERS=int(os.getenv("EXECUTION_MAX_WORKERS", "0")),
+        EXECUTION_TIMEOUT_SECONDS=float(os.getenv("EXECUTION_TIMEOUT_SECONDS", "300")),
+        EXECUTION_MEMORY_LIMIT_MB=int(os.getenv("EXECUTION_MEMORY_LIMIT_MB", "2048")),
+        EXECUTION_MAX_OUTPUT_BYTES=int(os.getenv("EXECUTION_MAX_OUTPUT_BYTES", str(1024 * 1024))),
+        EXECUTION_ENV_PASSTHROUGH=os.getenv("EXECUTION_ENV_PASSTHROUGH", ""),
+        EXECUTION_SHARDS=int(os.getenv("EXECUTION_SHARDS", "4")),
+        EXECUTION_RESULT_BATCH_SIZE=int(os.getenv("EXECUTION_RESULT_BATCH_SIZE", "50")),
+        EXECUTION_DEFAULT_CASE_SECONDS=float(os.getenv("EXECUTION_DEFAULT_CASE_SECONDS", "1.0")),
+        EXECUTION_FLAKY_THRESHOLD=float(os.getenv("EXECUTION_FLAKY_THRESHOLD", "0.2")),
+        UPLOAD_DIR=os.getenv("UPLOAD_DIR", "uploads"),
+        MAX_FILE_SIZE=int(os.getenv("MAX_FILE_SIZE", str(10 * 1024 * 1024))),
         DATABASE_URL=os.getenv("DATABASE_URL", "sqlite:///./scritodon.db"),
+        DB_POOL_SIZE=int(os.getenv("DB_POOL_SIZE", "5")),
+        DB_MAX_OVERFLOW=int(os.getenv("DB_MAX_OVERFLOW", "10")),
+        DB_POOL_RECYCLE=int(os.getenv("DB_POOL_RECYCLE", "1800")),
+        DB_POOL_TIMEOUT=int(os.getenv("DB_POOL_TIMEOUT", "30")),
+        SQLITE_WAL_ENABLED=os.getenv("SQLITE_WAL_ENABLED", "true").lower() == "true",
+        SQLITE_SYNCHRONOUS=os.getenv("SQLITE_SYNCHRONOUS", "NORMAL"),
+        SQLITE_MMAP_SIZE=int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024))),
+        SQLITE_CACHE_SIZE_KB=int(os.getenv("SQLITE_CACHE_SIZE_KB", str(64 * 1024))),
+        SQLITE_BUSY_TIMEOUT_MS=int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000")),
+        WRITE_COALESCING_ENABLED=os.getenv("WRITE_COALESCING_ENABLED", "false").lower() == "true",
+        WRITE_COALESCING_INTERVAL_MS=int(os.getenv("WRITE_COALESCING_INTERVAL_MS", "20")),
+        WRITE_COALESCING_MAX_BATCH=int(os.getenv("WRITE_COALESCING_MAX_BATCH", "200")),
         JIRA_SERVER_URL=os.getenv("JIRA_SERVER_URL"),
         JIRA_USERNAME=os.getenv("JIRA_USERNAME"),
         JIRA_API_TOKEN=os.getenv("JIRA_API_TOKEN"),
+        JIRA_SEARCH_PAGE_SIZE=int(os.getenv("JIRA_SEARCH_PAGE_SIZE", "100")),
+        JIRA_SEARCH_CONCURRENCY=int(os.getenv("JIRA_SEARCH_CONCURRENCY", "4")),
+        JIRA_SEARCH_MAX_ISSUES=int(os.getenv("JIRA_SEARCH_MAX_ISSUES", "1000")),
+        JIRA_WEBHOOK_SECRET=os.getenv("JIRA_WEBHOOK_SECRET") or None,
+        JIRA_ACCEPTANCE_CRITERIA_FIELD=os.getenv("JIRA_ACCEPTANCE_CRITERIA_FIELD") or None,
         ENVIRONMENT=os.getenv("ENVIRONMENT", "development")
     )
 
@@ -1,13 +1,71 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from typing import Any, Dict
+import os
 from app.core.config import settings
 
+def _is_sqlite(url: str) -> bool:
+    return url.startswith("sqlite")
+
+def _async_database_url(url: str) -> str:
+    """Map the configured URL onto its asyncio driver (aiosqlite or asyncpg)"""
+    if url.startswith("sqlite:"):
+        return url.replace("sqlite:", "sqlite+aiosqlite:", 1)
+    if url.startswith("postgres://"):
+        return url.replace("postgres://", "postgresql+asyncpg://", 1)
+    if url.startswith("postgresql://"):
+        return url.replace("postgresql://", "postgresql+asyncpg://", 1)
+    return url
+
+def _pool_options() -> Dict[str, Any]:
+    return {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_pre_ping": True
+    }
+
+def _engine_options(url: str, is_async: bool) -> Dict[str, Any]:
+    if not _is_sqlite(url):
+        return _pool_options()
+    options: Dict[str, Any] = {"connect_args": {"check_same_thread": False}}
+    if is_async and ":memory:" not in url:
+        # aiosqlite defaults to NullPool, which opens a connection (and a thread) per session
+        options.update(poolclass=AsyncAdaptedQueuePool, **_pool_options())
+    return options
+
+def _apply_sqlite_pragmas(dbapi_connection, connection_record):
+    """Tune every new SQLite connection: WAL lets readers run alongside the single writer"""
+    cursor = dbapi_connection.cursor()
+    if settings.SQLITE_WAL_ENABLED:
+        cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute(f"PRAGMA synchronous={settings.SQLITE_SYNCHRONOUS}")
+    cursor.execute(f"PRAGMA mmap_size={int(settings.SQLITE_MMAP_SIZE)}")
+    # Negative cache_size is in KiB rather than pages
+    cursor.execute(f"PRAGMA cache_size=-{int(settings.SQLITE_CACHE_SIZE_KB)}")
+    cursor.execute(f"PRAGMA busy_timeout={int(settings.SQLITE_BUSY_TIMEOUT_MS)}")
+    cursor.close()
+
 engine = create_engine(
-    settings.DATABASE_URL, connect_args={"check_same_thread": False}
+    settings.DATABASE_URL, **_engine_options(settings.DATABASE_URL, is_async=False)
 )
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+async_engine = create_async_engine(
+    _async_database_url(settings.DATABASE_URL), **_engine_options(settings.DATABASE_URL, is_async=True)
+)
+if _is_sqlite(settings.DATABASE_URL):
+    event.listen(engine, "connect", _apply_sqlite_pragmas)
+    event.listen(async_engine.sync_engine, "connect", _apply_sqlite_pragmas)
+
+AsyncSessionLocal = sessionmaker(
+    async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+)
+
 Base = declarative_base()
 
 def get_db():
@@ -17,9 +75,51 @@ def get_db():
     finally:
         db.close()
 
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
 def create_tables():
+    """Create any missing tables straight from the models (throwaway databases, benchmarks).
+
+    Real deployments should use run_migrations() so schema changes reach existing databases.
+    """
     from app.models.input_source import InputSource
     from app.models.test_case import TestCase
     from app.models.test_run import TestRun
     from app.models.script import Script
-    Base.metadata.create_all(bind=engine) 
\ No newline at end of file
+    from app.models.test_case_result import TestCaseResult
+    from app.models.test_case_duration import TestCaseDuration
+    from app.models.jira_issue import JiraIssue
+    from app.models.llm_usage import LLMUsage
+    Base.metadata.create_all(bind=engine)
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "migrations")
+BASELINE_REVISION = "0001"
+
+def run_migrations():
+    """Upgrade the database to the latest Alembic revision.
+
+    Databases created by create_tables() have tables but no alembic_version. Those
+    already holding every current table came from today's models and are stamped at
+    head; older ones are stamped at the baseline and upgraded from there.
+    """
+    from alembic import command
+    from alembic.config import Config
+    from sqlalchemy import inspect
+    import app.models  # noqa: F401 - registers every table on Base.metadata
+
+    config = Config()
+    config.set_main_option("script_location", MIGRATIONS_DIR)
+    config.set_main_option("sqlalchemy.url", settings.DATABASE_URL)
+    with engine.begin() as connection:
+        config.attributes["connection"] = connection
+        tables = set(inspect(connection).get_table_names())
+        if "input_sources" in tables and "alembic_version" not in tables:
+            current = tables.issuperset(Base.metadata.tables)
+            command.stamp(config, "head" if current else BASELINE_REVISION)
+        command.upgrade(config, "head")
+
+async def dispose_engines():
+    await async_engine.dispose()
+    engine.dispose()
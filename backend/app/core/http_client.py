@@ -0,0 +1,38 @@
+import httpx
+from typing import Optional
+from app.core.config import settings
+
+_client: Optional[httpx.AsyncClient] = None
+
+def _http2_available() -> bool:
+    """HTTP/2 needs the optional `h2` package (installed via httpx[http2])"""
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+def get_http_client() -> httpx.AsyncClient:
+    """Return the process-wide pooled async HTTP client, creating it on first use"""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            timeout=httpx.Timeout(
+                settings.HTTP_READ_TIMEOUT,
+                connect=settings.HTTP_CONNECT_TIMEOUT
+            ),
+            limits=httpx.Limits(
+                max_connections=settings.HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY
+            ),
+            http2=settings.HTTP2_ENABLED and _http2_available()
+        )
+    return _client
+
+async def close_http_client():
+    """Close the shared client and release pooled connections"""
+    global _client
+    if _client is not None and not _client.is_closed:
+        await _client.aclose()
+    _client = None
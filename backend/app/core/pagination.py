@@ -0,0 +1,71 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, Iterable, List, Optional, Sequence
+from fastapi import HTTPException, Request, Response
+from sqlalchemy import tuple_
+from sqlalchemy.orm import load_only
+
+MAX_PAGE_SIZE = 1000
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Opaque, URL-safe cursor for the sort key of the last row on a page"""
+    payload = [value.isoformat() if isinstance(value, datetime) else value for value in values]
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str, types: Sequence[type]) -> List[Any]:
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        if len(payload) != len(types):
+            raise ValueError("wrong number of cursor values")
+        return [
+            datetime.fromisoformat(value) if kind is datetime else kind(value)
+            for value, kind in zip(payload, types)
+        ]
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def parse_fields(fields: Optional[str], allowed: Iterable[str], default: Iterable[str]) -> List[str]:
+    """Resolve a comma-separated `fields=` projection; `id` is always included"""
+    allowed = list(allowed)
+    if not fields:
+        requested = list(default)
+    else:
+        requested = [field.strip() for field in fields.split(",") if field.strip()]
+        unknown = [field for field in requested if field not in allowed]
+        if unknown:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unknown fields: {', '.join(unknown)}. Allowed: {', '.join(allowed)}"
+            )
+    return ["id"] + [field for field in allowed if field in requested and field != "id"]
+
+def keyset_page(query, model, fields: List[str], sort_columns: Sequence, cursor: Optional[str], limit: int):
+    """Apply projection, keyset filter, ordering and limit (one extra row to detect a next page).
+
+    Columns outside `fields` are never loaded, so large Text columns cost nothing
+    unless they are asked for. The sort columns are always loaded to build the cursor.
+    """
+    if cursor:
+        values = decode_cursor(cursor, [column.type.python_type for column in sort_columns])
+        query = query.where(tuple_(*sort_columns) > tuple_(*values))
+    loaded = {column.key for column in sort_columns} | set(fields)
+    return (
+        query
+        .options(load_only(*[getattr(model, name) for name in loaded]))
+        .order_by(*sort_columns)
+        .limit(limit + 1)
+    )
+
+def finish_page(rows: List[Any], sort_columns: Sequence, limit: int, request: Request, response: Response) -> List[Any]:
+    """Trim the look-ahead row and advertise the next page in `X-Next-Cursor` and `Link` headers"""
+    if len(rows) <= limit:
+        return rows
+    rows = rows[:limit]
+    next_cursor = encode_cursor([getattr(rows[-1], column.key) for column in sort_columns])
+    response.headers["X-Next-Cursor"] = next_cursor
+    response.headers["Link"] = f'<{request.url.include_query_params(cursor=next_cursor)}>; rel="next"'
+    return rows
+
+def project(row: Any, fields: List[str]) -> dict:
+    return {field: getattr(row, field) for field in fields}
@@ -0,0 +1,131 @@
+import os
+import tempfile
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+from fastapi import HTTPException, Request
+from multipart.multipart import MultipartParser, parse_options_header
+
+MAX_FIELD_BYTES = 64 * 1024
+
+class StreamedUpload(NamedTuple):
+    filename: str  # client-supplied name, reduced to its basename
+    path: str  # temporary file in the destination directory
+    size: int
+    fields: Dict[str, str]
+
+class _Part:
+    def __init__(self):
+        self.headers: List[Tuple[bytes, bytes]] = []
+        self.name = ""
+        self.filename: Optional[str] = None
+        self.data = bytearray()
+
+async def receive_upload(
+    request: Request,
+    file_field: str,
+    directory: str,
+    max_bytes: int,
+    extensions: Sequence[str] = ()
+) -> StreamedUpload:
+    """Parse a multipart/form-data body as it arrives, writing `file_field` straight to disk.
+
+    Unlike `UploadFile`, nothing is spooled before the endpoint runs: the size limit
+    is checked on every chunk and the request is rejected with 413 as soon as it is
+    exceeded. The caller owns the returned temporary file (rename or remove it).
+    """
+    content_type, params = parse_options_header(request.headers.get("content-type", ""))
+    if content_type != b"multipart/form-data" or b"boundary" not in params:
+        raise HTTPException(status_code=400, detail="Expected a multipart/form-data body")
+    declared = request.headers.get("content-length")
+    if declared and declared.isdigit() and int(declared) > max_bytes + MAX_FIELD_BYTES:
+        raise HTTPException(status_code=413, detail=f"File exceeds the {max_bytes} byte limit")
+
+    fields: Dict[str, str] = {}
+    events: List[Tuple[str, object]] = []
+    part = _Part()
+    header = [b"", b""]
+
+    def on_part_begin():
+        events.append(("begin", _Part()))
+
+    def on_header_field(data, start, end):
+        header[0] += data[start:end]
+
+    def on_header_value(data, start, end):
+        header[1] += data[start:end]
+
+    def on_header_end():
+        events.append(("header", (header[0].lower(), header[1])))
+        header[0], header[1] = b"", b""
+
+    def on_headers_finished():
+        events.append(("headers_finished", None))
+
+    def on_part_data(data, start, end):
+        events.append(("data", data[start:end]))
+
+    def on_part_end():
+        events.append(("end", None))
+
+    parser = MultipartParser(params[b"boundary"], callbacks={
+        "on_part_begin": on_part_begin,
+        "on_header_field": on_header_field,
+        "on_header_value": on_header_value,
+        "on_header_end": on_header_end,
+        "on_headers_finished": on_headers_finished,
+        "on_part_data": on_part_data,
+        "on_part_end": on_part_end
+    })
+
+    upload_file = None
+    upload_name = ""
+    upload: Optional[StreamedUpload] = None
+    size = 0
+    try:
+        async for chunk in request.stream():
+            parser.write(chunk)
+            for kind, value in events:
+                if kind == "begin":
+                    part = value
+                elif kind == "header":
+                    part.headers.append(value)
+                elif kind == "headers_finished":
+                    disposition = dict(part.headers).get(b"content-disposition", b"")
+                    _, options = parse_options_header(disposition)
+                    part.name = options.get(b"name", b"").decode("latin-1")
+                    if b"filename" in options and part.name == file_field:
+                        part.filename = os.path.basename(options[b"filename"].decode("utf-8", "replace"))
+                        if extensions and not part.filename.lower().endswith(tuple(extensions)):
+                            raise HTTPException(
+                                status_code=400,
+                                detail=f"Only {', '.join(extensions)} files are allowed"
+                            )
+                        if upload_file is not None:
+                            raise HTTPException(status_code=400, detail=f"Only one '{file_field}' file is allowed")
+                        upload_name = part.filename
+                        upload_file = tempfile.NamedTemporaryFile(
+                            dir=directory, prefix=".upload-", suffix=".part", delete=False
+                        )
+                elif kind == "data":
+                    if part.filename is not None:
+                        size += len(value)
+                        if size > max_bytes:
+                            raise HTTPException(status_code=413, detail=f"File exceeds the {max_bytes} byte limit")
+                        upload_file.write(value)
+                    else:
+                        part.data += value
+                        if len(part.data) > MAX_FIELD_BYTES:
+                            raise HTTPException(status_code=413, detail=f"Form field '{part.name}' is too large")
+                elif kind == "end" and part.filename is None:
+                    fields[part.name] = part.data.decode("utf-8", "replace")
+            events.clear()
+        parser.finalize()
+
+        if upload_file is None:
+            raise HTTPException(status_code=400, detail=f"Missing file field '{file_field}'")
+        upload_file.close()
+        upload = StreamedUpload(upload_name, upload_file.name, size, fields)
+        return upload
+    finally:
+        if upload_file is not None and upload is None:
+            upload_file.close()
+            os.unlink(upload_file.name)
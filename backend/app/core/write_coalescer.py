@@ -0,0 +1,111 @@
+import asyncio
+from typing import Any, Awaitable, Callable, List, Optional, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+
+WriteOperation = Callable[[AsyncSession], Awaitable[Any]]
+
+class WriteCoalescer:
+    """Groups small writes from concurrent requests into one transaction per tick.
+
+    SQLite allows a single writer, so a burst of one-row commits spends most of its
+    time waiting on the lock and syncing the journal. Operations submitted within
+    `interval` seconds share a session and a single commit. If the batch fails, each
+    operation is retried in its own transaction so one bad write cannot sink the rest.
+    When disabled (or not started) every operation commits on its own immediately.
+    """
+
+    def __init__(self, enabled: bool, interval: float, max_batch: int):
+        self.enabled = enabled
+        self.interval = interval
+        self.max_batch = max_batch
+        self.batches = 0
+        self.operations = 0
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self):
+        if self.enabled:
+            self._queue = asyncio.Queue()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Commit everything already submitted, then stop; later writes commit on their own"""
+        if self._task is None:
+            return
+        task, self._task = self._task, None
+        # Not cancelled: a batch cut off mid-commit would leave its submitters waiting forever
+        self._queue.put_nowait(None)
+        await task
+        self._queue = None
+
+    async def submit(self, operation: WriteOperation) -> Any:
+        """Run `operation(session)` and commit; returns its result once durable"""
+        if self._task is None:
+            return await self._commit_one(operation)
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((operation, future))
+        return await future
+
+    def stats(self):
+        return {
+            "enabled": self._task is not None,
+            "batches": self.batches,
+            "operations": self.operations,
+            "queue_depth": self._queue.qsize() if self._queue else 0
+        }
+
+    async def _run(self):
+        while True:
+            first = await self._queue.get()
+            if first is None:
+                return
+            await asyncio.sleep(self.interval)
+            batch = [first] + self._drain(self.max_batch - 1)
+            # None is the stop marker; everything ahead of it is still written
+            stopping = None in batch
+            await self._commit_batch([item for item in batch if item is not None])
+            if stopping:
+                return
+
+    def _drain(self, limit: Optional[int] = None) -> List[Tuple[WriteOperation, asyncio.Future]]:
+        items = []
+        while self._queue is not None and not self._queue.empty() and (limit is None or len(items) < limit):
+            items.append(self._queue.get_nowait())
+        return items
+
+    async def _commit_batch(self, batch: List[Tuple[WriteOperation, asyncio.Future]]):
+        self.batches += 1
+        self.operations += len(batch)
+        try:
+            async with AsyncSessionLocal() as session:
+                results = [await operation(session) for operation, _ in batch]
+                await session.commit()
+        except Exception:
+            for operation, future in batch:
+                try:
+                    result = await self._commit_one(operation)
+                except Exception as e:
+                    if not future.done():
+                        future.set_exception(e)
+                else:
+                    if not future.done():
+                        future.set_result(result)
+            return
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+    @staticmethod
+    async def _commit_one(operation: WriteOperation) -> Any:
+        async with AsyncSessionLocal() as session:
+            result = await operation(session)
+            await session.commit()
+            return result
+
+write_coalescer = WriteCoalescer(
+    enabled=settings.WRITE_COALESCING_ENABLED,
+    interval=settings.WRITE_COALESCING_INTERVAL_MS / 1000,
+    max_batch=settings.WRITE_COALESCING_MAX_BATCH
+)
@@ -2,5 +2,9 @@ from .input_source import InputSource
 from .test_case import TestCase
 from .test_run import TestRun
 from .script import Script
+from .test_case_result import TestCaseResult
+from .test_case_duration import TestCaseDuration
+from .jira_issue import JiraIssue
+from .llm_usage import LLMUsage
 
-__all__ = ["InputSource", "TestCase", "TestRun", "Script"] 
\ No newline at end of file
+__all__ = ["InputSource", "TestCase", "TestRun", "Script", "TestCaseResult", "TestCaseDuration", "JiraIssue", "LLMUsage"] 
\ No newline at end of file
@@ -0,0 +1,11 @@
+from sqlalchemy import Column, String, Text, DateTime
+from datetime import datetime
+from app.core.database import Base
+
+class JiraIssue(Base):
+    """Local copy of a Jira issue as last fetched (raw JSON limited to jira_service.ISSUE_FIELDS)"""
+    __tablename__ = "jira_issues"
+    issue_key = Column(String(100), primary_key=True)
+    raw = Column(Text, nullable=False)
+    remote_updated_at = Column(DateTime, nullable=True, index=True)  # fields.updated, in UTC
+    fetched_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -0,0 +1,18 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean
+from datetime import datetime
+from app.core.database import Base
+
+class LLMUsage(Base):
+    """Accounting record for one completion request (or LLM cache hit)"""
+    __tablename__ = "llm_usage"
+    id = Column(Integer, primary_key=True, index=True)
+    created_at = Column(DateTime, default=datetime.utcnow, index=True)
+    model = Column(String(200), nullable=False)
+    operation = Column(String(50), nullable=False)  # test_cases, script
+    prompt_tokens = Column(Integer, nullable=False, default=0)
+    completion_tokens = Column(Integer, nullable=False, default=0)
+    estimated = Column(Boolean, nullable=False, default=False)  # counted locally; the provider reported no usage
+    latency_ms = Column(Integer, nullable=False, default=0)
+    cached = Column(Boolean, nullable=False, default=False)
+    truncated = Column(Boolean, nullable=False, default=False)  # prompt was cut to fit the context budget
+    error = Column(Text, nullable=True)
@@ -1,7 +1,8 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, Enum, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, DateTime, Enum, ForeignKey, Index, event
 from sqlalchemy.orm import relationship
 from datetime import datetime
 import enum
+import hashlib
 from app.core.database import Base
 
 class ScriptType(str, enum.Enum):
@@ -10,10 +11,14 @@ class ScriptType(str, enum.Enum):
 
 class Script(Base):
     __tablename__ = "scripts"
+    __table_args__ = (
+        Index("ix_scripts_source_created", "input_source_id", "created_at"),
+    )
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(255), nullable=False)
     script_type = Column(Enum(ScriptType), nullable=False)
     content = Column(Text, nullable=False)
+    content_hash = Column(String(64), nullable=True)  # sha256 of content, used as the download ETag
     file_path = Column(String(500), nullable=True)
     input_source_id = Column(Integer, ForeignKey("input_sources.id"))
     created_at = Column(DateTime, default=datetime.utcnow)
@@ -21,4 +26,11 @@ class Script(Base):
     input_source = relationship("InputSource", back_populates="scripts")
     
     def __repr__(self):
-        return f"<Script(id={self.id}, name='{self.name}', type='{self.script_type}')>" 
\ No newline at end of file
+        return f"<Script(id={self.id}, name='{self.name}', type='{self.script_type}')>"
+
+def content_sha256(content: str) -> str:
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+@event.listens_for(Script.content, "set")
+def _update_content_hash(target, value, oldvalue, initiator):
+    target.content_hash = content_sha256(value) if value is not None else None
\ No newline at end of file
@@ -1,7 +1,9 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, Enum, ForeignKey, Boolean
+from sqlalchemy import Column, Integer, String, Text, DateTime, Enum, ForeignKey, Boolean, Index, event
 from sqlalchemy.orm import relationship
 from datetime import datetime
+from typing import Optional
 import enum
+import hashlib
 from app.core.database import Base
 
 class TestCaseStatus(str, enum.Enum):
@@ -12,14 +14,40 @@ class TestCaseStatus(str, enum.Enum):
 
 class TestCase(Base):
     __tablename__ = "test_cases"
+    __table_args__ = (
+        Index("ix_test_cases_source_created", "input_source_id", "created_at"),
+        Index("ix_test_cases_source_status", "input_source_id", "status"),
+        Index("ix_test_cases_source_hash", "input_source_id", "content_hash"),
+        Index("ix_test_cases_source_section", "input_source_id", "section_key"),
+    )
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(255), nullable=False)
     description = Column(Text, nullable=True)
     steps = Column(Text, nullable=False)
     expected_result = Column(Text, nullable=True)
+    content_hash = Column(String(64), nullable=True)  # test_case_fingerprint(title, steps), for dedup per source
+    section_key = Column(String(512), nullable=True)  # endpoint ("GET /pets") or text section it was generated from
+    section_hash = Column(String(64), nullable=True)  # fingerprint of that section at generation time
+    retired_at = Column(DateTime, nullable=True)  # set once its section changed or was removed
     status = Column(Enum(TestCaseStatus), default=TestCaseStatus.PENDING)
     input_source_id = Column(Integer, ForeignKey("input_sources.id"))
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     is_automated = Column(Boolean, default=False)
-    input_source = relationship("InputSource", back_populates="test_cases") 
\ No newline at end of file
+    input_source = relationship("InputSource", back_populates="test_cases")
+    results = relationship("TestCaseResult", back_populates="test_case", cascade="all, delete-orphan")
+    duration_history = relationship("TestCaseDuration", back_populates="test_case", uselist=False, cascade="all, delete-orphan")
+
+def test_case_fingerprint(title: Optional[str], steps: Optional[str]) -> str:
+    """Case- and whitespace-insensitive sha256 of title and steps"""
+    return hashlib.sha256(
+        "\x00".join(" ".join(str(value or '').lower().split()) for value in (title, steps)).encode("utf-8")
+    ).hexdigest()
+
+@event.listens_for(TestCase.title, "set")
+def _title_set(target, value, oldvalue, initiator):
+    target.content_hash = test_case_fingerprint(value, target.steps)
+
+@event.listens_for(TestCase.steps, "set")
+def _steps_set(target, value, oldvalue, initiator):
+    target.content_hash = test_case_fingerprint(target.title, value)
@@ -0,0 +1,24 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Float
+from sqlalchemy.orm import relationship
+from datetime import datetime
+from app.core.database import Base
+
+class TestCaseDuration(Base):
+    """Rolling execution-time and flakiness statistics for one test case"""
+    __tablename__ = "test_case_durations"
+    test_case_id = Column(Integer, ForeignKey("test_cases.id"), primary_key=True)
+    sample_count = Column(Integer, nullable=False, default=0)
+    mean_duration = Column(Float, nullable=False, default=0.0)
+    p95_duration = Column(Float, nullable=False, default=0.0)
+    recent_durations = Column(Text, nullable=False, default="")  # comma-separated milliseconds, newest last
+    run_count = Column(Integer, nullable=False, default=0)
+    fail_count = Column(Integer, nullable=False, default=0)
+    flip_count = Column(Integer, nullable=False, default=0)
+    last_status = Column(String(20), nullable=True)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    test_case = relationship("TestCase", back_populates="duration_history")
+
+    @property
+    def flakiness(self) -> float:
+        """Share of consecutive runs whose outcome flipped between pass and fail"""
+        return self.flip_count / (self.run_count - 1) if self.run_count > 1 else 0.0
@@ -0,0 +1,18 @@
+from sqlalchemy import Column, Integer, Text, DateTime, Enum, ForeignKey, Float
+from sqlalchemy.orm import relationship
+from datetime import datetime
+from app.core.database import Base
+from app.models.test_case import TestCaseStatus
+
+class TestCaseResult(Base):
+    __tablename__ = "test_case_results"
+    id = Column(Integer, primary_key=True, index=True)
+    test_run_id = Column(Integer, ForeignKey("test_runs.id"), nullable=False, index=True)
+    test_case_id = Column(Integer, ForeignKey("test_cases.id"), nullable=False, index=True)
+    status = Column(Enum(TestCaseStatus), nullable=False)
+    execution_time = Column(Float, nullable=False, default=0.0)
+    error_message = Column(Text, nullable=True)
+    shard = Column(Integer, nullable=True)
+    completed_at = Column(DateTime, default=datetime.utcnow)
+    test_run = relationship("TestRun", back_populates="results")
+    test_case = relationship("TestCase", back_populates="results")
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, Enum, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, DateTime, Enum, ForeignKey, Float, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 import enum
@@ -11,6 +11,10 @@ class TestRunStatus(str, enum.Enum):
 
 class TestRun(Base):
     __tablename__ = "test_runs"
+    __table_args__ = (
+        Index("ix_test_runs_source_started", "input_source_id", "started_at"),
+        Index("ix_test_runs_source_status", "input_source_id", "status"),
+    )
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(255), nullable=False)
     status = Column(Enum(TestRunStatus), default=TestRunStatus.RUNNING)
@@ -21,4 +25,11 @@ class TestRun(Base):
     started_at = Column(DateTime, default=datetime.utcnow)
     completed_at = Column(DateTime, nullable=True)
     results_summary = Column(Text, nullable=True)
-    input_source = relationship("InputSource", back_populates="test_runs") 
\ No newline at end of file
+    script_id = Column(Integer, ForeignKey("scripts.id"), nullable=True)
+    output_log = Column(Text, nullable=True)
+    execution_time = Column(Float, nullable=True)
+    throughput_per_minute = Column(Float, nullable=True)
+    shard_count = Column(Integer, nullable=True)
+    estimated_duration = Column(Float, nullable=True)
+    input_source = relationship("InputSource", back_populates="test_runs")
+    results = relationship("TestCaseResult", back_populates="test_run", cascade="all, delete-orphan") 
\ No newline at end of file
@@ -0,0 +1 @@
+# Persistence helpers shared by routers and background jobs
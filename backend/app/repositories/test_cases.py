@@ -0,0 +1,137 @@
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+from sqlalchemy import insert, select, update
+from sqlalchemy.engine import Row
+from sqlalchemy.sql import Select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.test_case import TestCase, TestCaseStatus, test_case_fingerprint
+
+# Rows per INSERT statement / IN (...) list; well under SQLite's bound-parameter limit
+BATCH_SIZE = 500
+
+RETURNED_COLUMNS = [column for column in TestCase.__table__.c if column.key != "content_hash"]
+
+def _chunks(items: Sequence[Any], size: int = BATCH_SIZE) -> Iterable[Sequence[Any]]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+def active_cases(input_source_id: int) -> Select:
+    """Test cases of a source that have not been retired"""
+    return select(TestCase).where(TestCase.input_source_id == input_source_id, TestCase.retired_at.is_(None))
+
+async def existing_fingerprints(db: AsyncSession, input_source_id: int, fingerprints: Sequence[str]) -> set:
+    found = set()
+    for chunk in _chunks(list(fingerprints)):
+        result = await db.execute(
+            select(TestCase.content_hash).where(
+                TestCase.input_source_id == input_source_id,
+                TestCase.retired_at.is_(None),
+                TestCase.content_hash.in_(chunk)
+            )
+        )
+        found.update(result.scalars())
+    return found
+
+async def bulk_create(db: AsyncSession, input_source_id: int, cases: List[Dict[str, Any]]) -> Tuple[List[Row], int]:
+    """Insert generated test cases in a few statements instead of one ORM object each.
+
+    Cases whose title and steps match an active case of the same source (or an
+    earlier case in the batch) are skipped. Optional `section_key`/`section_hash`
+    entries record the section a case was generated from. Returns the inserted rows, in input
+    order, and the number skipped. The caller commits.
+    """
+    now = datetime.utcnow()
+    mappings: Dict[str, Dict[str, Any]] = {}
+    for case in cases:
+        title = case.get('title', 'Generated Test Case')
+        steps = case.get('steps', '')
+        fingerprint = test_case_fingerprint(title, steps)
+        mappings.setdefault(fingerprint, {
+            "title": title,
+            "description": case.get('description', ''),
+            "steps": steps,
+            "expected_result": case.get('expected_result', ''),
+            "status": TestCaseStatus.PENDING,
+            "input_source_id": input_source_id,
+            "content_hash": fingerprint,
+            "section_key": case.get('section_key'),
+            "section_hash": case.get('section_hash'),
+            "created_at": now,
+            "updated_at": now,
+            "is_automated": False
+        })
+    for fingerprint in await existing_fingerprints(db, input_source_id, list(mappings)):
+        del mappings[fingerprint]
+    skipped = len(cases) - len(mappings)
+    if not mappings:
+        return [], skipped
+
+    rows: List[Row] = []
+    values = list(mappings.values())
+    if db.bind.dialect.full_returning:
+        for chunk in _chunks(values):
+            result = await db.execute(insert(TestCase).values(list(chunk)).returning(*RETURNED_COLUMNS))
+            rows.extend(result.all())
+    else:
+        # No INSERT ... RETURNING on this dialect (SQLite under SQLAlchemy 1.4): executemany,
+        # then read the new rows back through the (input_source_id, content_hash) index
+        await db.execute(insert(TestCase), values)
+        by_fingerprint = {}
+        for chunk in _chunks(list(mappings)):
+            result = await db.execute(
+                select(*RETURNED_COLUMNS, TestCase.content_hash).where(
+                    TestCase.input_source_id == input_source_id,
+                    TestCase.retired_at.is_(None),
+                    TestCase.content_hash.in_(chunk)
+                )
+            )
+            by_fingerprint.update((row.content_hash, row) for row in result)
+        rows = [by_fingerprint[fingerprint] for fingerprint in mappings]
+    return rows, skipped
+
+async def set_status(
+    db: AsyncSession,
+    test_case_ids: Sequence[int],
+    status: TestCaseStatus,
+    only_if: Optional[TestCaseStatus] = None
+) -> int:
+    """Set the status of many cases, one UPDATE per BATCH_SIZE ids; returns the number of rows changed (caller commits).
+
+    `updated_at` is refreshed by the column's onupdate default.
+    """
+    changed = 0
+    for chunk in _chunks(list(test_case_ids)):
+        statement = update(TestCase).where(TestCase.id.in_(chunk))
+        if only_if is not None:
+            statement = statement.where(TestCase.status == only_if)
+        result = await db.execute(statement.values(status=status).execution_options(synchronize_session=False))
+        changed += result.rowcount
+    return changed
+
+async def section_fingerprints(db: AsyncSession, input_source_id: int) -> Dict[str, Set[str]]:
+    """Section fingerprints carried by the active cases of a source, by section key"""
+    result = await db.execute(
+        select(TestCase.section_key, TestCase.section_hash).distinct().where(
+            TestCase.input_source_id == input_source_id,
+            TestCase.retired_at.is_(None),
+            TestCase.section_key.isnot(None)
+        )
+    )
+    stored: Dict[str, Set[str]] = {}
+    for key, fingerprint in result:
+        stored.setdefault(key, set()).add(fingerprint)
+    return stored
+
+async def retire_sections(db: AsyncSession, input_source_id: int, section_keys: Sequence[str]) -> int:
+    """Mark the active cases of the given sections retired; returns how many (caller commits)"""
+    retired = 0
+    for chunk in _chunks(list(section_keys)):
+        result = await db.execute(
+            update(TestCase).where(
+                TestCase.input_source_id == input_source_id,
+                TestCase.retired_at.is_(None),
+                TestCase.section_key.in_(chunk)
+            ).values(retired_at=datetime.utcnow()).execution_options(synchronize_session=False)
+        )
+        retired += result.rowcount
+    return retired
@@ -1,13 +1,21 @@
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Form, Query, Request, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
+import asyncio
 import json
 import os
 
-from app.core.database import get_db
-from app.schemas.input_source import InputSourceCreate, InputSourceResponse, InputSourceType
+from app.core.database import get_async_db
+from app.core.uploads import receive_upload
+from app.core.pagination import MAX_PAGE_SIZE, parse_fields, keyset_page, finish_page, project
+from app.schemas.input_source import (
+    InputSourceCreate, InputSourceUpdate, InputSourceResponse, InputSourceSummary, InputSourceType,
+    JiraSearchImport, JiraImportResponse
+)
 from app.services.swagger_service import SwaggerService
 from app.services.jira_service import JiraService
+from app.services import jira_cache
 from app.services.ai_service import AIService
 from app.models.input_source import InputSource
 from app.core.config import settings
@@ -17,41 +25,79 @@ swagger_service = SwaggerService()
 jira_service = JiraService()
 ai_service = AIService()
 
-@router.post("/swagger", response_model=InputSourceResponse)
+SWAGGER_UPLOAD_BODY = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "multipart/form-data": {
+                "schema": {
+                    "type": "object",
+                    "required": ["file", "name"],
+                    "properties": {
+                        "file": {"type": "string", "format": "binary"},
+                        "name": {"type": "string"}
+                    }
+                }
+            }
+        }
+    }
+}
+
+def _parse_uploaded_spec(path: str, filename: str):
+    """Returns the spec as JSON text for storage plus its summary; raises ValueError if invalid"""
+    if filename.lower().endswith('.json'):
+        summary = swagger_service.scan_spec_file(path)
+        with open(path, encoding='utf-8') as f:
+            return f.read(), summary
+    return swagger_service.load_yaml_spec(path)
+
+@router.post("/swagger", response_model=InputSourceResponse, openapi_extra=SWAGGER_UPLOAD_BODY)
 async def create_swagger_source(
-    file: UploadFile = File(...),
-    name: str = Form(...),
-    db: Session = Depends(get_db)
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db)
 ):
-    if not file.filename.endswith('.json'):
-        raise HTTPException(status_code=400, detail="Only JSON files are allowed")
-    
+    """Create input source from an uploaded Swagger/OpenAPI file (form fields `file` and `name`).
+
+    The body is streamed to disk as it arrives and MAX_FILE_SIZE is enforced per chunk
+    (413). JSON is validated with a single streaming pass before it is read for storage.
+    """
+    extensions = ('.json', '.yaml', '.yml') if swagger_service.yaml_supported() else ('.json',)
+    upload = await receive_upload(request, "file", settings.UPLOAD_DIR, settings.MAX_FILE_SIZE, extensions)
     try:
-        content = await file.read()
-        swagger_data = json.loads(content.decode())
-        
-        # Validate Swagger structure
-        if not swagger_service.validate_swagger(swagger_data):
-            raise HTTPException(status_code=400, detail="Invalid Swagger/OpenAPI specification")
-        
+        name = upload.fields.get("name", "").strip()
+        if not name:
+            raise HTTPException(status_code=400, detail="Missing form field 'name'")
+        try:
+            content, summary = await asyncio.get_running_loop().run_in_executor(
+                None, _parse_uploaded_spec, upload.path, upload.filename
+            )
+        except (ValueError, UnicodeDecodeError) as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+        response.headers["X-Spec-Paths"] = str(len(summary["paths"]))
+        response.headers["X-Spec-Operations"] = str(summary["operation_count"])
+
         # Save file
-        file_path = os.path.join(settings.UPLOAD_DIR, file.filename)
-        with open(file_path, "wb") as f:
-            f.write(content)
-        
+        file_path = os.path.join(settings.UPLOAD_DIR, upload.filename)
+        os.replace(upload.path, file_path)
+    finally:
+        if os.path.exists(upload.path):
+            os.unlink(upload.path)
+
+    try:
         # Create input source
         input_source = InputSource(
             name=name,
             source_type=InputSourceType.SWAGGER,
-            content=content.decode(),
+            content=content,
             file_path=file_path,
             swagger_url=None
         )
         
         db.add(input_source)
-        db.commit()
-        db.refresh(input_source)
-        
+        await db.commit()
+        # No refresh: the session keeps attributes after commit and reloading would copy the spec again
         return input_source
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -60,7 +106,7 @@ async def create_swagger_source(
 async def create_swagger_source_from_url(
     name: str = Form(...),
     swagger_url: str = Form(...),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Create input source from Swagger URL"""
     try:
@@ -80,8 +126,8 @@ async def create_swagger_source_from_url(
         )
         
         db.add(input_source)
-        db.commit()
-        db.refresh(input_source)
+        await db.commit()
+        await db.refresh(input_source)
         
         return input_source
     except Exception as e:
@@ -89,14 +135,29 @@ async def create_swagger_source_from_url(
 
 @router.post("/jira", response_model=InputSourceResponse)
 async def create_jira_source(
+    response: Response,
     jira_url: str = Form(...),
     jira_issue_key: str = Form(...),
     name: str = Form(...),
-    db: Session = Depends(get_db)
+    use_cache: bool = Form(True),
+    db: AsyncSession = Depends(get_async_db)
 ):
+    """Create input source from a Jira issue.
+
+    With API credentials the issue is served from the local issue cache when present
+    (`X-Jira-Cache: hit`); `use_cache=false` forces a remote fetch.
+    """
     try:
         # Fetch Jira issue content
-        issue_content = await jira_service.fetch_jira_issue(jira_url, jira_issue_key)
+        if jira_service.api_configured():
+            issue = await jira_cache.get_issue(db, jira_issue_key) if use_cache else None
+            response.headers["X-Jira-Cache"] = "hit" if issue is not None else "miss"
+            if issue is None:
+                issue = await jira_service.fetch_issue_data(jira_issue_key)
+                await jira_cache.store_issues(db, [issue])
+            issue_content = jira_service.parse_jira_issue(issue)
+        else:
+            issue_content = await jira_service.fetch_jira_issue(jira_url, jira_issue_key)
         
         # Create input source
         input_source = InputSource(
@@ -108,17 +169,53 @@ async def create_jira_source(
         )
         
         db.add(input_source)
-        db.commit()
-        db.refresh(input_source)
+        await db.commit()
+        await db.refresh(input_source)
         
         return input_source
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.post("/jira/search", response_model=JiraImportResponse)
+async def import_jira_issues(
+    search: JiraSearchImport,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Create one input source per issue matching a JQL query.
+
+    Search pages are fetched in parallel with only the fields the content needs,
+    and all input sources are created, and the issues cached, in one transaction.
+    """
+    try:
+        issues = await jira_service.search_issues(search.jql, max_issues=search.max_issues)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=502, detail=str(e))
+    
+    input_sources = [
+        InputSource(
+            name=f"{issue['key']}: {issue.get('fields', {}).get('summary') or ''}"[:255],
+            source_type=InputSourceType.JIRA,
+            content=jira_service.parse_jira_issue(issue),
+            jira_url=jira_service.issue_url(issue['key']),
+            jira_issue_key=issue['key']
+        )
+        for issue in issues
+    ]
+    db.add_all(input_sources)
+    await jira_cache.store_issues(db, issues)
+    await db.commit()
+    return {
+        "jql": search.jql,
+        "imported": len(input_sources),
+        "input_sources": [InputSourceSummary.model_validate(source, from_attributes=True) for source in input_sources]
+    }
+
 @router.post("/user-prompt", response_model=InputSourceResponse)
 async def create_user_prompt_source(
     input_source: InputSourceCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     try:
         db_input_source = InputSource(
@@ -131,41 +228,84 @@ async def create_user_prompt_source(
         )
         
         db.add(db_input_source)
-        db.commit()
-        db.refresh(db_input_source)
+        await db.commit()
+        await db.refresh(db_input_source)
         
         return db_input_source
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.get("/", response_model=List[InputSourceResponse])
+SUMMARY_FIELDS = [name for name in InputSourceSummary.model_fields if name != "id"]
+
+@router.get("/", response_model=List[InputSourceSummary], response_model_exclude_unset=True)
 async def get_input_sources(
-    skip: int = 0,
-    limit: int = 100,
-    db: Session = Depends(get_db)
+    request: Request,
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE),
+    fields: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db)
 ):
-    input_sources = db.query(InputSource).offset(skip).limit(limit).all()
-    return input_sources
+    """List input sources without their content, oldest first.
+
+    Pages are keyed on id: pass the `X-Next-Cursor` response header back as
+    `cursor` for the next page. `fields=name,source_type` limits the columns loaded.
+    Use GET /{input_source_id} for the content.
+    """
+    selected = parse_fields(fields, SUMMARY_FIELDS, SUMMARY_FIELDS)
+    sort_columns = [InputSource.id]
+    result = await db.execute(keyset_page(select(InputSource), InputSource, selected, sort_columns, cursor, limit))
+    rows = finish_page(result.scalars().all(), sort_columns, limit, request, response)
+    return [InputSourceSummary(**project(row, selected)) for row in rows]
 
 @router.get("/{input_source_id}", response_model=InputSourceResponse)
 async def get_input_source(
     input_source_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    input_source = db.query(InputSource).filter(InputSource.id == input_source_id).first()
+    input_source = await db.get(InputSource, input_source_id)
     if not input_source:
         raise HTTPException(status_code=404, detail="Input source not found")
     return input_source
 
+@router.put("/{input_source_id}", response_model=InputSourceResponse)
+async def update_input_source(
+    input_source_id: int,
+    changes: InputSourceUpdate,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Replace the name and/or content of an input source.
+
+    Existing test cases are kept; POST /api/test-generation/regenerate/{input_source_id}
+    then regenerates only the sections that changed.
+    """
+    input_source = await db.get(InputSource, input_source_id)
+    if not input_source:
+        raise HTTPException(status_code=404, detail="Input source not found")
+    if changes.content is not None and input_source.source_type == InputSourceType.SWAGGER:
+        try:
+            spec = json.loads(changes.content)
+        except json.JSONDecodeError as e:
+            raise HTTPException(status_code=400, detail=f"Invalid JSON: {str(e)}")
+        if not swagger_service.validate_swagger(spec):
+            raise HTTPException(status_code=400, detail="Invalid Swagger/OpenAPI specification")
+    
+    if changes.name is not None:
+        input_source.name = changes.name
+    if changes.content is not None:
+        input_source.content = changes.content
+    await db.commit()
+    return input_source
+
 @router.delete("/{input_source_id}")
 async def delete_input_source(
     input_source_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    input_source = db.query(InputSource).filter(InputSource.id == input_source_id).first()
+    input_source = await db.get(InputSource, input_source_id)
     if not input_source:
         raise HTTPException(status_code=404, detail="Input source not found")
     
-    db.delete(input_source)
-    db.commit()
+    await db.delete(input_source)
+    await db.commit()
     return {"message": "Input source deleted successfully"} 
\ No newline at end of file
@@ -0,0 +1,66 @@
+from fastapi import APIRouter, Depends, HTTPException, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+import hashlib
+import hmac
+import json
+
+from app.core.config import settings
+from app.core.database import get_async_db
+from app.services import jira_cache
+from app.services.jira_service import JiraService
+
+router = APIRouter()
+jira_service = JiraService()
+
+def _webhook_authorized(body: bytes, signature: Optional[str], secret: Optional[str]) -> bool:
+    """Jira Cloud signs with `X-Hub-Signature: sha256=<hmac>`; clients that cannot sign pass ?secret="""
+    expected = settings.JIRA_WEBHOOK_SECRET
+    if not expected:
+        return True
+    if signature and signature.startswith("sha256="):
+        digest = hmac.new(expected.encode("utf-8"), body, hashlib.sha256).hexdigest()
+        return hmac.compare_digest(signature[len("sha256="):], digest)
+    return secret is not None and hmac.compare_digest(secret, expected)
+
+@router.get("/cache/stats")
+async def get_cache_stats(db: AsyncSession = Depends(get_async_db)):
+    """Number of cached issues, oldest sync and newest remote update"""
+    return await jira_cache.stats(db)
+
+@router.post("/cache/refresh")
+async def refresh_cache(db: AsyncSession = Depends(get_async_db)):
+    """Re-fetch cached issues updated in Jira since their last sync and update the input sources built from them"""
+    try:
+        return await jira_cache.refresh(db, jira_service)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=502, detail=str(e))
+
+@router.delete("/cache/{issue_key}")
+async def invalidate_cache_entry(issue_key: str, db: AsyncSession = Depends(get_async_db)):
+    invalidated = await jira_cache.invalidate(db, issue_key)
+    await db.commit()
+    return {"issue_key": issue_key, "invalidated": invalidated}
+
+@router.post("/webhook")
+async def jira_webhook(request: Request, secret: Optional[str] = None, db: AsyncSession = Depends(get_async_db)):
+    """Invalidate the cached copy of the issue named in a Jira webhook event (issue updated or deleted).
+
+    When JIRA_WEBHOOK_SECRET is set, the request must carry a valid `X-Hub-Signature`
+    or the same value as `?secret=`.
+    """
+    body = await request.body()
+    if not _webhook_authorized(body, request.headers.get("X-Hub-Signature"), secret):
+        raise HTTPException(status_code=401, detail="Invalid webhook signature")
+    try:
+        payload = json.loads(body)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Webhook body must be JSON")
+    issue_key = (payload.get("issue") or {}).get("key") if isinstance(payload, dict) else None
+    if not issue_key:
+        return {"event": payload.get("webhookEvent") if isinstance(payload, dict) else None, "invalidated": False}
+    invalidated = await jira_cache.invalidate(db, issue_key)
+    await db.commit()
+    return {"event": payload.get("webhookEvent"), "issue_key": issue_key, "invalidated": invalidated}
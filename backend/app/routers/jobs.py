@@ -0,0 +1,144 @@
+from fastapi import APIRouter, HTTPException
+from typing import Any, Dict, Optional
+
+from app.core.database import AsyncSessionLocal
+from app.core.config import settings
+from app.services.job_queue import job_queue, JobStatus
+from app.routers.test_generation import GENERATION_STRATEGIES, run_test_generation, run_test_regeneration, run_test_execution
+from app.routers.script_output import run_script_generation, run_script_execution
+
+router = APIRouter()
+
+TEST_GENERATION = "test_generation"
+TEST_EXECUTION = "test_execution"
+SCRIPT_GENERATION = "script_generation"
+SCRIPT_EXECUTION = "script_execution"
+
+async def _test_generation_job(params: Dict[str, Any]) -> Dict[str, Any]:
+    async with AsyncSessionLocal() as db:
+        if params.get("incremental"):
+            return await run_test_regeneration(
+                db,
+                params["input_source_id"],
+                bypass_cache=params.get("bypass_cache", False),
+                strategy=params.get("strategy", "llm")
+            )
+        return await run_test_generation(
+            db,
+            params["input_source_id"],
+            bypass_cache=params.get("bypass_cache", False),
+            chunked=params.get("chunked", False),
+            strategy=params.get("strategy", "llm")
+        )
+
+async def _test_execution_job(params: Dict[str, Any]) -> Dict[str, Any]:
+    async with AsyncSessionLocal() as db:
+        return await run_test_execution(db, params["input_source_id"], fail_fast=params.get("fail_fast", False))
+
+async def _script_generation_job(params: Dict[str, Any]) -> Dict[str, Any]:
+    async with AsyncSessionLocal() as db:
+        return await run_script_generation(
+            db,
+            params["input_source_id"],
+            params["script_type"],
+            bypass_cache=params.get("bypass_cache", False)
+        )
+
+async def _script_execution_job(params: Dict[str, Any]) -> Dict[str, Any]:
+    async with AsyncSessionLocal() as db:
+        return await run_script_execution(db, params["script_id"])
+
+job_queue.register(TEST_GENERATION, _test_generation_job, settings.JOB_CONCURRENCY_TEST_GENERATION)
+job_queue.register(TEST_EXECUTION, _test_execution_job, settings.JOB_CONCURRENCY_TEST_EXECUTION)
+job_queue.register(SCRIPT_GENERATION, _script_generation_job, settings.JOB_CONCURRENCY_SCRIPT_GENERATION)
+job_queue.register(SCRIPT_EXECUTION, _script_execution_job, settings.JOB_CONCURRENCY_TEST_EXECUTION)
+
+async def _submit(job_type: str, params: Dict[str, Any]):
+    job = await job_queue.submit(job_type, params)
+    return {
+        "job_id": job.id,
+        "status": job.status.value,
+        "status_url": f"/api/jobs/{job.id}",
+        "result_url": f"/api/jobs/{job.id}/result"
+    }
+
+@router.post("/test-generation/{input_source_id}", status_code=202)
+async def submit_test_generation(
+    input_source_id: int,
+    bypass_cache: bool = False,
+    chunked: bool = False,
+    strategy: str = "llm",
+    incremental: bool = False
+):
+    """Queue test case generation and return a job id immediately.
+
+    `incremental=true` runs a regenerate: only changed or added sections are generated.
+    """
+    if strategy not in GENERATION_STRATEGIES:
+        raise HTTPException(status_code=400, detail=f"Unsupported strategy. Must be one of: {list(GENERATION_STRATEGIES)}")
+    return await _submit(TEST_GENERATION, {
+        "input_source_id": input_source_id,
+        "bypass_cache": bypass_cache,
+        "chunked": chunked,
+        "strategy": strategy,
+        "incremental": incremental
+    })
+
+@router.post("/test-execution/{input_source_id}", status_code=202)
+async def submit_test_execution(input_source_id: int, fail_fast: bool = False):
+    """Queue test case execution and return a job id immediately"""
+    return await _submit(TEST_EXECUTION, {"input_source_id": input_source_id, "fail_fast": fail_fast})
+
+@router.post("/script-generation/{input_source_id}", status_code=202)
+async def submit_script_generation(
+    input_source_id: int,
+    script_type: str,
+    bypass_cache: bool = False
+):
+    """Queue automation script generation and return a job id immediately"""
+    return await _submit(SCRIPT_GENERATION, {
+        "input_source_id": input_source_id,
+        "script_type": script_type,
+        "bypass_cache": bypass_cache
+    })
+
+@router.post("/script-execution/{script_id}", status_code=202)
+async def submit_script_execution(script_id: int):
+    """Queue execution of a stored script and return a job id immediately"""
+    return await _submit(SCRIPT_EXECUTION, {"script_id": script_id})
+
+@router.get("/")
+async def list_jobs(status: Optional[JobStatus] = None):
+    """List jobs known to this worker, newest first"""
+    return {
+        "stats": job_queue.stats(),
+        "jobs": [job.to_dict() for job in job_queue.list(status)]
+    }
+
+@router.get("/{job_id}")
+async def get_job(job_id: str):
+    """Get the status of a job"""
+    job = await job_queue.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job.to_dict()
+
+@router.get("/{job_id}/result")
+async def get_job_result(job_id: str):
+    """Get the result of a finished job"""
+    job = await job_queue.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if job.status in (JobStatus.QUEUED, JobStatus.RUNNING):
+        raise HTTPException(status_code=409, detail=f"Job is still {job.status.value}")
+    return job.to_dict(include_result=True)
+
+@router.delete("/{job_id}")
+async def cancel_job(job_id: str):
+    """Cancel a queued or running job"""
+    job = await job_queue.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if not await job_queue.cancel(job_id):
+        raise HTTPException(status_code=409, detail=f"Job already {job.status.value}")
+    return {"message": "Job cancelled", "job_id": job_id}
@@ -1,148 +1,164 @@
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
-import csv
-import io
 from datetime import datetime
 
-from app.core.database import get_db
+from app.core.database import get_async_db, AsyncSessionLocal
+from app.core.write_coalescer import write_coalescer
 from app.models.input_source import InputSource
-from app.models.test_case import TestCase
+from app.models.test_case import TestCase, TestCaseStatus
 from app.models.test_run import TestRun
+from app.services.export_service import ExportColumn, FORMATS, export_chunks, parquet_available
+from app.repositories import test_cases as test_cases_repository
 
 router = APIRouter()
 
+EXPORT_BATCH_SIZE = 1000
+
+TEST_CASE_EXPORT_COLUMNS = [
+    ExportColumn('id', 'Test Case ID', 'int'),
+    ExportColumn('title', 'Title', 'str'),
+    ExportColumn('description', 'Description', 'str'),
+    ExportColumn('steps', 'Steps', 'str'),
+    ExportColumn('expected_result', 'Expected Result', 'str'),
+    ExportColumn('status', 'Status', 'str'),
+    ExportColumn('created_at', 'Created At', 'datetime')
+]
+
+TEST_RUN_EXPORT_COLUMNS = [
+    ExportColumn('id', 'Test Run ID', 'int'),
+    ExportColumn('name', 'Name', 'str'),
+    ExportColumn('status', 'Status', 'str'),
+    ExportColumn('total_tests', 'Total Tests', 'int'),
+    ExportColumn('passed_tests', 'Passed Tests', 'int'),
+    ExportColumn('failed_tests', 'Failed Tests', 'int'),
+    ExportColumn('success_rate', 'Success Rate (%)', 'float'),
+    ExportColumn('started_at', 'Started At', 'datetime'),
+    ExportColumn('completed_at', 'Completed At', 'datetime')
+]
+
+TEST_CASE_EXPORT_SELECT = (
+    TestCase.id, TestCase.title, TestCase.description, TestCase.steps,
+    TestCase.expected_result, TestCase.status, TestCase.created_at
+)
+
+TEST_RUN_EXPORT_SELECT = (
+    TestRun.id, TestRun.name, TestRun.status, TestRun.total_tests, TestRun.passed_tests,
+    TestRun.failed_tests, TestRun.started_at, TestRun.completed_at
+)
+
+def _test_case_row(row) -> tuple:
+    return (row.id, row.title, row.description, row.steps, row.expected_result, row.status.value, row.created_at)
+
+def _test_run_row(row) -> tuple:
+    success_rate = (row.passed_tests / row.total_tests * 100) if row.total_tests else 0.0
+    return (
+        row.id, row.name, row.status.value, row.total_tests, row.passed_tests, row.failed_tests,
+        round(success_rate, 1), row.started_at, row.completed_at
+    )
+
+async def _batches(statement, to_row):
+    """Stream rows in server-side batches of EXPORT_BATCH_SIZE from a session owned by the response"""
+    async with AsyncSessionLocal() as session:
+        result = await session.stream(statement.execution_options(yield_per=EXPORT_BATCH_SIZE))
+        async for partition in result.partitions():
+            yield [to_row(row) for row in partition]
+
+async def _export(
+    db: AsyncSession,
+    input_source_id: int,
+    model,
+    selected: tuple,
+    columns: List[ExportColumn],
+    to_row,
+    label: str,
+    export_format: str,
+    gzip: bool
+) -> StreamingResponse:
+    if export_format not in FORMATS:
+        raise HTTPException(status_code=400, detail=f"Unsupported format. Must be one of: {list(FORMATS)}")
+    if export_format == "parquet" and not parquet_available():
+        raise HTTPException(status_code=400, detail="Parquet export requires pyarrow (pip install pyarrow)")
+    
+    input_source = await db.get(InputSource, input_source_id)
+    if not input_source:
+        raise HTTPException(status_code=404, detail="Input source not found")
+    
+    filters = (model.input_source_id == input_source_id,)
+    if model is TestCase:
+        filters += (TestCase.retired_at.is_(None),)
+    if await db.scalar(select(model.id).where(*filters).limit(1)) is None:
+        raise HTTPException(status_code=404, detail=f"No {label.replace('_', ' ')} found")
+    
+    statement = select(*selected).where(*filters).order_by(model.id)
+    
+    media_type, extension = FORMATS[export_format]
+    safe_name = "".join(c for c in input_source.name if c.isalnum() or c in (' ', '-', '_')).strip().replace(' ', '_')
+    filename = f"{label}_{safe_name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{extension}"
+    headers = {"Content-Disposition": f'attachment; filename="{filename}"'}
+    if gzip:
+        headers["Content-Encoding"] = "gzip"
+    return StreamingResponse(
+        export_chunks(export_format, columns, _batches(statement, to_row), gzip=gzip),
+        media_type=media_type,
+        headers=headers
+    )
+
 @router.get("/test-cases/{input_source_id}/csv")
 async def export_test_cases_csv(
     input_source_id: int,
-    db: Session = Depends(get_db)
+    gzip: bool = False,
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Export test cases to CSV format"""
-    try:
-        # Get input source
-        input_source = db.query(InputSource).filter(InputSource.id == input_source_id).first()
-        if not input_source:
-            raise HTTPException(status_code=404, detail="Input source not found")
-        
-        # Get test cases
-        test_cases = db.query(TestCase).filter(TestCase.input_source_id == input_source_id).all()
-        
-        if not test_cases:
-            raise HTTPException(status_code=404, detail="No test cases found")
-        
-        # Create CSV content
-        output = io.StringIO()
-        writer = csv.writer(output)
-        
-        # Write header
-        writer.writerow([
-            'Test Case ID',
-            'Title',
-            'Description',
-            'Steps',
-            'Expected Result',
-            'Status',
-            'Created At'
-        ])
-        
-        # Write data
-        for test_case in test_cases:
-            writer.writerow([
-                test_case.id,
-                test_case.title,
-                test_case.description or '',
-                test_case.steps,
-                test_case.expected_result or '',
-                test_case.status.value,
-                test_case.created_at.strftime('%Y-%m-%d %H:%M:%S')
-            ])
-        
-        csv_content = output.getvalue()
-        output.close()
-        
-        return {
-            "filename": f"test_cases_{input_source.name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
-            "content": csv_content,
-            "total_test_cases": len(test_cases)
-        }
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    """Stream test cases as a CSV download"""
+    return await _export(db, input_source_id, TestCase, TEST_CASE_EXPORT_SELECT, TEST_CASE_EXPORT_COLUMNS, _test_case_row, "test_cases", "csv", gzip)
+
+@router.get("/test-cases/{input_source_id}/export")
+async def export_test_cases(
+    input_source_id: int,
+    format: str = "csv",
+    gzip: bool = False,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Stream test cases as CSV, NDJSON or Parquet"""
+    return await _export(db, input_source_id, TestCase, TEST_CASE_EXPORT_SELECT, TEST_CASE_EXPORT_COLUMNS, _test_case_row, "test_cases", format, gzip)
 
 @router.get("/test-runs/{input_source_id}/csv")
 async def export_test_runs_csv(
     input_source_id: int,
-    db: Session = Depends(get_db)
+    gzip: bool = False,
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Export test runs to CSV format"""
-    try:
-        # Get input source
-        input_source = db.query(InputSource).filter(InputSource.id == input_source_id).first()
-        if not input_source:
-            raise HTTPException(status_code=404, detail="Input source not found")
-        
-        # Get test runs
-        test_runs = db.query(TestRun).filter(TestRun.input_source_id == input_source_id).all()
-        
-        if not test_runs:
-            raise HTTPException(status_code=404, detail="No test runs found")
-        
-        # Create CSV content
-        output = io.StringIO()
-        writer = csv.writer(output)
-        
-        # Write header
-        writer.writerow([
-            'Test Run ID',
-            'Name',
-            'Status',
-            'Total Tests',
-            'Passed Tests',
-            'Failed Tests',
-            'Success Rate (%)',
-            'Started At',
-            'Completed At'
-        ])
-        
-        # Write data
-        for test_run in test_runs:
-            success_rate = (test_run.passed_tests / test_run.total_tests * 100) if test_run.total_tests > 0 else 0
-            writer.writerow([
-                test_run.id,
-                test_run.name,
-                test_run.status.value,
-                test_run.total_tests,
-                test_run.passed_tests,
-                test_run.failed_tests,
-                f"{success_rate:.1f}",
-                test_run.started_at.strftime('%Y-%m-%d %H:%M:%S'),
-                test_run.completed_at.strftime('%Y-%m-%d %H:%M:%S') if test_run.completed_at else ''
-            ])
-        
-        csv_content = output.getvalue()
-        output.close()
-        
-        return {
-            "filename": f"test_runs_{input_source.name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
-            "content": csv_content,
-            "total_test_runs": len(test_runs)
-        }
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    """Stream test runs as a CSV download"""
+    return await _export(db, input_source_id, TestRun, TEST_RUN_EXPORT_SELECT, TEST_RUN_EXPORT_COLUMNS, _test_run_row, "test_runs", "csv", gzip)
+
+@router.get("/test-runs/{input_source_id}/export")
+async def export_test_runs(
+    input_source_id: int,
+    format: str = "csv",
+    gzip: bool = False,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Stream test runs as CSV, NDJSON or Parquet"""
+    return await _export(db, input_source_id, TestRun, TEST_RUN_EXPORT_SELECT, TEST_RUN_EXPORT_COLUMNS, _test_run_row, "test_runs", format, gzip)
 
 @router.get("/manual-test-cases/{input_source_id}")
 async def get_manual_test_cases(
     input_source_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get test cases formatted for manual testing"""
     try:
         # Get input source
-        input_source = db.query(InputSource).filter(InputSource.id == input_source_id).first()
+        input_source = await db.get(InputSource, input_source_id)
         if not input_source:
             raise HTTPException(status_code=404, detail="Input source not found")
         
         # Get test cases
-        test_cases = db.query(TestCase).filter(TestCase.input_source_id == input_source_id).all()
+        result = await db.execute(test_cases_repository.active_cases(input_source_id))
+        test_cases = result.scalars().all()
         
         # Format for manual testing
         manual_test_cases = []
@@ -166,35 +182,36 @@ async def get_manual_test_cases(
             "test_cases": manual_test_cases,
             "total_count": len(manual_test_cases)
         }
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/update-test-case-status/{test_case_id}")
 async def update_test_case_status(
     test_case_id: int,
-    status: str,
-    db: Session = Depends(get_db)
+    status: str
 ):
     """Update test case status for manual testing"""
     try:
-        test_case = db.query(TestCase).filter(TestCase.id == test_case_id).first()
-        if not test_case:
-            raise HTTPException(status_code=404, detail="Test case not found")
-        
         # Validate status
         valid_statuses = ['pending', 'passed', 'failed', 'running']
         if status not in valid_statuses:
             raise HTTPException(status_code=400, detail=f"Invalid status. Must be one of: {valid_statuses}")
         
-        # Update status
-        test_case.status = status
-        db.commit()
-        db.refresh(test_case)
+        # Update status; with write coalescing on this shares a commit with concurrent updates
+        async def set_status(session: AsyncSession) -> int:
+            return await test_cases_repository.set_status(session, [test_case_id], TestCaseStatus(status))
+        
+        if not await write_coalescer.submit(set_status):
+            raise HTTPException(status_code=404, detail="Test case not found")
         
         return {
             "message": f"Test case status updated to {status}",
             "test_case_id": test_case_id,
             "new_status": status
         }
+    except HTTPException:
+        raise
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e)) 
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
@@ -1,115 +1,328 @@
-from fastapi import APIRouter, Depends, HTTPException
-from fastapi.responses import FileResponse
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Dict, Any, Optional, Tuple
+from datetime import datetime
+import json
 import os
-import tempfile
+import time
+from urllib.parse import quote
 
-from app.core.database import get_db
+from app.core.database import get_async_db, AsyncSessionLocal
 from app.schemas.script import ScriptCreate, ScriptResponse
 from app.services.ai_service import AIService
 from app.services.test_execution_service import TestExecutionService
+from app.services.export_service import zip_chunks
 from app.models.input_source import InputSource
 from app.models.test_case import TestCase
-from app.models.script import Script, ScriptType
+from app.models.script import Script, ScriptType, content_sha256
+from app.models.test_run import TestRun, TestRunStatus
 from app.core.config import settings
+from app.repositories import test_cases as test_cases_repository
 
 router = APIRouter()
 ai_service = AIService()
 test_execution_service = TestExecutionService()
 
+def _script_type_enum(script_type: str) -> ScriptType:
+    if script_type == "playwright_python":
+        return ScriptType.PLAYWRIGHT_PYTHON
+    elif script_type == "playwright_selenium":
+        return ScriptType.PLAYWRIGHT_SELENIUM
+    return ScriptType.PLAYWRIGHT_PYTHON
+
+def _test_cases_as_dicts(test_cases: List[TestCase]) -> List[Dict]:
+    return [
+        {
+            'title': test_case.title,
+            'description': test_case.description,
+            'steps': test_case.steps,
+            'expected_result': test_case.expected_result
+        }
+        for test_case in test_cases
+    ]
+
+def _sse_event(event: str, data: Dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+async def run_script_generation(
+    db: AsyncSession,
+    input_source_id: int,
+    script_type: str,
+    bypass_cache: bool = False
+) -> Dict[str, Any]:
+    """Generate and save an automation script; shared by the endpoint and background jobs"""
+    # Get input source
+    input_source = await db.get(InputSource, input_source_id)
+    if not input_source:
+        raise HTTPException(status_code=404, detail="Input source not found")
+    
+    # Get test cases
+    result = await db.execute(test_cases_repository.active_cases(input_source_id))
+    test_cases = result.scalars().all()
+    if not test_cases:
+        raise HTTPException(status_code=404, detail="No test cases found for this input source")
+    
+    # Convert test cases to dict format
+    test_cases_data = _test_cases_as_dicts(test_cases)
+    
+    # Generate script using AI
+    script_content = await ai_service.generate_automation_script(test_cases_data, script_type, bypass_cache=bypass_cache)
+    
+    # Save script to database
+    script = Script(
+        name=f"Automation Script - {input_source.name}",
+        script_type=_script_type_enum(script_type),
+        content=script_content,
+        input_source_id=input_source_id
+    )
+    
+    db.add(script)
+    await db.commit()
+    await db.refresh(script)
+    
+    return {
+        "message": "Automation script generated successfully",
+        "script_id": script.id,
+        "script_type": script_type,
+        "content": script_content
+    }
+
 @router.post("/generate/{input_source_id}")
 async def generate_automation_script(
     input_source_id: int,
     script_type: str,
-    db: Session = Depends(get_db)
+    bypass_cache: bool = False,
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Generate automation script from test cases"""
     try:
-        # Get input source
-        input_source = db.query(InputSource).filter(InputSource.id == input_source_id).first()
-        if not input_source:
-            raise HTTPException(status_code=404, detail="Input source not found")
-        
-        # Get test cases
-        test_cases = db.query(TestCase).filter(TestCase.input_source_id == input_source_id).all()
-        if not test_cases:
-            raise HTTPException(status_code=404, detail="No test cases found for this input source")
-        
-        # Convert test cases to dict format
-        test_cases_data = []
-        for test_case in test_cases:
-            test_cases_data.append({
-                'title': test_case.title,
-                'description': test_case.description,
-                'steps': test_case.steps,
-                'expected_result': test_case.expected_result
-            })
-        
-        # Generate script using AI
-        script_content = await ai_service.generate_automation_script(test_cases_data, script_type)
-        
-        # Determine script type enum
-        if script_type == "playwright_python":
-            script_type_enum = ScriptType.PLAYWRIGHT_PYTHON
-        elif script_type == "playwright_selenium":
-            script_type_enum = ScriptType.PLAYWRIGHT_SELENIUM
-        else:
-            script_type_enum = ScriptType.PLAYWRIGHT_PYTHON
-        
-        # Save script to database
-        script = Script(
-            name=f"Automation Script - {input_source.name}",
-            script_type=script_type_enum,
-            content=script_content,
-            input_source_id=input_source_id
-        )
-        
-        db.add(script)
-        db.commit()
-        db.refresh(script)
-        
-        return {
-            "message": "Automation script generated successfully",
-            "script_id": script.id,
-            "script_type": script_type,
-            "content": script_content
-        }
+        return await run_script_generation(db, input_source_id, script_type, bypass_cache=bypass_cache)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.post("/generate/{input_source_id}/stream")
+async def stream_automation_script(
+    input_source_id: int,
+    script_type: str,
+    bypass_cache: bool = False,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Generate an automation script and stream it as Server-Sent Events.
+
+    Emits `token` events while the model is generating, then a `done` event with
+    the id of the persisted script (or an `error` event if generation failed).
+    """
+    input_source = await db.get(InputSource, input_source_id)
+    if not input_source:
+        raise HTTPException(status_code=404, detail="Input source not found")
+    
+    result = await db.execute(test_cases_repository.active_cases(input_source_id))
+    test_cases = result.scalars().all()
+    if not test_cases:
+        raise HTTPException(status_code=404, detail="No test cases found for this input source")
+    
+    test_cases_data = _test_cases_as_dicts(test_cases)
+    script_name = f"Automation Script - {input_source.name}"
+    
+    async def event_stream():
+        parts = []
+        yield _sse_event("start", {"input_source_id": input_source_id, "script_type": script_type})
+        try:
+            async for token in ai_service.stream_automation_script(test_cases_data, script_type, bypass_cache=bypass_cache):
+                parts.append(token)
+                yield _sse_event("token", {"content": token})
+        except Exception as e:
+            yield _sse_event("error", {"detail": str(e)})
+            return
+        
+        # The request-scoped session may already be closed once streaming starts
+        async with AsyncSessionLocal() as session:
+            try:
+                script = Script(
+                    name=script_name,
+                    script_type=_script_type_enum(script_type),
+                    content="".join(parts),
+                    input_source_id=input_source_id
+                )
+                session.add(script)
+                await session.commit()
+                await session.refresh(script)
+                yield _sse_event("done", {"script_id": script.id, "script_type": script_type})
+            except Exception as e:
+                await session.rollback()
+                yield _sse_event("error", {"detail": str(e)})
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+class _RunLogWriter:
+    """Appends script output to a TestRun row, committing at most every `interval` seconds"""
+
+    def __init__(self, db: AsyncSession, test_run: TestRun, interval: float = 0.5):
+        self.db = db
+        self.test_run = test_run
+        self.interval = interval
+        self.log = ""
+        self._pending: List[str] = []
+        self._last_flush = time.monotonic()
+
+    async def write(self, line: str):
+        if len(self.log) >= settings.EXECUTION_MAX_OUTPUT_BYTES:
+            return
+        self._pending.append(line)
+        if time.monotonic() - self._last_flush >= self.interval:
+            await self.flush()
+
+    async def flush(self):
+        if self._pending:
+            self.log = (self.log + "".join(self._pending))[:settings.EXECUTION_MAX_OUTPUT_BYTES]
+            self._pending = []
+            self.test_run.output_log = self.log
+            await self.db.commit()
+        self._last_flush = time.monotonic()
+
+async def _start_run(db: AsyncSession, name: str, input_source_id: int, total: int, script_id: Optional[int] = None) -> TestRun:
+    test_run = TestRun(
+        name=name,
+        input_source_id=input_source_id,
+        script_id=script_id,
+        status=TestRunStatus.RUNNING,
+        total_tests=total,
+        output_log=""
+    )
+    db.add(test_run)
+    await db.commit()
+    await db.refresh(test_run)
+    return test_run
+
+async def _abort_run(db: AsyncSession, test_run: TestRun, log: _RunLogWriter):
+    """Mark a run whose execution raised or was cancelled as failed, keeping the output so far"""
+    try:
+        await log.flush()
+    except Exception:
+        await db.rollback()
+    test_run.status = TestRunStatus.FAILED
+    test_run.completed_at = datetime.utcnow()
+    await db.commit()
+
+async def run_script_execution(db: AsyncSession, script_id: int) -> Dict[str, Any]:
+    """Execute one stored script in a subprocess, streaming its output into a TestRun"""
+    script = await db.get(Script, script_id)
+    if not script:
+        raise HTTPException(status_code=404, detail="Script not found")
+    
+    test_run = await _start_run(db, f"Script Run - {script.name}", script.input_source_id, 1, script_id=script.id)
+    log = _RunLogWriter(db, test_run)
+    
+    async def on_output(stream: str, line: str):
+        await log.write(line if stream == "stdout" else f"[stderr] {line}")
+    
+    try:
+        execution_result = await test_execution_service.run_automation_script(
+            script.content,
+            script.script_type.value,
+            on_output=on_output
+        )
+        await log.flush()
+    except BaseException:
+        await _abort_run(db, test_run, log)
+        raise
+    
+    passed = execution_result['status'] == 'completed'
+    test_run.status = TestRunStatus.COMPLETED if passed else TestRunStatus.FAILED
+    test_run.passed_tests = 1 if passed else 0
+    test_run.failed_tests = 0 if passed else 1
+    test_run.execution_time = execution_result['execution_time']
+    test_run.throughput_per_minute = 60 / execution_result['execution_time'] if execution_result['execution_time'] > 0 else None
+    test_run.results_summary = execution_result['error'] or f"Script exited with code {execution_result['exit_code']}"
+    test_run.completed_at = datetime.utcnow()
+    await db.commit()
+    
+    return {
+        "script_id": script_id,
+        "test_run_id": test_run.id,
+        "execution_result": execution_result
+    }
+
+async def run_input_source_script_execution(db: AsyncSession, input_source_id: int) -> Dict[str, Any]:
+    """Execute every script of an input source in parallel as one TestRun"""
+    result = await db.execute(select(Script).where(Script.input_source_id == input_source_id))
+    scripts = result.scalars().all()
+    if not scripts:
+        raise HTTPException(status_code=404, detail="No scripts found for this input source")
+    
+    test_run = await _start_run(db, f"Script Run for Input Source {input_source_id}", input_source_id, len(scripts))
+    log = _RunLogWriter(db, test_run)
+    
+    async def on_output(script_id: int, stream: str, line: str):
+        prefix = f"[script {script_id}]" if stream == "stdout" else f"[script {script_id}] [stderr]"
+        await log.write(f"{prefix} {line}")
+    
+    try:
+        results = await test_execution_service.run_automation_scripts(
+            [{'id': script.id, 'content': script.content, 'script_type': script.script_type.value} for script in scripts],
+            on_output=on_output
+        )
+        await log.flush()
+    except BaseException:
+        await _abort_run(db, test_run, log)
+        raise
+    
+    test_run.status = TestRunStatus.COMPLETED if results['failed_scripts'] == 0 else TestRunStatus.FAILED
+    test_run.passed_tests = results['passed_scripts']
+    test_run.failed_tests = results['failed_scripts']
+    test_run.execution_time = results['execution_time']
+    test_run.throughput_per_minute = results['scripts_per_minute']
+    test_run.results_summary = "\n".join(
+        f"{'✅' if result['status'] == 'completed' else '❌'} Script {result['script_id']} ({result['execution_time']:.2f}s)"
+        + (f" - {result['error']}" if result['error'] else "")
+        for result in results['results']
+    )
+    test_run.completed_at = datetime.utcnow()
+    await db.commit()
+    
+    return {
+        "input_source_id": input_source_id,
+        "test_run_id": test_run.id,
+        "execution_results": {key: value for key, value in results.items() if key != 'results'},
+        "results": [{key: value for key, value in result.items() if key != 'output'} for result in results['results']]
+    }
+
 @router.post("/execute/{script_id}")
 async def execute_automation_script(
     script_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Execute an automation script"""
+    """Execute an automation script in an isolated subprocess"""
     try:
-        # Get script
-        script = db.query(Script).filter(Script.id == script_id).first()
-        if not script:
-            raise HTTPException(status_code=404, detail="Script not found")
-        
-        # Execute script
-        execution_result = await test_execution_service.run_automation_script(
-            script.content, 
-            script.script_type.value
-        )
-        
-        return {
-            "script_id": script_id,
-            "execution_result": execution_result
-        }
+        return await run_script_execution(db, script_id)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/execute-all/{input_source_id}")
+async def execute_input_source_scripts(
+    input_source_id: int,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Execute all scripts of an input source in parallel on the bounded process pool"""
+    try:
+        return await run_input_source_script_execution(db, input_source_id)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/scripts/{input_source_id}")
 async def get_scripts(
     input_source_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get all scripts for an input source"""
-    scripts = db.query(Script).filter(Script.input_source_id == input_source_id).all()
+    result = await db.execute(select(Script).where(Script.input_source_id == input_source_id))
+    scripts = result.scalars().all()
     return [
         {
             "id": script.id,
@@ -121,53 +334,139 @@ async def get_scripts(
         for script in scripts
     ]
 
+def _download_filename(name: str, extension: str = "py") -> str:
+    """Sanitize a script name for Content-Disposition and zip entries"""
+    safe_filename = "".join(c for c in name if c.isalnum() or c in (' ', '-', '_')).rstrip()
+    return f"{safe_filename.replace(' ', '_')}.{extension}"
+
+def _content_disposition(filename: str) -> str:
+    """`filename*` carries non-ASCII names; header values must stay latin-1"""
+    if filename.isascii():
+        return f'attachment; filename="{filename}"'
+    return f"attachment; filename*=utf-8''{quote(filename)}"
+
+def _etag_matches(header: Optional[str], etag: str) -> bool:
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    # Weak comparison, as RFC 9110 requires for If-None-Match
+    return etag in (tag.strip().removeprefix("W/") for tag in header.split(","))
+
+def _parse_range(header: str, size: int) -> Optional[Tuple[int, int]]:
+    """Resolve a single `bytes=` range to inclusive offsets; None means unsatisfiable.
+
+    Multi-range requests are answered with the first range only.
+    """
+    unit, _, spec = header.partition("=")
+    if unit.strip() != "bytes" or not spec:
+        raise ValueError("Unsupported range unit")
+    first, _, last = spec.split(",")[0].strip().partition("-")
+    if not first:
+        length = int(last)
+        if length <= 0 or size == 0:
+            return None
+        return max(size - length, 0), size - 1
+    start = int(first)
+    end = int(last) if last else size - 1
+    if start >= size or end < start:
+        return None
+    return start, min(end, size - 1)
+
 @router.get("/download/{script_id}")
 async def download_script(
     script_id: int,
-    db: Session = Depends(get_db)
+    request: Request,
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Download a script as a file"""
-    try:
-        script = db.query(Script).filter(Script.id == script_id).first()
-        if not script:
-            raise HTTPException(status_code=404, detail="Script not found")
-        
-        # Determine file extension
-        if script.script_type == ScriptType.PLAYWRIGHT_PYTHON:
-            file_extension = "py"
-        elif script.script_type == ScriptType.PLAYWRIGHT_SELENIUM:
-            file_extension = "py"
+    """Download a script as a file.
+
+    Served straight from the database row: the strong ETag is the stored sha256 of
+    the content, so revalidation (If-None-Match) answers 304 without loading the
+    content, and Range requests return 206 with just the requested bytes.
+    """
+    result = await db.execute(
+        select(Script.name, Script.content_hash).where(Script.id == script_id)
+    )
+    row = result.first()
+    if not row:
+        raise HTTPException(status_code=404, detail="Script not found")
+
+    etag = f'"{row.content_hash}"' if row.content_hash else None
+    headers = {
+        "Content-Disposition": _content_disposition(_download_filename(row.name)),
+        "Accept-Ranges": "bytes",
+        "Cache-Control": "no-cache"
+    }
+    if etag and _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers={**headers, "ETag": etag})
+
+    content = (await db.execute(select(Script.content).where(Script.id == script_id))).scalar_one()
+    if etag is None:
+        # Rows written before the content_hash column existed (or via raw SQL)
+        etag = f'"{content_sha256(content)}"'
+    headers["ETag"] = etag
+    body = content.encode("utf-8")
+    media_type = "text/plain"  # Starlette appends charset=utf-8
+
+    range_header = request.headers.get("range")
+    if_range = request.headers.get("if-range")
+    if range_header and (not if_range or if_range.strip() == etag):
+        try:
+            byte_range = _parse_range(range_header, len(body))
+        except ValueError:
+            pass  # malformed or non-byte ranges are ignored and the whole file is sent
         else:
-            file_extension = "py"
-        
-        # Create filename (sanitize for safe download)
-        safe_filename = "".join(c for c in script.name if c.isalnum() or c in (' ', '-', '_')).rstrip()
-        safe_filename = safe_filename.replace(' ', '_')
-        filename = f"{safe_filename}.{file_extension}"
-        
-        # Create temporary file with UTF-8 encoding
-        with tempfile.NamedTemporaryFile(mode='w', suffix=f'.{file_extension}', delete=False, encoding='utf-8') as temp_file:
-            temp_file.write(script.content)
-            temp_file_path = temp_file.name
-        
-        return FileResponse(
-            path=temp_file_path,
-            filename=filename,
-            media_type='text/plain; charset=utf-8'
-        )
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+            if byte_range is None:
+                return Response(status_code=416, headers={**headers, "Content-Range": f"bytes */{len(body)}"})
+            start, end = byte_range
+            return Response(
+                content=body[start:end + 1],
+                status_code=206,
+                media_type=media_type,
+                headers={**headers, "Content-Range": f"bytes {start}-{end}/{len(body)}"}
+            )
+
+    return Response(content=body, media_type=media_type, headers=headers)
+
+@router.get("/download-all/{input_source_id}")
+async def download_input_source_scripts(
+    input_source_id: int,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Download every script of an input source as a zip archive, streamed one script at a time"""
+    input_source = await db.get(InputSource, input_source_id)
+    if not input_source:
+        raise HTTPException(status_code=404, detail="Input source not found")
+
+    async def files():
+        async with AsyncSessionLocal() as session:
+            result = await session.stream(
+                select(Script.id, Script.name, Script.content)
+                .where(Script.input_source_id == input_source_id)
+                .order_by(Script.id)
+                .execution_options(yield_per=50)
+            )
+            async for script in result:
+                yield f"{script.id}_{_download_filename(script.name)}", script.content
+
+    archive_name = _download_filename(input_source.name, "zip")
+    return StreamingResponse(
+        zip_chunks(files()),
+        media_type="application/zip",
+        headers={"Content-Disposition": _content_disposition(f"scripts_{archive_name}")}
+    )
 
 @router.delete("/scripts/{script_id}")
 async def delete_script(
     script_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Delete a specific script"""
-    script = db.query(Script).filter(Script.id == script_id).first()
+    script = await db.get(Script, script_id)
     if not script:
         raise HTTPException(status_code=404, detail="Script not found")
     
-    db.delete(script)
-    db.commit()
+    await db.delete(script)
+    await db.commit()
     return {"message": "Script deleted successfully"} 
\ No newline at end of file
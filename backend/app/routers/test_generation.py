@@ -1,157 +1,554 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from typing import List
-import json
-
-from app.core.database import get_db
-from app.schemas.test_case import TestCaseCreate, TestCaseResponse
-from app.schemas.test_run import TestRunCreate, TestRunResponse
+import asyncio
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy import func, select, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Dict, Any, Optional
+from datetime import datetime, timedelta
+from collections import OrderedDict
+
+from app.core.database import get_async_db
+from app.core.pagination import MAX_PAGE_SIZE, parse_fields, keyset_page, finish_page, project
+from app.schemas.test_case import TestCaseCreate, TestCaseResponse, TestCaseSummary
+from app.schemas.test_run import TestRunCreate, TestRunResponse, TestRunSummary, TestCaseResultResponse, TestRunStatusResponse
 from app.services.ai_service import AIService
 from app.services.test_execution_service import TestExecutionService
-from app.models.input_source import InputSource
-from app.models.test_case import TestCase
-from app.models.test_run import TestRun
+from app.services.llm_cache import get_llm_cache
+from app.services import llm_usage
+from app.services.model_router import get_model_router
+from app.services.llm_scheduler import get_llm_scheduler
+from app.services.spec_index import get_spec_index
+from app.services.rule_based_generator import rule_based_generator
+from app.services.sections import WHOLE_DOCUMENT, content_sections, diff_sections, tag_cases
+from app.models.input_source import InputSource, InputSourceType
+from app.models.test_case import TestCase, TestCaseStatus
+from app.models.test_run import TestRun, TestRunStatus
+from app.models.test_case_result import TestCaseResult
+from app.core.config import settings
+from app.services import duration_history
+from app.repositories import test_cases as test_cases_repository
 
 router = APIRouter()
 ai_service = AIService()
 test_execution_service = TestExecutionService()
 
+GENERATION_STRATEGIES = ("llm", "rules", "hybrid")
+
+def _uses_llm(strategy: str, is_swagger: bool) -> bool:
+    # hybrid without an API key falls back to the rule-based cases alone for Swagger
+    return strategy == "llm" or (strategy == "hybrid" and (ai_service.llm_configured() or not is_swagger))
+
+async def run_test_generation(
+    db: AsyncSession,
+    input_source_id: int,
+    bypass_cache: bool = False,
+    chunked: bool = False,
+    strategy: str = "llm"
+) -> Dict[str, Any]:
+    """Generate and save test cases for an input source; shared by the endpoint and background jobs.
+
+    `rules` derives Swagger test cases offline with the rule-based generator; `hybrid`
+    adds LLM cases on top, asking the model only for exploratory ones.
+    """
+    if strategy not in GENERATION_STRATEGIES:
+        raise HTTPException(status_code=400, detail=f"Unsupported strategy. Must be one of: {list(GENERATION_STRATEGIES)}")
+    # Get input source
+    input_source = await db.get(InputSource, input_source_id)
+    if not input_source:
+        raise HTTPException(status_code=404, detail="Input source not found")
+    is_swagger = input_source.source_type == InputSourceType.SWAGGER
+    if strategy == "rules" and not is_swagger:
+        raise HTTPException(status_code=400, detail="Rule-based generation requires a Swagger source")
+    
+    test_cases_data = []
+    if strategy != "llm" and is_swagger:
+        test_cases_data = rule_based_generator.generate(get_spec_index(input_source.content))
+    
+    # Generate test cases using AI
+    exploratory = strategy == "hybrid" and is_swagger
+    if _uses_llm(strategy, is_swagger):
+        if chunked and is_swagger:
+            ai_cases = await ai_service.generate_test_cases_chunked(
+                get_spec_index(input_source.content),
+                bypass_cache=bypass_cache,
+                exploratory=exploratory
+            )
+        else:
+            ai_cases = await ai_service.generate_test_cases(
+                input_source.content, 
+                input_source.source_type.value,
+                bypass_cache=bypass_cache,
+                exploratory=exploratory
+            )
+        test_cases_data = ai_service.merge_test_cases([test_cases_data, ai_cases]) if test_cases_data else ai_cases
+    
+    # Record the section each case came from so /regenerate can redo only changed ones
+    try:
+        sections = content_sections(input_source.source_type, input_source.content)
+    except ValueError:
+        sections = OrderedDict()
+    if is_swagger:
+        default_section = None  # cases naming no operation stay untracked
+    else:
+        default_section = next(iter(sections)) if len(sections) == 1 else WHOLE_DOCUMENT
+    tag_cases(test_cases_data, sections, default_section)
+    
+    # Save test cases to database, skipping ones this source already has
+    rows, skipped = await test_cases_repository.bulk_create(db, input_source_id, test_cases_data)
+    test_cases_json = [TestCaseResponse.model_validate(row).model_dump(mode="json") for row in rows]
+    await db.commit()
+    
+    return {
+        "message": f"Generated {len(test_cases_json)} test cases",
+        "test_cases": test_cases_json,
+        "skipped_duplicates": skipped,
+        "input_source_id": input_source_id
+    }
+
 @router.post("/generate/{input_source_id}")
 async def generate_test_cases(
     input_source_id: int,
-    db: Session = Depends(get_db)
+    bypass_cache: bool = False,
+    chunked: bool = False,
+    strategy: str = "llm",
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Generate test cases from input source using AI"""
+    """Generate test cases from input source using AI.
+
+    With `chunked=true`, Swagger sources are split into endpoint groups that are
+    generated in parallel and merged, which keeps prompts small for large specs.
+    `strategy=rules` generates Swagger cases offline without the LLM; `strategy=hybrid`
+    combines them with LLM-generated exploratory cases.
+    """
+    if strategy not in GENERATION_STRATEGIES:
+        raise HTTPException(status_code=400, detail=f"Unsupported strategy. Must be one of: {list(GENERATION_STRATEGIES)}")
     try:
-        # Get input source
-        input_source = db.query(InputSource).filter(InputSource.id == input_source_id).first()
-        if not input_source:
-            raise HTTPException(status_code=404, detail="Input source not found")
-        
-        # Generate test cases using AI
-        test_cases_data = await ai_service.generate_test_cases(
-            input_source.content, 
-            input_source.source_type.value
+        return await run_test_generation(
+            db, input_source_id, bypass_cache=bypass_cache, chunked=chunked, strategy=strategy
         )
-        
-        # Save test cases to database
-        saved_test_cases = []
-        for test_case_data in test_cases_data:
-            test_case = TestCase(
-                title=test_case_data.get('title', 'Generated Test Case'),
-                description=test_case_data.get('description', ''),
-                steps=test_case_data.get('steps', ''),
-                expected_result=test_case_data.get('expected_result', ''),
-                input_source_id=input_source_id
-            )
-            db.add(test_case)
-            saved_test_cases.append(test_case)
-        
-        db.commit()
-        
-        return {
-            "message": f"Generated {len(saved_test_cases)} test cases",
-            "test_cases": saved_test_cases,
-            "input_source_id": input_source_id
-        }
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.post("/execute/{input_source_id}")
-async def execute_test_cases(
+async def run_test_regeneration(
+    db: AsyncSession,
     input_source_id: int,
-    db: Session = Depends(get_db)
+    bypass_cache: bool = False,
+    strategy: str = "llm",
+    dry_run: bool = False
+) -> Dict[str, Any]:
+    """Regenerate test cases for the sections of an input source that changed since they were generated.
+
+    Sections (Swagger operations, or headings/paragraphs of text) are fingerprinted
+    and compared with the fingerprints stored on the active test cases. Cases of
+    changed and removed sections are retired; only changed and added sections are
+    sent to the generators. Cases without a section are left alone.
+    """
+    if strategy not in GENERATION_STRATEGIES:
+        raise HTTPException(status_code=400, detail=f"Unsupported strategy. Must be one of: {list(GENERATION_STRATEGIES)}")
+    input_source = await db.get(InputSource, input_source_id)
+    if not input_source:
+        raise HTTPException(status_code=404, detail="Input source not found")
+    is_swagger = input_source.source_type == InputSourceType.SWAGGER
+    if strategy == "rules" and not is_swagger:
+        raise HTTPException(status_code=400, detail="Rule-based generation requires a Swagger source")
+    try:
+        sections = content_sections(input_source.source_type, input_source.content)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    diff = diff_sections(sections, await test_cases_repository.section_fingerprints(db, input_source_id))
+    summary = {
+        "input_source_id": input_source_id,
+        "sections": len(sections),
+        "added": diff["added"],
+        "changed": diff["changed"],
+        "removed": diff["removed"],
+        "unchanged": len(diff["unchanged"])
+    }
+    if dry_run:
+        return summary
+    
+    retired = await test_cases_repository.retire_sections(db, input_source_id, diff["changed"] + diff["removed"])
+    targets = [sections[key] for key in diff["added"] + diff["changed"]]
+    
+    test_cases_data = []
+    if strategy != "llm" and is_swagger:
+        for section in targets:
+            test_cases_data.extend(tag_cases(
+                rule_based_generator.generate_for_endpoint(section.payload), sections, section.key
+            ))
+    if targets and _uses_llm(strategy, is_swagger):
+        batches = await ai_service.generate_test_cases_for_sections(
+            [(section.key, section.payload) for section in targets],
+            input_source.source_type.value,
+            api_info=get_spec_index(input_source.content).info if is_swagger else None,
+            bypass_cache=bypass_cache,
+            exploratory=strategy == "hybrid" and is_swagger
+        )
+        ai_cases = []
+        for keys, cases in batches:
+            batch_sections = OrderedDict((key, sections[key]) for key in keys)
+            ai_cases.extend(tag_cases(cases, batch_sections, keys[0] if len(keys) == 1 else None))
+        test_cases_data = ai_service.merge_test_cases([test_cases_data, ai_cases])
+    
+    rows, skipped = await test_cases_repository.bulk_create(db, input_source_id, test_cases_data)
+    test_cases_json = [TestCaseResponse.model_validate(row).model_dump(mode="json") for row in rows]
+    await db.commit()
+    
+    return {
+        "message": f"Regenerated {len(targets)} of {len(sections)} sections",
+        **summary,
+        "retired": retired,
+        "test_cases": test_cases_json,
+        "skipped_duplicates": skipped
+    }
+
+@router.post("/regenerate/{input_source_id}")
+async def regenerate_test_cases(
+    input_source_id: int,
+    bypass_cache: bool = False,
+    strategy: str = "llm",
+    dry_run: bool = False,
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Execute test cases for an input source"""
+    """Regenerate test cases only for changed or added sections and retire those of removed sections.
+
+    `dry_run=true` reports the section diff without generating or retiring anything.
+    """
+    if strategy not in GENERATION_STRATEGIES:
+        raise HTTPException(status_code=400, detail=f"Unsupported strategy. Must be one of: {list(GENERATION_STRATEGIES)}")
     try:
-        # Get test cases for the input source
-        test_cases = db.query(TestCase).filter(TestCase.input_source_id == input_source_id).all()
-        
-        if not test_cases:
-            raise HTTPException(status_code=404, detail="No test cases found for this input source")
-        
-        # Convert to dictionary format for execution
-        test_cases_data = []
-        for test_case in test_cases:
-            test_cases_data.append({
-                'title': test_case.title,
-                'description': test_case.description,
-                'steps': test_case.steps,
-                'expected_result': test_case.expected_result
-            })
-        
-        # Execute test cases
-        execution_results = await test_execution_service.execute_test_cases(test_cases_data)
-        
-        # Create test run record
-        test_run = TestRun(
-            name=f"Test Run for Input Source {input_source_id}",
-            input_source_id=input_source_id,
-            total_tests=execution_results['total_tests'],
-            passed_tests=execution_results['passed_tests'],
-            failed_tests=execution_results['failed_tests'],
-            results_summary=test_execution_service.generate_execution_report(execution_results)
+        return await run_test_regeneration(
+            db, input_source_id, bypass_cache=bypass_cache, strategy=strategy, dry_run=dry_run
         )
-        
-        db.add(test_run)
-        db.commit()
-        db.refresh(test_run)
-        
-        return {
-            "test_run_id": test_run.id,
-            "execution_results": execution_results,
-            "summary": {
-                "total": execution_results['total_tests'],
-                "passed": execution_results['passed_tests'],
-                "failed": execution_results['failed_tests'],
-                "success_rate": (execution_results['passed_tests'] / execution_results['total_tests'] * 100) if execution_results['total_tests'] > 0 else 0
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+class _ResultBatchWriter:
+    """Persists per-case results and TestCase status changes in batched commits.
+
+    Shards report concurrently while sharing one session, so flushes (and any
+    other use of the session during the run) are serialised by `lock`. Simulated
+    outcomes are kept as results of the run but never change TestCase.status,
+    which testers also set by hand, nor the duration history shards are planned from.
+    """
+
+    def __init__(self, db: AsyncSession, test_run: TestRun, batch_size: int, simulated: bool = False):
+        self.db = db
+        self.test_run = test_run
+        self.batch_size = batch_size
+        self.simulated = simulated
+        self.passed = 0
+        self.failed = 0
+        self._pending: List[Dict[str, Any]] = []
+        self.lock = asyncio.Lock()
+
+    async def add(self, result: Dict[str, Any]):
+        self._pending.append(result)
+        if len(self._pending) >= self.batch_size:
+            await self.flush()
+
+    async def flush(self):
+        async with self.lock:
+            # Taken before any await, so results arriving meanwhile go to the next batch
+            batch, self._pending = self._pending, []
+            if batch:
+                await self._write(batch)
+
+    async def _write(self, batch: List[Dict[str, Any]]):
+        now = datetime.utcnow()
+        await self.db.execute(insert(TestCaseResult), [
+            {
+                "test_run_id": self.test_run.id,
+                "test_case_id": result['test_case_id'],
+                "status": TestCaseStatus(result['status']),
+                "execution_time": result['execution_time'],
+                "error_message": result['error_message'],
+                "shard": result.get('shard'),
+                "completed_at": now
             }
+            for result in batch
+        ])
+        if not self.simulated:
+            for status in (TestCaseStatus.PASSED, TestCaseStatus.FAILED):
+                ids = [result['test_case_id'] for result in batch if result['status'] == status.value]
+                await test_cases_repository.set_status(self.db, ids, status)
+            await duration_history.record_results(self.db, batch)
+        self.passed += sum(1 for result in batch if result['status'] == TestCaseStatus.PASSED.value)
+        self.failed += sum(1 for result in batch if result['status'] != TestCaseStatus.PASSED.value)
+        self.test_run.passed_tests = self.passed
+        self.test_run.failed_tests = self.failed
+        await self.db.commit()
+
+async def run_test_execution(db: AsyncSession, input_source_id: int, fail_fast: bool = False) -> Dict[str, Any]:
+    """Execute the test cases of an input source across shards and record a test run.
+
+    Historical durations order the run slow-first and historically flaky cases go
+    first in their shard, so with `fail_fast` a doomed run stops early.
+    """
+    # Get the active test cases for the input source
+    result = await db.execute(test_cases_repository.active_cases(input_source_id))
+    test_cases = result.scalars().all()
+    
+    if not test_cases:
+        raise HTTPException(status_code=404, detail="No test cases found for this input source")
+    
+    # Convert to dictionary format for execution
+    test_cases_data = []
+    for test_case in test_cases:
+        test_cases_data.append({
+            'id': test_case.id,
+            'title': test_case.title,
+            'description': test_case.description,
+            'steps': test_case.steps,
+            'expected_result': test_case.expected_result
+        })
+    test_case_ids = [test_case['id'] for test_case in test_cases_data]
+    simulated = test_execution_service.simulated
+    
+    # Create the run up front so per-case results can reference it as they arrive
+    test_run = TestRun(
+        name=f"Test Run for Input Source {input_source_id}",
+        input_source_id=input_source_id,
+        status=TestRunStatus.RUNNING,
+        total_tests=len(test_cases_data)
+    )
+    db.add(test_run)
+    if not simulated:
+        await test_cases_repository.set_status(db, test_case_ids, TestCaseStatus.RUNNING)
+    await db.commit()
+    await db.refresh(test_run)
+    
+    history = await duration_history.load_history(db, test_case_ids)
+    
+    # Execute test cases
+    writer = _ResultBatchWriter(db, test_run, settings.EXECUTION_RESULT_BATCH_SIZE, simulated=simulated)
+    
+    async def on_plan(plan: Dict[str, Any]):
+        async with writer.lock:
+            test_run.shard_count = plan['shards']
+            test_run.estimated_duration = plan['estimated_duration']
+            await db.commit()
+    
+    try:
+        execution_results = await test_execution_service.execute_test_cases(
+            test_cases_data,
+            durations=duration_history.predicted_durations(history),
+            flaky_ids=duration_history.flaky_test_case_ids(history, settings.EXECUTION_FLAKY_THRESHOLD),
+            fail_fast=fail_fast,
+            on_plan=on_plan,
+            on_result=writer.add
+        )
+    except BaseException:
+        try:
+            await writer.flush()
+        except Exception:
+            await db.rollback()
+        # Cases that never reported a result go back to pending rather than staying RUNNING
+        if not simulated:
+            await test_cases_repository.set_status(
+                db, test_case_ids, TestCaseStatus.PENDING, only_if=TestCaseStatus.RUNNING
+            )
+        test_run.status = TestRunStatus.FAILED
+        test_run.completed_at = datetime.utcnow()
+        await db.commit()
+        raise
+    await writer.flush()
+    
+    # Cases skipped by fail-fast never ran
+    if not simulated:
+        await test_cases_repository.set_status(
+            db, test_case_ids, TestCaseStatus.PENDING, only_if=TestCaseStatus.RUNNING
+        )
+    
+    test_run.status = TestRunStatus.COMPLETED
+    test_run.passed_tests = execution_results['passed_tests']
+    test_run.failed_tests = execution_results['failed_tests']
+    test_run.execution_time = execution_results['execution_time']
+    test_run.completed_at = datetime.utcnow()
+    test_run.results_summary = test_execution_service.generate_execution_report(execution_results, include_details=False)
+    await db.commit()
+    
+    return {
+        "test_run_id": test_run.id,
+        "execution_results": execution_results,
+        "summary": {
+            "total": execution_results['total_tests'],
+            "passed": execution_results['passed_tests'],
+            "failed": execution_results['failed_tests'],
+            "shards": execution_results['shards'],
+            "skipped": execution_results['skipped_tests'],
+            "estimated_duration": execution_results['estimated_duration'],
+            "success_rate": (execution_results['passed_tests'] / execution_results['total_tests'] * 100) if execution_results['total_tests'] > 0 else 0
         }
+    }
+
+@router.post("/execute/{input_source_id}")
+async def execute_test_cases(
+    input_source_id: int,
+    fail_fast: bool = False,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Execute test cases for an input source"""
+    try:
+        return await run_test_execution(db, input_source_id, fail_fast=fail_fast)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.get("/test-cases/{input_source_id}")
+@router.get("/llm-cache/stats")
+async def get_llm_cache_stats():
+    """Get hit/miss counters and size of the LLM response cache"""
+    cache = get_llm_cache()
+    if cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **(await cache.stats())}
+
+@router.get("/llm-usage")
+async def get_llm_usage(
+    since: Optional[datetime] = None,
+    group_by: str = Query("model", pattern="^(model|operation|day)$"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Aggregate LLM requests, prompt/completion tokens and latency, optionally since a time (UTC)"""
+    return await llm_usage.summary(db, since, group_by)
+
+@router.get("/llm-models")
+async def get_llm_models():
+    """Routing order, EWMA latency, error rate and health of the configured LLM models"""
+    return get_model_router().stats()
+
+@router.get("/llm-scheduler")
+async def get_llm_scheduler_stats():
+    """Queue depth and wait times, retries, rate-limit responses and circuit breaker states of OpenRouter calls"""
+    return get_llm_scheduler().stats()
+
+TEST_CASE_FIELDS = [name for name in TestCaseSummary.model_fields if name != "id"]
+TEST_RUN_FIELDS = [name for name in TestRunSummary.model_fields if name != "id"]
+# Script output can run to EXECUTION_MAX_OUTPUT_BYTES per run; ask for it with fields=output_log
+TEST_RUN_DEFAULT_FIELDS = [name for name in TEST_RUN_FIELDS if name != "output_log"]
+
+@router.get("/test-cases/{input_source_id}", response_model=List[TestCaseSummary], response_model_exclude_unset=True)
 async def get_test_cases(
     input_source_id: int,
-    db: Session = Depends(get_db)
+    request: Request,
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(500, ge=1, le=MAX_PAGE_SIZE),
+    fields: Optional[str] = None,
+    include_retired: bool = False,
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Get all test cases for an input source"""
-    test_cases = db.query(TestCase).filter(TestCase.input_source_id == input_source_id).all()
-    return test_cases
+    """Get test cases for an input source, oldest first, one keyset page at a time.
+
+    Cases retired by a regenerate are left out unless `include_retired=true`.
+    """
+    selected = parse_fields(fields, TEST_CASE_FIELDS, TEST_CASE_FIELDS)
+    sort_columns = [TestCase.created_at, TestCase.id]
+    if include_retired:
+        query = select(TestCase).where(TestCase.input_source_id == input_source_id)
+    else:
+        query = test_cases_repository.active_cases(input_source_id)
+    result = await db.execute(keyset_page(query, TestCase, selected, sort_columns, cursor, limit))
+    rows = finish_page(result.scalars().all(), sort_columns, limit, request, response)
+    return [TestCaseSummary(**project(row, selected)) for row in rows]
 
-@router.get("/test-runs/{input_source_id}")
+@router.get("/test-runs/{input_source_id}", response_model=List[TestRunSummary], response_model_exclude_unset=True)
 async def get_test_runs(
     input_source_id: int,
-    db: Session = Depends(get_db)
+    request: Request,
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE),
+    fields: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Get test runs for an input source, oldest first, one keyset page at a time"""
+    selected = parse_fields(fields, TEST_RUN_FIELDS, TEST_RUN_DEFAULT_FIELDS)
+    sort_columns = [TestRun.started_at, TestRun.id]
+    query = select(TestRun).where(TestRun.input_source_id == input_source_id)
+    result = await db.execute(keyset_page(query, TestRun, selected, sort_columns, cursor, limit))
+    rows = finish_page(result.scalars().all(), sort_columns, limit, request, response)
+    return [TestRunSummary(**project(row, selected)) for row in rows]
+
+@router.get("/test-runs/{test_run_id}/status", response_model=TestRunStatusResponse)
+async def get_test_run_status(
+    test_run_id: int,
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Get all test runs for an input source"""
-    test_runs = db.query(TestRun).filter(TestRun.input_source_id == input_source_id).all()
-    return test_runs
+    """Get progress of a test run with an ETA from its predicted duration"""
+    test_run = await db.get(TestRun, test_run_id)
+    if not test_run:
+        raise HTTPException(status_code=404, detail="Test run not found")
+    
+    completed = await db.scalar(select(func.count(TestCaseResult.id)).where(TestCaseResult.test_run_id == test_run_id))
+    end = test_run.completed_at or datetime.utcnow()
+    elapsed = (end - test_run.started_at).total_seconds()
+    
+    eta = None
+    if test_run.status != TestRunStatus.RUNNING:
+        eta = 0.0
+        end = test_run.completed_at or end
+    elif test_run.estimated_duration is not None and elapsed < test_run.estimated_duration:
+        eta = test_run.estimated_duration - elapsed
+    elif completed:
+        # Running past the prediction: extrapolate from the observed pace instead
+        eta = elapsed / completed * max(test_run.total_tests - completed, 0)
+    
+    return TestRunStatusResponse(
+        test_run_id=test_run.id,
+        status=test_run.status,
+        total_tests=test_run.total_tests,
+        completed_tests=completed,
+        passed_tests=test_run.passed_tests,
+        failed_tests=test_run.failed_tests,
+        shard_count=test_run.shard_count,
+        elapsed_seconds=elapsed,
+        estimated_duration=test_run.estimated_duration,
+        eta_seconds=eta,
+        estimated_completion_at=(end + timedelta(seconds=eta)) if eta is not None else None
+    )
+
+@router.get("/test-runs/{test_run_id}/results", response_model=List[TestCaseResultResponse])
+async def get_test_run_results(
+    test_run_id: int,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Get the per-test-case results of a test run"""
+    test_run = await db.get(TestRun, test_run_id)
+    if not test_run:
+        raise HTTPException(status_code=404, detail="Test run not found")
+    result = await db.execute(
+        select(TestCaseResult).where(TestCaseResult.test_run_id == test_run_id).order_by(TestCaseResult.id)
+    )
+    return result.scalars().all()
 
 @router.delete("/test-cases/{test_case_id}")
 async def delete_test_case(
     test_case_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Delete a specific test case"""
-    test_case = db.query(TestCase).filter(TestCase.id == test_case_id).first()
+    test_case = await db.get(TestCase, test_case_id)
     if not test_case:
         raise HTTPException(status_code=404, detail="Test case not found")
     
-    db.delete(test_case)
-    db.commit()
+    await db.delete(test_case)
+    await db.commit()
     return {"message": "Test case deleted successfully"}
 
 @router.delete("/test-runs/{test_run_id}")
 async def delete_test_run(
     test_run_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Delete a specific test run"""
-    test_run = db.query(TestRun).filter(TestRun.id == test_run_id).first()
+    test_run = await db.get(TestRun, test_run_id)
     if not test_run:
         raise HTTPException(status_code=404, detail="Test run not found")
     
-    db.delete(test_run)
-    db.commit()
+    await db.delete(test_run)
+    await db.commit()
     return {"message": "Test run deleted successfully"} 
\ No newline at end of file
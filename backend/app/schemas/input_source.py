@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 from enum import Enum
 
@@ -16,6 +16,11 @@ class InputSourceCreate(BaseModel):
     jira_issue_key: Optional[str] = None
     swagger_url: Optional[str] = None
 
+class InputSourceUpdate(BaseModel):
+    """Fields to replace; omitted fields are left as they are"""
+    name: Optional[str] = None
+    content: Optional[str] = None
+
 class InputSourceResponse(BaseModel):
     id: int
     name: str
@@ -29,4 +34,25 @@ class InputSourceResponse(BaseModel):
     updated_at: datetime
 
     class Config:
-        from_attributes = True 
\ No newline at end of file
+        from_attributes = True
+
+class InputSourceSummary(BaseModel):
+    """List item: everything but `content`; fields outside a `fields=` projection are omitted"""
+    id: int
+    name: Optional[str] = None
+    source_type: Optional[InputSourceType] = None
+    file_path: Optional[str] = None
+    jira_url: Optional[str] = None
+    jira_issue_key: Optional[str] = None
+    swagger_url: Optional[str] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+class JiraSearchImport(BaseModel):
+    jql: str
+    max_issues: Optional[int] = None  # capped at JIRA_SEARCH_MAX_ISSUES
+
+class JiraImportResponse(BaseModel):
+    jql: str
+    imported: int
+    input_sources: List[InputSourceSummary]
@@ -27,6 +27,23 @@ class TestCaseResponse(BaseModel):
     created_at: datetime
     updated_at: datetime
     is_automated: bool
+    section_key: Optional[str] = None
+    retired_at: Optional[datetime] = None
 
     class Config:
-        from_attributes = True 
\ No newline at end of file
+        from_attributes = True
+
+class TestCaseSummary(BaseModel):
+    """List item; fields outside a `fields=` projection are omitted"""
+    id: int
+    title: Optional[str] = None
+    description: Optional[str] = None
+    steps: Optional[str] = None
+    expected_result: Optional[str] = None
+    status: Optional[TestCaseStatus] = None
+    input_source_id: Optional[int] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+    is_automated: Optional[bool] = None
+    section_key: Optional[str] = None
+    retired_at: Optional[datetime] = None
\ No newline at end of file
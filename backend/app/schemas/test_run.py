@@ -23,6 +23,57 @@ class TestRunResponse(BaseModel):
     started_at: datetime
     completed_at: Optional[datetime] = None
     results_summary: Optional[str] = None
+    script_id: Optional[int] = None
+    output_log: Optional[str] = None
+    execution_time: Optional[float] = None
+    throughput_per_minute: Optional[float] = None
+    shard_count: Optional[int] = None
+    estimated_duration: Optional[float] = None
 
     class Config:
-        from_attributes = True 
\ No newline at end of file
+        from_attributes = True 
+
+class TestRunSummary(BaseModel):
+    """List item; fields outside a `fields=` projection are omitted"""
+    id: int
+    name: Optional[str] = None
+    status: Optional[TestRunStatus] = None
+    total_tests: Optional[int] = None
+    passed_tests: Optional[int] = None
+    failed_tests: Optional[int] = None
+    input_source_id: Optional[int] = None
+    started_at: Optional[datetime] = None
+    completed_at: Optional[datetime] = None
+    results_summary: Optional[str] = None
+    script_id: Optional[int] = None
+    output_log: Optional[str] = None
+    execution_time: Optional[float] = None
+    throughput_per_minute: Optional[float] = None
+    shard_count: Optional[int] = None
+    estimated_duration: Optional[float] = None
+
+class TestCaseResultResponse(BaseModel):
+    id: int
+    test_run_id: int
+    test_case_id: int
+    status: str
+    execution_time: float
+    error_message: Optional[str] = None
+    shard: Optional[int] = None
+    completed_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+class TestRunStatusResponse(BaseModel):
+    test_run_id: int
+    status: TestRunStatus
+    total_tests: int
+    completed_tests: int
+    passed_tests: int
+    failed_tests: int
+    shard_count: Optional[int] = None
+    elapsed_seconds: float
+    estimated_duration: Optional[float] = None
+    eta_seconds: Optional[float] = None
+    estimated_completion_at: Optional[datetime] = None
\ No newline at end of file
@@ -0,0 +1,141 @@
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+# Atlassian Document Format (Jira Cloud API v3 rich text) to Markdown.
+# Unknown node types fall back to their children, so new ADF nodes degrade to plain text.
+
+INLINE = {"text", "hardBreak", "mention", "emoji", "inlineCard", "status", "date", "placeholder"}
+CONTAINERS = {"doc", "mediaSingle", "mediaGroup", "layoutSection", "layoutColumn", "expand", "nestedExpand", "extension", "bodiedExtension"}
+
+def adf_to_markdown(node: Any) -> str:
+    """Markdown for an ADF document or node; plain strings (API v2 wiki text) pass through"""
+    if node is None:
+        return ""
+    if isinstance(node, str):
+        return node.strip()
+    if isinstance(node, list):
+        return _blocks(node, "")
+    if not isinstance(node, dict):
+        return str(node)
+    return _block(node, "").strip()
+
+def _blocks(nodes: List[Dict[str, Any]], indent: str) -> str:
+    rendered = [_block(child, indent) for child in nodes or []]
+    return "\n\n".join(block for block in rendered if block.strip())
+
+def _block(node: Dict[str, Any], indent: str) -> str:
+    kind = node.get("type")
+    content = node.get("content") or []
+    attrs = node.get("attrs") or {}
+
+    if kind in CONTAINERS:
+        title = attrs.get("title")
+        body = _blocks(content, indent)
+        return f"{indent}**{title}**\n\n{body}" if title and kind in ("expand", "nestedExpand") else body
+    if kind == "paragraph":
+        return indent + _inline(content)
+    if kind == "heading":
+        return indent + "#" * min(int(attrs.get("level") or 1), 6) + " " + _inline(content)
+    if kind in ("bulletList", "orderedList", "taskList"):
+        return _list(node, indent)
+    if kind == "codeBlock":
+        language = attrs.get("language") or ""
+        code = "".join(child.get("text", "") for child in content)
+        return f"{indent}```{language}\n{code}\n{indent}```"
+    if kind in ("blockquote", "panel"):
+        body = _blocks(content, "")
+        label = f"{attrs['panelType'].capitalize()}: " if kind == "panel" and attrs.get("panelType") else ""
+        return "\n".join(f"{indent}> {line}".rstrip() for line in (label + body).splitlines())
+    if kind == "rule":
+        return indent + "---"
+    if kind == "table":
+        return _table(node, indent)
+    if kind == "media":
+        return indent + f"[attachment: {attrs.get('alt') or attrs.get('id') or 'file'}]"
+    return indent + _inline([node]) if "text" in node or kind in INLINE else _blocks(content, indent)
+
+def _list(node: Dict[str, Any], indent: str) -> str:
+    kind = node.get("type")
+    start = int((node.get("attrs") or {}).get("order") or 1)
+    lines = []
+    for position, item in enumerate(node.get("content") or []):
+        if kind == "orderedList":
+            marker = f"{start + position}."
+        elif kind == "taskList":
+            marker = "- [x]" if (item.get("attrs") or {}).get("state") == "DONE" else "- [ ]"
+        else:
+            marker = "-"
+        children = item.get("content") or []
+        if item.get("type") == "taskItem":
+            # Task items hold inline content directly
+            children = [{"type": "paragraph", "content": children}] if children and children[0].get("type") in INLINE else children
+        first, *rest = children or [{"type": "paragraph", "content": []}]
+        text = _block(first, "").strip() if first.get("type") == "paragraph" else ""
+        lines.append(f"{indent}{marker} {text}".rstrip())
+        nested = rest if first.get("type") == "paragraph" else children
+        for child in nested:
+            block = _block(child, indent + "  ")
+            if block.strip():
+                lines.append(block)
+    return "\n".join(lines)
+
+def _table(node: Dict[str, Any], indent: str) -> str:
+    rows = [
+        [_blocks(cell.get("content") or [], "").replace("\n", " ").replace("|", "\\|") for cell in row.get("content") or []]
+        for row in node.get("content") or []
+    ]
+    rows = [row for row in rows if row]
+    if not rows:
+        return ""
+    width = max(len(row) for row in rows)
+    rows = [row + [""] * (width - len(row)) for row in rows]
+    lines = [f"{indent}| " + " | ".join(rows[0]) + " |", f"{indent}|" + " --- |" * width]
+    lines += [f"{indent}| " + " | ".join(row) + " |" for row in rows[1:]]
+    return "\n".join(lines)
+
+def _inline(nodes: List[Dict[str, Any]]) -> str:
+    parts = []
+    for node in nodes or []:
+        kind = node.get("type")
+        attrs = node.get("attrs") or {}
+        if kind == "text":
+            parts.append(_marked(node.get("text", ""), node.get("marks") or []))
+        elif kind == "hardBreak":
+            parts.append("\n")
+        elif kind == "mention":
+            parts.append(attrs.get("text") or "@user")
+        elif kind == "emoji":
+            parts.append(attrs.get("text") or attrs.get("shortName") or "")
+        elif kind == "inlineCard":
+            parts.append(attrs.get("url") or "")
+        elif kind == "status":
+            parts.append(f"[{attrs.get('text', '')}]")
+        elif kind == "date":
+            parts.append(_date(attrs.get("timestamp")))
+        elif kind != "placeholder":
+            parts.append(_inline(node.get("content") or []))
+    return "".join(parts).strip()
+
+def _marked(text: str, marks: List[Dict[str, Any]]) -> str:
+    if not text.strip():
+        return text
+    for mark in marks:
+        kind = mark.get("type")
+        if kind == "code":
+            text = f"`{text}`"
+        elif kind == "strong":
+            text = f"**{text}**"
+        elif kind == "em":
+            text = f"*{text}*"
+        elif kind == "strike":
+            text = f"~~{text}~~"
+        elif kind == "link":
+            href = (mark.get("attrs") or {}).get("href")
+            text = f"[{text}]({href})" if href and href != text else text
+    return text
+
+def _date(timestamp: Optional[str]) -> str:
+    try:
+        return datetime.fromtimestamp(int(timestamp) / 1000, tz=timezone.utc).strftime("%Y-%m-%d")
+    except (TypeError, ValueError):
+        return ""
@@ -1,42 +1,294 @@
-import requests
+import httpx
 import json
 from app.core.config import settings
-from typing import List, Dict, Any
+from app.core.http_client import get_http_client
+from app.services.llm_cache import get_llm_cache
+from app.services.prompt_compaction import compact
+from app.services import llm_usage
+from app.services.llm_scheduler import CircuitOpenError, get_llm_scheduler
+from app.services.model_router import configured_models, get_model_router
+from app.services.token_budget import estimate_tokens, prompt_budget, split_to_budget, truncate_to_budget
+from app.services.spec_index import SpecIndex
+from app.models.test_case import test_case_fingerprint
+from typing import List, Dict, Any, AsyncIterator, Optional, Tuple, Union
 import asyncio
+import time
+
+# Bump whenever a prompt builder changes so cached responses for the old prompt stop matching
+PROMPT_BUILDER_VERSION = "2"
 
 class AIService:
     def __init__(self):
         self.api_key = settings.OPENROUTER_API_KEY
         self.site_url = settings.OPENROUTER_SITE_URL
         self.site_name = settings.OPENROUTER_SITE_NAME
-        self.base_url = "https://openrouter.ai/api/v1/chat/completions"
-        self.model = "qwen/qwen-2.5-72b-instruct:free"
+        self.base_url = f"{settings.OPENROUTER_BASE_URL.rstrip('/')}/chat/completions"
+        # Requests are routed across these; the first names the cache and usage of cache hits
+        self.models = configured_models()
+        self.model = self.models[0]
+
+    def llm_configured(self) -> bool:
+        return bool(self.api_key) and self.api_key != "your_openrouter_api_key_here"
 
-    async def generate_test_cases(self, input_content: str, source_type: str) -> List[Dict[str, Any]]:
+    async def generate_test_cases(
+        self,
+        input_content: str,
+        source_type: str,
+        bypass_cache: bool = False,
+        exploratory: bool = False
+    ) -> List[Dict[str, Any]]:
         if not self.api_key or self.api_key == "your_openrouter_api_key_here":
             # Return sample test cases when API key is not configured
             return self._get_sample_test_cases(input_content, source_type)
         
-        prompt = self._build_test_case_prompt(input_content, source_type)
+        prompt = self._build_test_case_prompt(input_content, source_type, exploratory)
+        if estimate_tokens(prompt) > self.prompt_budget:
+            return await self._generate_test_cases_split(input_content, source_type, bypass_cache, exploratory)
         
         try:
-            response = await self._make_openrouter_request(prompt)
+            response = await self._complete(prompt, bypass_cache)
+            return self._parse_test_cases_response(response)
+        except Exception as e:
+            raise Exception(f"Error generating test cases: {str(e)}")
+
+    async def _generate_test_cases_split(
+        self,
+        input_content: str,
+        source_type: str,
+        bypass_cache: bool,
+        exploratory: bool
+    ) -> List[Dict[str, Any]]:
+        """Over-budget input: Swagger goes through chunked generation, text is split at blank lines"""
+        if source_type == "swagger":
+            try:
+                spec = json.loads(input_content)
+            except ValueError:
+                spec = None
+            if isinstance(spec, dict):
+                return await self.generate_test_cases_chunked(spec, bypass_cache, exploratory=exploratory)
+        
+        blocks = [block for block in input_content.split("\n\n") if block.strip()]
+        parts = split_to_budget(blocks, estimate_tokens, self._input_budget(source_type, exploratory))
+        semaphore = asyncio.Semaphore(settings.GENERATION_CHUNK_CONCURRENCY)
+        
+        async def generate_part(part: List[str]) -> List[Dict[str, Any]]:
+            prompt = self._build_test_case_prompt("\n\n".join(part), source_type, exploratory)
+            async with semaphore:
+                response = await self._complete(prompt, bypass_cache)
             return self._parse_test_cases_response(response)
+        
+        try:
+            return self.merge_test_cases(await asyncio.gather(*[generate_part(part) for part in parts]))
         except Exception as e:
             raise Exception(f"Error generating test cases: {str(e)}")
 
-    async def generate_automation_script(self, test_cases: List[Dict], script_type: str) -> str:
+    @property
+    def prompt_budget(self) -> int:
+        """Budget of the smallest configured model, since any of them may get the prompt"""
+        return min(prompt_budget(model) for model in self.models)
+
+    def _input_budget(self, source_type: str, exploratory: bool = False, section_keys: Optional[List[str]] = None) -> int:
+        """Tokens left for the input once the prompt template is accounted for"""
+        template = self._build_test_case_prompt("", source_type, exploratory, section_keys)
+        return max(self.prompt_budget - estimate_tokens(template), 1)
+
+    async def generate_test_cases_chunked(
+        self,
+        swagger_data: Union[Dict[str, Any], SpecIndex],
+        bypass_cache: bool = False,
+        chunk_size: Optional[int] = None,
+        concurrency: Optional[int] = None,
+        exploratory: bool = False
+    ) -> List[Dict[str, Any]]:
+        """Generate test cases for a large spec with one bounded-concurrency LLM call per endpoint group.
+
+        Accepts the parsed spec or its (memoized) SpecIndex; prompts carry endpoints with $refs resolved.
+        """
+        if not self.api_key or self.api_key == "your_openrouter_api_key_here":
+            return self._get_sample_test_cases("", "swagger")
+        
+        index = swagger_data if isinstance(swagger_data, SpecIndex) else SpecIndex(swagger_data)
+        groups = index.groups(chunk_size or settings.GENERATION_CHUNK_SIZE)
+        if not groups:
+            return await self.generate_test_cases(json.dumps(index.spec), "swagger", bypass_cache, exploratory)
+        
+        api_info = index.info
+        semaphore = asyncio.Semaphore(concurrency or settings.GENERATION_CHUNK_CONCURRENCY)
+        
+        def render_group(name: str, endpoints: List[Dict[str, Any]]) -> str:
+            return json.dumps({
+                "api": {"title": api_info.get('title'), "version": api_info.get('version')},
+                "group": name,
+                "endpoints": endpoints
+            }, separators=(",", ":"))
+        
+        # Groups too large for one prompt are split further by token budget
+        budget = self._input_budget("swagger", exploratory)
+        parts = [
+            (name, part)
+            for name, group in groups.items()
+            for part in split_to_budget(group, lambda endpoint: estimate_tokens(json.dumps(endpoint, separators=(",", ":"))), budget)
+        ]
+        
+        async def generate_group(name: str, group: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+            group_content = render_group(name, group)
+            prompt = self._build_test_case_prompt(group_content, "swagger", exploratory)
+            async with semaphore:
+                response = await self._complete(prompt, bypass_cache)
+            return self._parse_test_cases_response(response)
+        
+        try:
+            results = await asyncio.gather(*[
+                generate_group(name, group) for name, group in parts
+            ])
+        except Exception as e:
+            raise Exception(f"Error generating test cases: {str(e)}")
+        
+        return self.merge_test_cases(results)
+
+    async def generate_test_cases_for_sections(
+        self,
+        sections: List[Tuple[str, Any]],
+        source_type: str,
+        api_info: Optional[Dict[str, Any]] = None,
+        bypass_cache: bool = False,
+        chunk_size: Optional[int] = None,
+        concurrency: Optional[int] = None,
+        exploratory: bool = False
+    ) -> List[Tuple[List[str], List[Dict[str, Any]]]]:
+        """Generate test cases for just the given (key, payload) sections, `chunk_size` per LLM call.
+
+        Payloads are resolved endpoints for Swagger and section text otherwise. Each
+        case is asked to name its section in a `section` field; returns the section
+        keys of each call with the cases it produced.
+        """
+        size = chunk_size or settings.GENERATION_CHUNK_SIZE
+        batches = [sections[i:i + size] for i in range(0, len(sections), size)]
+        if not self.llm_configured():
+            return [
+                ([key for key, _ in batch], [
+                    {**case, "title": f"{case['title']}: {key}", "section": key}
+                    for key, _ in batch for case in self._get_sample_test_cases("", source_type)
+                ])
+                for batch in batches
+            ]
+        
+        def render_section(section: Tuple[str, Any]) -> str:
+            key, payload = section
+            return json.dumps(payload, separators=(",", ":")) if source_type == "swagger" else f"## {key}\n{payload}"
+        
+        # Batches too large for one prompt are split further by token budget
+        batches = [
+            part
+            for batch in batches
+            for part in split_to_budget(
+                batch, lambda section: estimate_tokens(render_section(section)),
+                self._input_budget(source_type, exploratory, [key for key, _ in batch])
+            )
+        ]
+        semaphore = asyncio.Semaphore(concurrency or settings.GENERATION_CHUNK_CONCURRENCY)
+        
+        async def generate_batch(batch: List[Tuple[str, Any]]) -> Tuple[List[str], List[Dict[str, Any]]]:
+            keys = [key for key, _ in batch]
+            if source_type == "swagger":
+                content = json.dumps({
+                    "api": {"title": (api_info or {}).get('title'), "version": (api_info or {}).get('version')},
+                    "endpoints": [payload for _, payload in batch]
+                }, separators=(",", ":"))
+            else:
+                content = "\n\n".join(render_section(section) for section in batch)
+            prompt = self._build_test_case_prompt(content, source_type, exploratory, section_keys=keys)
+            async with semaphore:
+                response = await self._complete(prompt, bypass_cache)
+            return keys, self._parse_test_cases_response(response)
+        
+        try:
+            return await asyncio.gather(*[generate_batch(batch) for batch in batches])
+        except Exception as e:
+            raise Exception(f"Error generating test cases: {str(e)}")
+
+    @staticmethod
+    def merge_test_cases(batches: List[List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """Flatten per-group results, dropping cases with the same title and steps"""
+        merged = []
+        seen = set()
+        for batch in batches:
+            for test_case in batch:
+                if not isinstance(test_case, dict):
+                    continue
+                fingerprint = test_case_fingerprint(test_case.get('title'), test_case.get('steps'))
+                if fingerprint in seen:
+                    continue
+                seen.add(fingerprint)
+                merged.append(test_case)
+        return merged
+
+    async def generate_automation_script(self, test_cases: List[Dict], script_type: str, bypass_cache: bool = False) -> str:
         if not self.api_key or self.api_key == "your_openrouter_api_key_here":
             # Return sample script when API key is not configured
             return self._get_sample_script(test_cases, script_type)
         
-        prompt = self._build_script_prompt(test_cases, script_type)
+        batches = self._script_batches(test_cases, script_type)
+        semaphore = asyncio.Semaphore(settings.GENERATION_CHUNK_CONCURRENCY)
+        
+        async def generate_part(batch: List[Dict]) -> str:
+            async with semaphore:
+                return await self._complete(self._build_script_prompt(batch, script_type), bypass_cache, operation="script")
         
         try:
-            response = await self._make_openrouter_request(prompt)
-            return response
+            parts = await asyncio.gather(*[generate_part(batch) for batch in batches])
         except Exception as e:
             raise Exception(f"Error generating automation script: {str(e)}")
+        if len(parts) == 1:
+            return parts[0]
+        return "\n\n".join(self._script_part_header(number, len(parts)) + part for number, part in enumerate(parts, 1))
+
+    async def stream_automation_script(self, test_cases: List[Dict], script_type: str, bypass_cache: bool = False) -> AsyncIterator[str]:
+        """Yield the automation script in pieces as the model produces it"""
+        if not self.api_key or self.api_key == "your_openrouter_api_key_here":
+            for line in self._get_sample_script(test_cases, script_type).splitlines(keepends=True):
+                yield line
+            return
+        
+        batches = self._script_batches(test_cases, script_type)
+        for number, batch in enumerate(batches, 1):
+            if len(batches) > 1:
+                yield ("\n\n" if number > 1 else "") + self._script_part_header(number, len(batches))
+            async for token in self._stream_script_part(self._build_script_prompt(batch, script_type), bypass_cache):
+                yield token
+
+    async def _stream_script_part(self, prompt: str, bypass_cache: bool) -> AsyncIterator[str]:
+        prompt, truncated = truncate_to_budget(prompt, self.prompt_budget)
+        cache = get_llm_cache()
+        key = cache.make_key(self.model, PROMPT_BUILDER_VERSION, prompt) if cache else None
+        if cache and not bypass_cache:
+            cached = await cache.get(key)
+            if cached is not None:
+                self._record_usage("script", prompt, cached, {}, time.perf_counter(), truncated, cached=True)
+                yield cached
+                return
+        
+        parts = []
+        try:
+            async for token in self._stream_openrouter_request(prompt, "script", truncated):
+                parts.append(token)
+                yield token
+        except Exception as e:
+            raise Exception(f"Error generating automation script: {str(e)}")
+        
+        if cache:
+            await cache.set(key, "".join(parts))
+
+    def _script_batches(self, test_cases: List[Dict], script_type: str) -> List[List[Dict]]:
+        """Test cases split so each script prompt fits the model's budget (usually one batch)"""
+        budget = max(self.prompt_budget - estimate_tokens(self._build_script_prompt([], script_type)), 1)
+        return split_to_budget(
+            test_cases, lambda test_case: estimate_tokens(json.dumps(test_case, separators=(",", ":"))) + 1, budget
+        ) or [[]]
+
+    @staticmethod
+    def _script_part_header(number: int, total: int) -> str:
+        return f"# ---- Part {number} of {total} (test cases split to fit the model's context) ----\n"
 
     def _get_sample_test_cases(self, input_content: str, source_type: str) -> List[Dict[str, Any]]:
         """Return sample test cases when API key is not configured"""
@@ -119,59 +371,309 @@ def test_sample_functionality():
 if __name__ == "__main__":
     test_sample_functionality()'''
 
-    async def _make_openrouter_request(self, prompt: str) -> str:
-        headers = {
+    async def _complete(self, prompt: str, bypass_cache: bool = False, operation: str = "test_cases") -> str:
+        """Return the completion for a prompt, serving repeats from the LLM cache.
+
+        Prompts over the model's budget are truncated as a last resort; callers split
+        their input first.
+        """
+        prompt, truncated = truncate_to_budget(prompt, self.prompt_budget)
+        cache = get_llm_cache()
+        if cache is None:
+            return await self._make_openrouter_request(prompt, operation, truncated)
+        
+        key = cache.make_key(self.model, PROMPT_BUILDER_VERSION, prompt)
+        if not bypass_cache:
+            cached = await cache.get(key)
+            if cached is not None:
+                self._record_usage(operation, prompt, cached, {}, time.perf_counter(), truncated, cached=True)
+                return cached
+        
+        response = await self._make_openrouter_request(prompt, operation, truncated)
+        await cache.set(key, response)
+        return response
+
+    def _record_usage(
+        self,
+        operation: str,
+        prompt: str,
+        completion: Optional[str],
+        usage: Dict[str, Any],
+        started: float,
+        truncated: bool = False,
+        error: Optional[str] = None,
+        cached: bool = False,
+        model: Optional[str] = None
+    ):
+        """Accounting row for one request; token counts are estimated when the provider reports none"""
+        reported = not cached and usage.get('prompt_tokens') is not None
+        llm_usage.record(
+            model or self.model, operation,
+            prompt_tokens=usage['prompt_tokens'] if reported else estimate_tokens(prompt),
+            completion_tokens=(usage.get('completion_tokens') or 0) if reported else estimate_tokens(completion or ""),
+            latency_ms=0 if cached else int((time.perf_counter() - started) * 1000),
+            estimated=not reported, cached=cached, truncated=truncated, error=error
+        )
+
+    def _headers(self) -> Dict[str, str]:
+        return {
             "Authorization": f"Bearer {self.api_key}",
             "Content-Type": "application/json",
             "HTTP-Referer": self.site_url,
             "X-Title": self.site_name,
         }
-        
+
+    async def _make_openrouter_request(self, prompt: str, operation: str = "test_cases", truncated: bool = False) -> str:
+        """Send the prompt to the fastest healthy model, moving down the ranking on error or timeout.
+
+        With LLM_HEDGING_ENABLED the next model is asked as well once the first passes
+        its p95 latency, and the first answer wins.
+        """
+        router = get_model_router()
+        candidates = self._candidates()
+        errors = []
+        position = 0
+        while position < len(candidates):
+            if position:
+                router.fallbacks += 1
+            model = candidates[position]
+            hedge = candidates[position + 1] if settings.LLM_HEDGING_ENABLED and position + 1 < len(candidates) else None
+            try:
+                if hedge:
+                    return await self._hedged_request(prompt, model, hedge, operation, truncated)
+                return await self._request_model(prompt, model, operation, truncated)
+            except Exception as e:
+                errors.append(str(e))
+            position += 2 if hedge else 1
+        raise Exception("; ".join(errors))
+
+    @staticmethod
+    def _candidates() -> List[str]:
+        """Models in routing order, leaving out those whose circuit breaker is open (unless all are)"""
+        ranked = get_model_router().ranked()
+        scheduler = get_llm_scheduler()
+        available = [model for model in ranked if scheduler.circuit(model).state != "open"]
+        return available or ranked
+
+    async def _hedged_request(self, prompt: str, primary: str, secondary: str, operation: str, truncated: bool) -> str:
+        router = get_model_router()
+        first = asyncio.ensure_future(self._request_model(prompt, primary, operation, truncated))
+        # Without enough samples for a p95 there is no hedge; the secondary only runs if the primary fails
+        done, _ = await asyncio.wait({first}, timeout=router.hedge_delay(primary))
+        if first in done and first.exception() is None:
+            return first.result()
+        hedged = not first.done()
+        if hedged:
+            router.hedges += 1
+        second = asyncio.ensure_future(self._request_model(prompt, secondary, operation, truncated))
+        errors = [str(first.exception())] if first.done() else []
+        pending = {task for task in (first, second) if not task.done()}
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is second and hedged:
+                            router.hedge_wins += 1
+                        return task.result()
+                    errors.append(str(task.exception()))
+            raise Exception("; ".join(errors))
+        finally:
+            # The slower request is abandoned; cancelled requests do not count against the model
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    async def _request_model(self, prompt: str, model: str, operation: str, truncated: bool) -> str:
+        """One completion request to one model, feeding the router and usage accounting.
+
+        The scheduler queues it under the rate limits and retries 429s and 5xx;
+        LLM_REQUEST_TIMEOUT_SECONDS applies to each attempt, not to time queued.
+        """
         data = {
-            "model": self.model,
+            "model": model,
             "messages": [
                 {
                     "role": "user",
                     "content": prompt
                 }
-            ]
+            ],
+            "max_tokens": settings.LLM_MAX_COMPLETION_TOKENS
         }
         
+        started = time.perf_counter()
+        scheduler = get_llm_scheduler()
+        reserved = estimate_tokens(prompt)
+        timeout = settings.LLM_REQUEST_TIMEOUT_SECONDS
+        content, usage, error, latency = None, {}, None, None
         try:
-            response = requests.post(
-                url=self.base_url,
-                headers=headers,
-                data=json.dumps(data)
+            client = get_http_client()
+            response = await scheduler.send(
+                model,
+                lambda: client.post(self.base_url, headers=self._headers(), json=data),
+                reserved,
+                timeout
             )
+            latency = response.elapsed.total_seconds()
             response.raise_for_status()
             
             result = response.json()
-            return result['choices'][0]['message']['content']
-        except requests.exceptions.RequestException as e:
-            raise Exception(f"OpenRouter API request failed: {str(e)}")
+            usage = result.get('usage') or {}
+            scheduler.settle(reserved, (usage.get('prompt_tokens') or 0) + (usage.get('completion_tokens') or 0))
+            content = result['choices'][0]['message']['content']
+        except asyncio.TimeoutError:
+            error, latency = f"{model} did not answer within {timeout:g}s", timeout
+        except httpx.HTTPError as e:
+            error = f"OpenRouter API request failed ({model}): {str(e)}"
         except KeyError as e:
-            raise Exception(f"Unexpected response format from OpenRouter: {str(e)}")
+            error = f"Unexpected response format from OpenRouter ({model}): {str(e)}"
+        # A CircuitOpenError propagates unrecorded: no request was made
+        self._record_routing(model, latency if latency is not None else time.perf_counter() - started, error)
+        self._record_usage(operation, prompt, content, usage, started, truncated, error, model=model)
+        if error is not None:
+            raise Exception(error)
+        return content
 
-    def _build_test_case_prompt(self, input_content: str, source_type: str) -> str:
-        base_prompt = f"""
-        Generate comprehensive test cases based on the following {source_type} input.
-        Return the response as a JSON array with the following structure:
-        [
-            {{
-                "title": "Test case title",
-                "description": "Test case description",
-                "steps": "Step 1. Do this\\nStep 2. Do that\\nStep 3. Verify this",
-                "expected_result": "Expected outcome"
-            }}
-        ]
+    @staticmethod
+    def _record_routing(model: str, latency: float, error: Optional[str]):
+        router = get_model_router()
+        if error is None:
+            router.record_success(model, latency)
+        else:
+            router.record_failure(model, latency)
+
+    async def _stream_openrouter_request(self, prompt: str, operation: str = "script", truncated: bool = False) -> AsyncIterator[str]:
+        """Stream from the fastest healthy model, moving down the ranking when a model
+        fails or times out before its first token (streams are not hedged; the
+        first-token timeout includes time queued by the scheduler)"""
+        router = get_model_router()
+        errors = []
+        for position, model in enumerate(self._candidates()):
+            if position:
+                router.fallbacks += 1
+            stream = self._stream_model(prompt, model, operation, truncated)
+            started = time.perf_counter()
+            timeout = settings.LLM_REQUEST_TIMEOUT_SECONDS
+            try:
+                first = await asyncio.wait_for(stream.__anext__(), timeout)
+            except StopAsyncIteration:
+                return
+            except asyncio.TimeoutError:
+                await stream.aclose()
+                error = f"{model} sent nothing within {timeout:g}s"
+                router.record_failure(model, time.perf_counter() - started)
+                self._record_usage(operation, prompt, None, {}, started, truncated, error, model=model)
+                errors.append(error)
+                continue
+            except Exception as e:
+                errors.append(str(e))
+                continue
+            yield first
+            async for token in stream:
+                yield token
+            return
+        raise Exception("; ".join(errors))
+
+    async def _stream_model(self, prompt: str, model: str, operation: str, truncated: bool) -> AsyncIterator[str]:
+        """Call OpenRouter with `stream: true` and yield content deltas from the SSE stream"""
+        data = {
+            "model": model,
+            "messages": [
+                {
+                    "role": "user",
+                    "content": prompt
+                }
+            ],
+            "max_tokens": settings.LLM_MAX_COMPLETION_TOKENS,
+            "stream": True
+        }
         
-        Input content:
-        {input_content}
-        """
-        return base_prompt
+        started = sent = time.perf_counter()
+        scheduler = get_llm_scheduler()
+        reserved = estimate_tokens(prompt)
+        parts, usage, error = [], {}, None
+        try:
+            client = get_http_client()
+            attempt = 0
+            while True:
+                await scheduler.acquire(model, reserved)
+                sent = time.perf_counter()
+                try:
+                    async with client.stream("POST", self.base_url, headers=self._headers(), json=data) as response:
+                        # Retries happen before anything is yielded, so no output is repeated
+                        delay = scheduler.outcome(model, attempt, response)
+                        if delay is None:
+                            response.raise_for_status()
+                            async for line in response.aiter_lines():
+                                # Blank lines separate events; lines starting with ':' are keep-alive comments
+                                if not line.startswith("data:"):
+                                    continue
+                                payload = line[len("data:"):].strip()
+                                if payload == "[DONE]":
+                                    break
+                                chunk = json.loads(payload)
+                                if "error" in chunk:
+                                    raise Exception(chunk["error"].get("message", "stream error"))
+                                # The final chunk carries usage and may have no choices
+                                usage = chunk.get('usage') or usage
+                                if not chunk.get('choices'):
+                                    continue
+                                content = chunk['choices'][0].get('delta', {}).get('content')
+                                if content:
+                                    parts.append(content)
+                                    yield content
+                            break
+                except httpx.TransportError:
+                    delay = None if parts else scheduler.outcome(model, attempt)
+                    if delay is None:
+                        raise
+                await asyncio.sleep(delay)
+                attempt += 1
+            scheduler.settle(reserved, (usage.get('prompt_tokens') or 0) + (usage.get('completion_tokens') or 0))
+        except httpx.HTTPError as e:
+            error = f"OpenRouter API request failed ({model}): {str(e)}"
+        except (KeyError, IndexError, json.JSONDecodeError) as e:
+            error = f"Unexpected response format from OpenRouter ({model}): {str(e)}"
+        except CircuitOpenError:
+            raise
+        except Exception as e:
+            error = str(e)
+        self._record_routing(model, time.perf_counter() - sent, error)
+        self._record_usage(operation, prompt, "".join(parts), usage, started, truncated, error, model=model)
+        if error is not None:
+            raise Exception(error)
+
+    def _build_test_case_prompt(
+        self,
+        input_content: str,
+        source_type: str,
+        exploratory: bool = False,
+        section_keys: Optional[List[str]] = None
+    ) -> str:
+        parts = [f"""
+        Generate comprehensive test cases based on the following {source_type} input.
+        Return the response as a JSON array of objects with "title", "description",
+        "steps" (e.g. "Step 1. Do this\\nStep 2. Verify that") and "expected_result".
+        """]
+        if exploratory:
+            # The rule-based generator already covers the mechanical cases
+            parts.append("""
+        Happy paths, missing required parameters, enum and range boundaries and documented
+        error responses are already covered. Only return additional exploratory cases:
+        business rules, multi-step workflows, authorization, data consistency and concurrency.
+        """)
+        if section_keys:
+            parts.append(f"""
+        Also give every test case a "section" field naming the part of the input it tests,
+        exactly as one of: {json.dumps(section_keys)}
+        """)
+        # Compacted separately so the input's own lines are not dedented with the template.
+        # Only whitespace is normalised in the input: a line like "Default: null" can matter,
+        # and Jira issues have had empty fields dropped by parse_jira_issue already
+        return "\n\n".join(compact(part) for part in parts) + "\n\nInput content:\n" + compact(input_content, drop_empty_fields=False)
 
     def _build_script_prompt(self, test_cases: List[Dict], script_type: str) -> str:
-        test_cases_text = json.dumps(test_cases, indent=2)
+        test_cases_text = json.dumps(test_cases, separators=(",", ":"))
         
         if script_type == "playwright_python":
             framework = "Playwright with Python"
@@ -181,15 +683,10 @@ if __name__ == "__main__":
             framework = "Playwright with Python"
         
         prompt = f"""
-        Generate an automation script using {framework} based on the following test cases.
-        The script should be complete and executable.
-        
-        Test cases:
-        {test_cases_text}
-        
-        Generate a complete Python script that can run these test cases.
+        Generate a complete, executable Python automation script using {framework}
+        that runs the following test cases (JSON).
         """
-        return prompt
+        return compact(prompt) + "\n\nTest cases:\n" + test_cases_text
 
     def _parse_test_cases_response(self, response_text: str) -> List[Dict[str, Any]]:
         try:
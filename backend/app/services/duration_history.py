@@ -0,0 +1,57 @@
+import math
+from typing import List, Dict, Any
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.test_case_duration import TestCaseDuration
+
+# Samples kept per test case for the rolling mean and p95
+WINDOW_SIZE = 20
+
+def _percentile(values: List[float], percentile: float) -> float:
+    ordered = sorted(values)
+    index = max(0, math.ceil(percentile / 100 * len(ordered)) - 1)
+    return ordered[index]
+
+async def load_history(db: AsyncSession, test_case_ids: List[int]) -> Dict[int, TestCaseDuration]:
+    if not test_case_ids:
+        return {}
+    result = await db.execute(select(TestCaseDuration).where(TestCaseDuration.test_case_id.in_(test_case_ids)))
+    return {row.test_case_id: row for row in result.scalars()}
+
+def predicted_durations(history: Dict[int, TestCaseDuration]) -> Dict[int, float]:
+    return {test_case_id: row.mean_duration for test_case_id, row in history.items() if row.sample_count}
+
+def flaky_test_case_ids(history: Dict[int, TestCaseDuration], threshold: float, min_runs: int = 3) -> set:
+    return {
+        test_case_id for test_case_id, row in history.items()
+        if row.run_count >= min_runs and row.flakiness >= threshold
+    }
+
+async def record_results(db: AsyncSession, results: List[Dict[str, Any]]):
+    """Fold a batch of execution results into the per-case history (caller commits)"""
+    history = await load_history(db, list({result['test_case_id'] for result in results}))
+    for result in results:
+        row = history.get(result['test_case_id'])
+        if row is None:
+            row = TestCaseDuration(
+                test_case_id=result['test_case_id'],
+                sample_count=0, run_count=0, fail_count=0, flip_count=0,
+                recent_durations=""
+            )
+            db.add(row)
+            history[row.test_case_id] = row
+
+        samples = [int(ms) / 1000 for ms in row.recent_durations.split(",") if ms]
+        samples = (samples + [result['execution_time']])[-WINDOW_SIZE:]
+        row.recent_durations = ",".join(str(round(sample * 1000)) for sample in samples)
+        row.sample_count = len(samples)
+        row.mean_duration = sum(samples) / len(samples)
+        row.p95_duration = _percentile(samples, 95)
+
+        status = result['status']
+        if row.last_status is not None and row.last_status != status:
+            row.flip_count += 1
+        row.run_count += 1
+        if status != 'passed':
+            row.fail_count += 1
+        row.last_status = status
@@ -0,0 +1,133 @@
+import csv
+import io
+import json
+import zipfile
+import zlib
+from datetime import datetime
+from typing import Any, AsyncIterator, List, NamedTuple, Sequence, Tuple
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:  # optional: only needed for format=parquet
+    pyarrow = None
+
+class ExportColumn(NamedTuple):
+    key: str  # NDJSON / Parquet field name
+    label: str  # CSV header
+    kind: str  # int, float, str, bool or datetime
+
+Batches = AsyncIterator[Sequence[Sequence[Any]]]
+
+FORMATS = {
+    "csv": ("text/csv", "csv"),  # Starlette appends charset=utf-8 to text types
+    "ndjson": ("application/x-ndjson", "ndjson"),
+    "parquet": ("application/vnd.apache.parquet", "parquet")
+}
+
+def parquet_available() -> bool:
+    return pyarrow is not None
+
+class ChunkSink(io.RawIOBase):
+    """Write-only file object that hands written bytes back to the streaming generator"""
+
+    def __init__(self):
+        self.chunks: List[bytes] = []
+        self.position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self.chunks.append(bytes(data))
+        self.position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self.position
+
+    def take(self) -> bytes:
+        data, self.chunks = b"".join(self.chunks), []
+        return data
+
+def _csv_cell(value: Any) -> Any:
+    if value is None:
+        return ''
+    if isinstance(value, datetime):
+        return value.strftime('%Y-%m-%d %H:%M:%S')
+    return value
+
+def _json_value(value: Any) -> Any:
+    return value.isoformat() if isinstance(value, datetime) else value
+
+async def csv_chunks(columns: List[ExportColumn], batches: Batches) -> AsyncIterator[bytes]:
+    """One CSV chunk per database batch; memory stays at one batch regardless of export size"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow([column.label for column in columns])
+    async for batch in batches:
+        writer.writerows([[_csv_cell(value) for value in row] for row in batch])
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+async def ndjson_chunks(columns: List[ExportColumn], batches: Batches) -> AsyncIterator[bytes]:
+    keys = [column.key for column in columns]
+    async for batch in batches:
+        yield "".join(
+            json.dumps({key: _json_value(value) for key, value in zip(keys, row)}) + "\n" for row in batch
+        ).encode("utf-8")
+
+def _arrow_schema(columns: List[ExportColumn]):
+    types = {
+        "int": pyarrow.int64(),
+        "float": pyarrow.float64(),
+        "str": pyarrow.string(),
+        "bool": pyarrow.bool_(),
+        "datetime": pyarrow.timestamp("us")
+    }
+    return pyarrow.schema([(column.key, types[column.kind]) for column in columns])
+
+async def parquet_chunks(columns: List[ExportColumn], batches: Batches) -> AsyncIterator[bytes]:
+    """One Parquet row group per database batch, streamed as soon as each group is written"""
+    schema = _arrow_schema(columns)
+    sink = ChunkSink()
+    writer = pyarrow.parquet.ParquetWriter(sink, schema)
+    async for batch in batches:
+        values = list(zip(*batch)) if batch else [() for _ in columns]
+        writer.write_table(pyarrow.Table.from_arrays(
+            [pyarrow.array(list(column), type=field.type) for column, field in zip(values, schema)],
+            schema=schema
+        ))
+        yield sink.take()
+    writer.close()
+    yield sink.take()
+
+async def gzip_chunks(chunks: AsyncIterator[bytes], level: int = 6) -> AsyncIterator[bytes]:
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)  # wbits 31 = gzip container
+    async for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+async def zip_chunks(files: AsyncIterator[Tuple[str, str]]) -> AsyncIterator[bytes]:
+    """Stream a deflated zip archive of (name, text) pairs, one member at a time.
+
+    The sink is not seekable, so zipfile writes data descriptors after each
+    member instead of patching headers; nothing is buffered beyond one file.
+    """
+    sink = ChunkSink()
+    with zipfile.ZipFile(sink, mode="w", compression=zipfile.ZIP_DEFLATED) as archive:
+        async for name, content in files:
+            with archive.open(name, mode="w") as member:
+                member.write(content.encode("utf-8"))
+            yield sink.take()
+    yield sink.take()
+
+def export_chunks(export_format: str, columns: List[ExportColumn], batches: Batches, gzip: bool = False) -> AsyncIterator[bytes]:
+    writers = {"csv": csv_chunks, "ndjson": ndjson_chunks, "parquet": parquet_chunks}
+    chunks = writers[export_format](columns, batches)
+    return gzip_chunks(chunks) if gzip else chunks
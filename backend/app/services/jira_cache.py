@@ -0,0 +1,105 @@
+import json
+import math
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.input_source import InputSource, InputSourceType
+from app.models.jira_issue import JiraIssue
+from app.services.jira_service import JiraService
+
+# Issue keys per `key in (...)` refresh query; keeps the JQL well under URL length limits
+REFRESH_KEY_BATCH = 100
+# Extra minutes queried before the last sync, for clock skew between us and Jira
+CLOCK_SKEW_MINUTES = 2
+
+def parse_updated(value: Optional[str]) -> Optional[datetime]:
+    """Jira's `fields.updated` ("2025-01-01T10:00:00.000+0200") as naive UTC"""
+    if not value:
+        return None
+    try:
+        return datetime.strptime(value, "%Y-%m-%dT%H:%M:%S.%f%z").astimezone(timezone.utc).replace(tzinfo=None)
+    except ValueError:
+        return None
+
+async def get_issue(db: AsyncSession, issue_key: str) -> Optional[Dict[str, Any]]:
+    row = await db.get(JiraIssue, issue_key)
+    return json.loads(row.raw) if row else None
+
+async def store_issues(db: AsyncSession, issues: List[Dict[str, Any]], synced_at: Optional[datetime] = None) -> List[str]:
+    """Insert or update cache entries (caller commits); returns the keys that are new or changed remotely"""
+    synced_at = synced_at or datetime.utcnow()
+    by_key = {issue['key']: issue for issue in issues if issue.get('key')}
+    result = await db.execute(select(JiraIssue).where(JiraIssue.issue_key.in_(list(by_key))))
+    cached = {row.issue_key: row for row in result.scalars()}
+    changed = []
+    for key, issue in by_key.items():
+        updated = parse_updated((issue.get('fields') or {}).get('updated'))
+        row = cached.get(key)
+        if row is None:
+            db.add(JiraIssue(issue_key=key, raw=json.dumps(issue), remote_updated_at=updated, fetched_at=synced_at))
+            changed.append(key)
+            continue
+        if row.remote_updated_at != updated or updated is None:
+            row.raw = json.dumps(issue)
+            row.remote_updated_at = updated
+            changed.append(key)
+        row.fetched_at = synced_at
+    return changed
+
+async def invalidate(db: AsyncSession, issue_key: str) -> bool:
+    """Drop one entry so the next ingestion fetches it again (caller commits)"""
+    result = await db.execute(delete(JiraIssue).where(JiraIssue.issue_key == issue_key))
+    return result.rowcount > 0
+
+async def stats(db: AsyncSession) -> Dict[str, Any]:
+    entries, oldest, newest = (await db.execute(
+        select(func.count(), func.min(JiraIssue.fetched_at), func.max(JiraIssue.remote_updated_at))
+    )).one()
+    return {"entries": entries, "oldest_sync": oldest, "newest_remote_update": newest}
+
+async def refresh(db: AsyncSession, jira_service: JiraService) -> Dict[str, Any]:
+    """Re-fetch cached issues updated in Jira since they were last synced, and update
+    the content of the Jira input sources built from them (commits).
+
+    Each batch of keys asks Jira only for `updated >= -Nm`, N reaching back to the
+    batch's oldest sync; entries that did not change just have their sync time moved on.
+    """
+    synced_at = datetime.utcnow()
+    result = await db.execute(select(JiraIssue.issue_key, JiraIssue.fetched_at).order_by(JiraIssue.issue_key))
+    entries = result.all()
+    changed: List[str] = []
+    fetched: Dict[str, Dict[str, Any]] = {}
+    for start in range(0, len(entries), REFRESH_KEY_BATCH):
+        batch = entries[start:start + REFRESH_KEY_BATCH]
+        keys = [key for key, _ in batch]
+        oldest = min((fetched_at for _, fetched_at in batch if fetched_at), default=None)
+        jql = f"key in ({', '.join(keys)})"
+        if oldest is not None:
+            minutes = math.ceil((synced_at - oldest).total_seconds() / 60) + CLOCK_SKEW_MINUTES
+            jql += f" AND updated >= -{minutes}m"
+        issues = await jira_service.search_issues(jql, max_issues=len(keys))
+        fetched.update((issue['key'], issue) for issue in issues)
+        changed += await store_issues(db, issues, synced_at)
+        await db.execute(
+            update(JiraIssue).where(JiraIssue.issue_key.in_(keys)).values(fetched_at=synced_at)
+            .execution_options(synchronize_session=False)
+        )
+
+    sources_updated = 0
+    if changed:
+        result = await db.execute(select(InputSource).where(
+            InputSource.source_type == InputSourceType.JIRA, InputSource.jira_issue_key.in_(changed)
+        ))
+        for source in result.scalars():
+            content = jira_service.parse_jira_issue(fetched[source.jira_issue_key])
+            if source.content != content:
+                source.content = content
+                sources_updated += 1
+    await db.commit()
+    return {
+        "checked": len(entries),
+        "queries": math.ceil(len(entries) / REFRESH_KEY_BATCH),
+        "updated": changed,
+        "input_sources_updated": sources_updated
+    }
@@ -1,7 +1,17 @@
-import requests
+import asyncio
+import httpx
 from typing import Dict, Any, Optional, List
 import json
 from app.core.config import settings
+from app.core.http_client import get_http_client
+from app.services.adf import adf_to_markdown
+from app.services.prompt_compaction import compact
+
+# Only what parse_jira_issue reads; Jira otherwise returns every field, including comments and changelog
+ISSUE_FIELDS = [
+    "summary", "description", "issuetype", "status", "priority", "assignee", "reporter",
+    "labels", "created", "updated", "subtasks", "issuelinks"
+]
 
 class JiraService:
     def __init__(self):
@@ -9,11 +19,20 @@ class JiraService:
         self.username = settings.JIRA_USERNAME
         self.api_token = settings.JIRA_API_TOKEN
 
+    def api_configured(self) -> bool:
+        return bool(self.base_url and self.username and self.api_token)
+
+    def issue_fields(self) -> List[str]:
+        """ISSUE_FIELDS plus the acceptance criteria custom field, when configured"""
+        if settings.JIRA_ACCEPTANCE_CRITERIA_FIELD:
+            return ISSUE_FIELDS + [settings.JIRA_ACCEPTANCE_CRITERIA_FIELD]
+        return ISSUE_FIELDS
+
     async def fetch_jira_issue(self, jira_url: str, issue_key: str) -> str:
         """Fetch Jira issue content"""
         try:
             # If we have Jira credentials, use the API
-            if self.base_url and self.username and self.api_token:
+            if self.api_configured():
                 return await self._fetch_via_api(issue_key)
             else:
                 # Fallback to public URL (limited functionality)
@@ -23,14 +42,72 @@ class JiraService:
 
     async def _fetch_via_api(self, issue_key: str) -> str:
         """Fetch issue via Jira REST API"""
-        url = f"{self.base_url}/rest/api/3/issue/{issue_key}"
-        auth = (self.username, self.api_token)
-        
-        response = requests.get(url, auth=auth)
+        issue_data = await self.fetch_issue_data(issue_key)
+        return self.parse_jira_issue(issue_data)
+
+    async def fetch_issue_data(self, issue_key: str) -> Dict[str, Any]:
+        """Raw issue JSON from /rest/api/3/issue, limited to issue_fields()"""
+        response = await get_http_client().get(
+            f"{self.base_url.rstrip('/')}/rest/api/3/issue/{issue_key}",
+            params={"fields": ",".join(self.issue_fields())},
+            auth=(self.username, self.api_token)
+        )
         response.raise_for_status()
-        
-        issue_data = response.json()
-        return self._parse_jira_issue(issue_data)
+        return response.json()
+
+    async def search_issues(
+        self,
+        jql: str,
+        max_issues: Optional[int] = None,
+        page_size: Optional[int] = None,
+        concurrency: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Raw issues matching a JQL query, paged through /rest/api/3/search.
+
+        The first page reports the total; the remaining pages are fetched in parallel
+        (at most `concurrency` at a time) over the shared connection pool.
+        """
+        if not self.api_configured():
+            raise ValueError("Jira search requires JIRA_SERVER_URL, JIRA_USERNAME and JIRA_API_TOKEN")
+        limit = min(max_issues or settings.JIRA_SEARCH_MAX_ISSUES, settings.JIRA_SEARCH_MAX_ISSUES)
+        size = min(page_size or settings.JIRA_SEARCH_PAGE_SIZE, limit)
+        semaphore = asyncio.Semaphore(concurrency or settings.JIRA_SEARCH_CONCURRENCY)
+
+        async def fetch_page(start_at: int) -> Dict[str, Any]:
+            async with semaphore:
+                response = await get_http_client().get(
+                    f"{self.base_url.rstrip('/')}/rest/api/3/search",
+                    params={
+                        "jql": jql,
+                        "startAt": start_at,
+                        "maxResults": min(size, limit - start_at),
+                        "fields": ",".join(self.issue_fields()),
+                        # Unknown keys in `key in (...)` become warnings instead of failing the query
+                        "validateQuery": "warn"
+                    },
+                    auth=(self.username, self.api_token)
+                )
+            response.raise_for_status()
+            return response.json()
+
+        try:
+            first = await fetch_page(0)
+            issues = list(first.get('issues', []))
+            # Jira may cap maxResults below what was asked; page by what it actually returned
+            step = len(issues)
+            total = min(first.get('total', step), limit)
+            if step:
+                pages = await asyncio.gather(*[fetch_page(start) for start in range(step, total, step)])
+                for page in pages:
+                    issues.extend(page.get('issues', []))
+        except httpx.HTTPStatusError as e:
+            raise Exception(f"Jira search failed with HTTP {e.response.status_code}: {e.response.text[:200]}")
+        except httpx.HTTPError as e:
+            raise Exception(f"Jira search failed: {str(e)}")
+        return issues[:limit]
+
+    def issue_url(self, issue_key: str) -> str:
+        return f"{self.base_url.rstrip('/')}/browse/{issue_key}"
 
     async def _fetch_via_public_url(self, jira_url: str, issue_key: str) -> str:
         """Fetch issue via public URL (basic implementation)"""
@@ -49,23 +126,59 @@ class JiraService:
         3. Set JIRA_API_TOKEN in .env
         """
 
-    def _parse_jira_issue(self, issue_data: Dict[str, Any]) -> str:
-        """Parse Jira issue data into readable content"""
-        fields = issue_data.get('fields', {})
-        
-        content = f"""
-        Issue Key: {issue_data.get('key', 'N/A')}
-        Summary: {fields.get('summary', 'N/A')}
-        Description: {fields.get('description', 'N/A')}
-        Status: {fields.get('status', {}).get('name', 'N/A')}
-        Priority: {fields.get('priority', {}).get('name', 'N/A')}
-        Assignee: {fields.get('assignee', {}).get('displayName', 'N/A')}
-        Reporter: {fields.get('reporter', {}).get('displayName', 'N/A')}
-        Created: {fields.get('created', 'N/A')}
-        Updated: {fields.get('updated', 'N/A')}
+    def parse_jira_issue(self, issue_data: Dict[str, Any]) -> str:
+        """Parse Jira issue data into compact Markdown for test generation.
+
+        Rich text (ADF) is rendered as Markdown; acceptance criteria, subtasks and
+        linked issues get their own sections and unset fields are left out.
         """
-        
-        return content
+        fields = issue_data.get('fields') or {}
+        # Unassigned issues and unset priorities come back as null
+        metadata = [
+            ("Type", (fields.get('issuetype') or {}).get('name')),
+            ("Status", (fields.get('status') or {}).get('name')),
+            ("Priority", (fields.get('priority') or {}).get('name')),
+            ("Assignee", (fields.get('assignee') or {}).get('displayName')),
+            ("Reporter", (fields.get('reporter') or {}).get('displayName')),
+            ("Labels", ", ".join(fields.get('labels') or [])),
+            ("Created", (fields.get('created') or '')[:10]),
+            ("Updated", (fields.get('updated') or '')[:10]),
+        ]
+        blocks = ["\n".join(
+            [f"# {issue_data.get('key', '')}: {fields.get('summary') or ''}"]
+            + [f"{label}: {value}" for label, value in metadata if value]
+        )]
+
+        description = adf_to_markdown(fields.get('description'))
+        if description:
+            blocks.append(f"## Description\n\n{description}")
+        criteria_field = settings.JIRA_ACCEPTANCE_CRITERIA_FIELD
+        criteria = adf_to_markdown(fields.get(criteria_field)) if criteria_field else ""
+        if criteria:
+            blocks.append(f"## Acceptance criteria\n\n{criteria}")
+
+        subtasks = [self._issue_line(subtask) for subtask in fields.get('subtasks') or []]
+        if subtasks:
+            blocks.append("## Subtasks\n\n" + "\n".join(f"- {line}" for line in subtasks))
+        links = []
+        for link in fields.get('issuelinks') or []:
+            direction = 'outward' if link.get('outwardIssue') else 'inward'
+            linked = link.get(f'{direction}Issue')
+            if linked:
+                relation = (link.get('type') or {}).get(direction) or 'relates to'
+                links.append(f"- {relation} {self._issue_line(linked)}")
+        if links:
+            blocks.append("## Linked issues\n\n" + "\n".join(links))
+
+        return compact("\n\n".join(blocks))
+
+    @staticmethod
+    def _issue_line(issue: Dict[str, Any]) -> str:
+        """`KEY: summary (status)` for a subtask or linked issue reference"""
+        fields = issue.get('fields') or {}
+        status = (fields.get('status') or {}).get('name')
+        line = f"{issue.get('key', '')}: {fields.get('summary') or ''}".rstrip(": ")
+        return f"{line} ({status})" if status else line
 
     def validate_jira_url(self, url: str) -> bool:
         """Validate Jira URL format"""
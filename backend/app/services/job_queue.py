@@ -0,0 +1,280 @@
+import asyncio
+import enum
+import json
+import sqlite3
+import threading
+import uuid
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from app.core.config import settings
+
+JobHandler = Callable[[Dict[str, Any]], Awaitable[Dict[str, Any]]]
+
+class JobStatus(str, enum.Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+FINISHED_STATUSES = (JobStatus.COMPLETED, JobStatus.FAILED, JobStatus.CANCELLED)
+
+class Job:
+    def __init__(self, job_type: str, params: Dict[str, Any], job_id: Optional[str] = None):
+        self.id = job_id or uuid.uuid4().hex
+        self.job_type = job_type
+        self.params = params
+        self.status = JobStatus.QUEUED
+        self.result: Optional[Dict[str, Any]] = None
+        self.error: Optional[str] = None
+        self.created_at = datetime.utcnow()
+        self.started_at: Optional[datetime] = None
+        self.completed_at: Optional[datetime] = None
+
+    def to_dict(self, include_result: bool = False) -> Dict[str, Any]:
+        data = {
+            "id": self.id,
+            "job_type": self.job_type,
+            "params": self.params,
+            "status": self.status.value,
+            "error": self.error,
+            "created_at": self.created_at.isoformat(),
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "completed_at": self.completed_at.isoformat() if self.completed_at else None
+        }
+        if include_result:
+            data["result"] = self.result
+        return data
+
+class SQLiteJobStore:
+    """Persists jobs so queued work survives a restart. Its methods block; JobQueue
+    calls them through asyncio.to_thread to keep them off the event loop."""
+
+    def __init__(self, path: str):
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY,
+                job_type TEXT NOT NULL,
+                params TEXT NOT NULL,
+                status TEXT NOT NULL,
+                result TEXT,
+                error TEXT,
+                created_at TEXT NOT NULL,
+                started_at TEXT,
+                completed_at TEXT
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS ix_jobs_status ON jobs (status, created_at)")
+
+    def save(self, job: Job):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO jobs VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    job.id, job.job_type, json.dumps(job.params), job.status.value,
+                    json.dumps(job.result) if job.result is not None else None, job.error,
+                    job.created_at.isoformat(),
+                    job.started_at.isoformat() if job.started_at else None,
+                    job.completed_at.isoformat() if job.completed_at else None
+                )
+            )
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._from_row(row) if row else None
+
+    def load_unfinished(self) -> List[Job]:
+        """Jobs that were queued, or running when the process stopped, oldest first"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT * FROM jobs WHERE status IN (?, ?) ORDER BY created_at",
+                (JobStatus.QUEUED.value, JobStatus.RUNNING.value)
+            ).fetchall()
+        return [self._from_row(row) for row in rows]
+
+    @staticmethod
+    def _from_row(row) -> Job:
+        job = Job(row[1], json.loads(row[2]), job_id=row[0])
+        job.status = JobStatus(row[3])
+        job.result = json.loads(row[4]) if row[4] else None
+        job.error = row[5]
+        job.created_at = datetime.fromisoformat(row[6])
+        job.started_at = datetime.fromisoformat(row[7]) if row[7] else None
+        job.completed_at = datetime.fromisoformat(row[8]) if row[8] else None
+        return job
+
+class JobQueue:
+    """In-process asyncio worker pool for long-running generation and execution work.
+
+    Handlers are registered per job type together with a concurrency limit. Each
+    type has its own queue and that many workers, so a backlog of one type never
+    holds up another; `workers` caps how many jobs run at once across all types.
+    With `store_path`, a SQLite store opened on start persists every state change
+    and lets queued jobs resume; store calls run in a worker thread.
+    """
+
+    def __init__(self, workers: int, store_path: Optional[str] = None, history_limit: int = 1000):
+        self.workers = workers
+        self.store_path = store_path
+        self.store: Optional[SQLiteJobStore] = None
+        self.history_limit = history_limit
+        self._handlers: Dict[str, JobHandler] = {}
+        self._concurrency: Dict[str, int] = {}
+        self._jobs: Dict[str, Job] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._cancel_requested: set = set()
+        self._queues: Optional[Dict[str, asyncio.Queue]] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._store_lock: Optional[asyncio.Lock] = None
+        self._workers: List[asyncio.Task] = []
+
+    def register(self, job_type: str, handler: JobHandler, concurrency: int):
+        self._handlers[job_type] = handler
+        self._concurrency[job_type] = concurrency
+
+    @property
+    def job_types(self) -> List[str]:
+        return list(self._handlers)
+
+    async def start(self):
+        if self.store_path and self.store is None:
+            self.store = await asyncio.to_thread(SQLiteJobStore, self.store_path)
+        self._queues = {job_type: asyncio.Queue() for job_type in self._handlers}
+        self._slots = asyncio.Semaphore(self.workers)
+        self._store_lock = asyncio.Lock()
+        if self.store:
+            for job in await asyncio.to_thread(self.store.load_unfinished):
+                self._jobs[job.id] = job
+                if job.job_type not in self._queues:
+                    job.error = f"Unknown job type: {job.job_type}"
+                    await self._finish(job, JobStatus.FAILED)
+                    continue
+                job.status = JobStatus.QUEUED
+                job.started_at = None
+                await self._save(job)
+                self._queues[job.job_type].put_nowait(job.id)
+        self._workers = [
+            asyncio.create_task(self._worker(job_type))
+            for job_type, concurrency in self._concurrency.items()
+            for _ in range(concurrency)
+        ]
+
+    async def stop(self):
+        for task in list(self._tasks.values()) + self._workers:
+            task.cancel()
+        await asyncio.gather(*self._tasks.values(), *self._workers, return_exceptions=True)
+        self._workers = []
+
+    async def submit(self, job_type: str, params: Dict[str, Any]) -> Job:
+        if job_type not in self._handlers:
+            raise ValueError(f"Unknown job type: {job_type}")
+        if self._queues is None:
+            raise RuntimeError("Job queue is not running")
+        job = Job(job_type, params)
+        self._jobs[job.id] = job
+        await self._save(job)
+        self._queues[job_type].put_nowait(job.id)
+        self._prune_history()
+        return job
+
+    async def get(self, job_id: str) -> Optional[Job]:
+        job = self._jobs.get(job_id)
+        if job is None and self.store:
+            job = await asyncio.to_thread(self.store.get, job_id)
+        return job
+
+    def list(self, status: Optional[JobStatus] = None) -> List[Job]:
+        jobs = sorted(self._jobs.values(), key=lambda job: job.created_at, reverse=True)
+        return [job for job in jobs if status is None or job.status == status]
+
+    async def cancel(self, job_id: str) -> bool:
+        """Cancel a queued or running job; returns False if it had already finished"""
+        job = self._jobs.get(job_id)
+        if job is None or job.status in FINISHED_STATUSES:
+            return False
+        task = self._tasks.get(job_id)
+        if task is not None:
+            self._cancel_requested.add(job_id)
+            task.cancel()
+        else:
+            await self._finish(job, JobStatus.CANCELLED)
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        counts = {status.value: 0 for status in JobStatus}
+        for job in self._jobs.values():
+            counts[job.status.value] += 1
+        depths = {job_type: queue.qsize() for job_type, queue in (self._queues or {}).items()}
+        return {
+            "workers": self.workers,
+            "concurrency": dict(self._concurrency),
+            "queue_depth": sum(depths.values()),
+            "queue_depths": depths,
+            "jobs": counts
+        }
+
+    async def _worker(self, job_type: str):
+        queue = self._queues[job_type]
+        while True:
+            job_id = await queue.get()
+            try:
+                job = self._jobs.get(job_id)
+                if job is None or job.status != JobStatus.QUEUED:
+                    continue
+                # Held only while a job runs, so waiting here never blocks other types' workers
+                async with self._slots:
+                    if job.status != JobStatus.QUEUED:
+                        continue
+                    await self._run(job)
+            finally:
+                queue.task_done()
+
+    async def _run(self, job: Job):
+        job.status = JobStatus.RUNNING
+        job.started_at = datetime.utcnow()
+        await self._save(job)
+        task = asyncio.create_task(self._handlers[job.job_type](job.params))
+        self._tasks[job.id] = task
+        try:
+            job.result = await task
+            await self._finish(job, JobStatus.COMPLETED)
+        except asyncio.CancelledError:
+            if job.id not in self._cancel_requested:
+                # Shutdown: leave the job marked running so the next start re-queues it
+                raise
+            self._cancel_requested.discard(job.id)
+            await self._finish(job, JobStatus.CANCELLED)
+        except Exception as e:
+            job.error = getattr(e, "detail", None) or str(e)
+            await self._finish(job, JobStatus.FAILED)
+        finally:
+            self._tasks.pop(job.id, None)
+
+    async def _finish(self, job: Job, status: JobStatus):
+        job.status = status
+        job.completed_at = datetime.utcnow()
+        await self._save(job)
+
+    async def _save(self, job: Job):
+        if self.store:
+            # FIFO lock: a job's rows are written in the order its states changed
+            async with self._store_lock:
+                await asyncio.to_thread(self.store.save, job)
+
+    def _prune_history(self):
+        """Forget the oldest finished jobs in memory; persisted ones stay readable via the store"""
+        finished = [job for job in self._jobs.values() if job.status in FINISHED_STATUSES]
+        if len(finished) <= self.history_limit:
+            return
+        finished.sort(key=lambda job: job.completed_at or job.created_at)
+        for job in finished[:len(finished) - self.history_limit]:
+            del self._jobs[job.id]
+
+job_queue = JobQueue(
+    workers=settings.JOB_WORKERS,
+    store_path=settings.JOB_QUEUE_DB_PATH if settings.JOB_QUEUE_PERSISTENT else None
+)
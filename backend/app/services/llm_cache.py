@@ -0,0 +1,149 @@
+import asyncio
+import hashlib
+import re
+import sqlite3
+import threading
+import time
+from typing import Optional, Dict, Any
+from app.core.config import settings
+
+BLANK_RUN = re.compile(r"\n{3,}")
+
+class LLMCache:
+    """Persistent, content-addressed cache of LLM responses backed by SQLite.
+
+    Entries expire after `ttl_seconds`; when the cache grows past `max_entries`
+    or `max_bytes` the least recently used entries are evicted first. The public
+    methods are coroutines that run the sqlite3 calls on a worker thread.
+    """
+
+    def __init__(self, path: str, ttl_seconds: int, max_entries: int, max_bytes: int):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS llm_cache (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                last_accessed REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS ix_llm_cache_last_accessed ON llm_cache (last_accessed)")
+
+    @staticmethod
+    def normalize_prompt(prompt: str) -> str:
+        """Drop trailing whitespace and collapse runs of blank lines so cosmetic prompt changes share a key.
+
+        Indentation is kept: in YAML, code or Swagger input it changes the meaning.
+        """
+        lines = "\n".join(line.rstrip() for line in prompt.splitlines())
+        return BLANK_RUN.sub("\n\n", lines).strip("\n")
+
+    @classmethod
+    def make_key(cls, model: str, prompt_version: str, prompt: str) -> str:
+        digest = hashlib.sha256()
+        for part in (model, prompt_version, cls.normalize_prompt(prompt)):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\x00")
+        return digest.hexdigest()
+
+    async def get(self, key: str) -> Optional[str]:
+        return await asyncio.to_thread(self._get, key)
+
+    async def set(self, key: str, value: str):
+        await asyncio.to_thread(self._set, key, value)
+
+    async def clear(self):
+        await asyncio.to_thread(self._clear)
+
+    async def stats(self) -> Dict[str, Any]:
+        return await asyncio.to_thread(self._stats)
+
+    def _get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created_at FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or now - row[1] > self.ttl_seconds:
+                if row is not None:
+                    self._conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE llm_cache SET last_accessed = ? WHERE key = ?", (now, key))
+            self.hits += 1
+            return row[0]
+
+    def _set(self, key: str, value: str):
+        now = time.time()
+        size = len(value.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, value, size, created_at, last_accessed) VALUES (?, ?, ?, ?, ?)",
+                (key, value, size, now, now)
+            )
+            self._evict(now)
+
+    def _evict(self, now: float):
+        """Drop expired entries, then least recently used ones until under both caps"""
+        self._conn.execute("DELETE FROM llm_cache WHERE created_at < ?", (now - self.ttl_seconds,))
+        count, total_bytes = self._conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM llm_cache"
+        ).fetchone()
+        while count > self.max_entries or total_bytes > self.max_bytes:
+            key, size = self._conn.execute(
+                "SELECT key, size FROM llm_cache ORDER BY last_accessed ASC LIMIT 1"
+            ).fetchone()
+            self._conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+            count -= 1
+            total_bytes -= size
+            self.evictions += 1
+
+    def _clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM llm_cache")
+
+    def _stats(self) -> Dict[str, Any]:
+        with self._lock:
+            count, total_bytes = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM llm_cache"
+            ).fetchone()
+        lookups = self.hits + self.misses
+        return {
+            "entries": count,
+            "size_bytes": total_bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": (self.hits / lookups) if lookups else 0.0
+        }
+
+_cache: Optional[LLMCache] = None
+
+def get_llm_cache() -> Optional[LLMCache]:
+    """Return the shared cache, or None when caching is disabled"""
+    global _cache
+    if not settings.LLM_CACHE_ENABLED:
+        return None
+    if _cache is None:
+        _cache = LLMCache(
+            settings.LLM_CACHE_PATH,
+            settings.LLM_CACHE_TTL_SECONDS,
+            settings.LLM_CACHE_MAX_ENTRIES,
+            settings.LLM_CACHE_MAX_BYTES
+        )
+    return _cache
@@ -0,0 +1,282 @@
+import asyncio
+import random
+import time
+from collections import deque
+from email.utils import parsedate_to_datetime
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional
+import httpx
+from app.core.config import settings
+
+# Statuses worth another attempt; other 4xx (bad request, context length) will not change
+RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+# Queue waits kept for the p95 wait metric
+WAIT_WINDOW = 500
+
+class CircuitOpenError(Exception):
+    """Raised without calling OpenRouter while a model's circuit breaker is open"""
+
+class TokenBucket:
+    """Holds up to `capacity` units, refilled evenly over `period` seconds.
+
+    The level may go negative when usage is settled above what was taken, which
+    delays the requests that follow.
+    """
+
+    def __init__(self, capacity: int, period: float = 60.0):
+        self.capacity = float(capacity)
+        self.rate = capacity / period
+        self.level = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until `amount` is available (capped at capacity, so large requests still pass)"""
+        self._refill()
+        needed = min(amount, self.capacity)
+        return 0.0 if self.level >= needed else (needed - self.level) / self.rate
+
+    def take(self, amount: float):
+        self._refill()
+        self.level -= amount
+
+class CircuitBreaker:
+    """Opens after `threshold` consecutive failures and rejects requests for `reset`
+    seconds; then lets one probe through, which closes it or opens it again.
+    A probe that never reports back (cancelled) is replaced after another `reset`.
+    """
+
+    def __init__(self, threshold: int, reset: float):
+        self.threshold = threshold
+        self.reset = reset
+        self.consecutive_failures = 0
+        self.opened_at: Optional[float] = None
+        self.probe_started_at: Optional[float] = None
+        self.opens = 0
+
+    def _probing(self, now: float) -> bool:
+        return self.probe_started_at is not None and now - self.probe_started_at < self.reset
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        now = time.monotonic()
+        return "half_open" if self._probing(now) or now - self.opened_at >= self.reset else "open"
+
+    def allow(self) -> bool:
+        if self.opened_at is None:
+            return True
+        now = time.monotonic()
+        if self._probing(now) or now - self.opened_at < self.reset:
+            return False
+        self.probe_started_at = now
+        return True
+
+    def record(self, healthy: bool):
+        if healthy:
+            self.consecutive_failures = 0
+            self.opened_at = None
+        else:
+            self.consecutive_failures += 1
+            if self.probe_started_at is not None or (self.opened_at is None and self.consecutive_failures >= self.threshold):
+                self.opened_at = time.monotonic()
+                self.opens += 1
+        self.probe_started_at = None
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds from a Retry-After header (delta-seconds or HTTP date)"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+class LLMScheduler:
+    """Client-side admission, retry and circuit breaking for OpenRouter calls.
+
+    Every attempt waits its turn in one FIFO queue for a request from the RPM
+    bucket and its estimated prompt tokens from the TPM bucket (either limit is
+    off when 0). Attempts answered with 429 or 5xx, or failing to connect, are
+    retried with full-jitter exponential backoff; a Retry-After on a 429 or 503
+    pauses the whole queue, since the limit is shared by every user of the key.
+    Each model has a circuit breaker counting 5xx, connection errors and timeouts.
+    """
+
+    def __init__(
+        self,
+        rpm: int,
+        tpm: int,
+        max_retries: int,
+        retry_base: float,
+        retry_max: float,
+        failure_threshold: int,
+        reset: float
+    ):
+        self.request_bucket = TokenBucket(rpm) if rpm > 0 else None
+        self.token_bucket = TokenBucket(tpm) if tpm > 0 else None
+        self.max_retries = max_retries
+        self.retry_base = retry_base
+        self.retry_max = retry_max
+        self.failure_threshold = failure_threshold
+        self.reset = reset
+        self.paused_until = 0.0
+        self._circuits: Dict[str, CircuitBreaker] = {}
+        self._lock: Optional[asyncio.Lock] = None
+        self._lock_loop = None
+        self.queue_depth = 0
+        self.max_queue_depth = 0
+        self.admitted = 0
+        self.delayed = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self._waits: Deque[float] = deque(maxlen=WAIT_WINDOW)
+        self.retries = 0
+        self.rate_limited = 0
+        self.circuit_rejections = 0
+
+    def _queue_lock(self) -> asyncio.Lock:
+        # asyncio.Lock binds to the loop it is first used on; benchmarks run several loops
+        loop = asyncio.get_running_loop()
+        if self._lock is None or self._lock_loop is not loop:
+            self._lock, self._lock_loop = asyncio.Lock(), loop
+        return self._lock
+
+    def circuit(self, model: str) -> CircuitBreaker:
+        if model not in self._circuits:
+            self._circuits[model] = CircuitBreaker(self.failure_threshold, self.reset)
+        return self._circuits[model]
+
+    async def acquire(self, model: str, tokens: int):
+        """Wait for a request slot and `tokens` of TPM budget; raises CircuitOpenError instead while `model`'s circuit is open"""
+        if not self.circuit(model).allow():
+            self.circuit_rejections += 1
+            raise CircuitOpenError(f"Circuit breaker open for {model}; not calling OpenRouter")
+        self.queue_depth += 1
+        self.max_queue_depth = max(self.max_queue_depth, self.queue_depth)
+        started = time.monotonic()
+        try:
+            async with self._queue_lock():
+                while True:
+                    delay = self.paused_until - time.monotonic()
+                    if self.request_bucket:
+                        delay = max(delay, self.request_bucket.wait_time(1))
+                    if self.token_bucket:
+                        delay = max(delay, self.token_bucket.wait_time(tokens))
+                    if delay <= 0:
+                        break
+                    await asyncio.sleep(delay)
+                if self.request_bucket:
+                    self.request_bucket.take(1)
+                if self.token_bucket:
+                    self.token_bucket.take(tokens)
+        finally:
+            self.queue_depth -= 1
+        waited = time.monotonic() - started
+        self.admitted += 1
+        self.delayed += waited > 0.001
+        self.total_wait += waited
+        self.max_wait = max(self.max_wait, waited)
+        self._waits.append(waited)
+
+    def settle(self, reserved: int, used: int):
+        """Charge the TPM bucket for tokens used beyond (or refund those under) the reservation"""
+        if self.token_bucket and used:
+            self.token_bucket.take(used - reserved)
+
+    def outcome(self, model: str, attempt: int, response: Optional[httpx.Response] = None) -> Optional[float]:
+        """Record an attempt's result (no response: connection error or timeout).
+
+        Returns the seconds to wait before retrying, or None when the result is final.
+        """
+        status = response.status_code if response is not None else None
+        self.circuit(model).record(status is not None and status < 500)
+        if status is not None and status not in RETRYABLE_STATUSES:
+            return None
+        if status == 429:
+            self.rate_limited += 1
+        if attempt >= self.max_retries:
+            return None
+        delay = random.uniform(0, min(self.retry_max, self.retry_base * 2 ** attempt))
+        retry_after = parse_retry_after(response.headers.get("retry-after")) if response is not None else None
+        if retry_after is not None:
+            if retry_after > self.retry_max:
+                return None
+            delay = max(delay, retry_after)
+        if status == 429 or retry_after is not None:
+            self.paused_until = max(self.paused_until, time.monotonic() + delay)
+        self.retries += 1
+        return delay
+
+    async def send(self, model: str, request: Callable[[], Awaitable[httpx.Response]], tokens: int, timeout: float) -> httpx.Response:
+        """Run `request` through the queue, retrying as `outcome` says; each attempt is limited to `timeout` seconds.
+
+        Timeouts are not retried (the router moves on to another model); the last
+        response is returned for the caller to raise on.
+        """
+        attempt = 0
+        while True:
+            await self.acquire(model, tokens)
+            try:
+                response = await asyncio.wait_for(request(), timeout)
+            except asyncio.TimeoutError:
+                self.circuit(model).record(False)
+                raise
+            except httpx.TransportError:
+                delay = self.outcome(model, attempt)
+                if delay is None:
+                    raise
+            else:
+                delay = self.outcome(model, attempt, response)
+                if delay is None:
+                    return response
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth and wait times, retries and circuit breaker states"""
+        waits = sorted(self._waits)
+        return {
+            "rpm_limit": int(self.request_bucket.capacity) if self.request_bucket else None,
+            "tpm_limit": int(self.token_bucket.capacity) if self.token_bucket else None,
+            "queue_depth": self.queue_depth,
+            "max_queue_depth": self.max_queue_depth,
+            "admitted": self.admitted,
+            "delayed": self.delayed,
+            "avg_wait_ms": round(self.total_wait / self.admitted * 1000, 1) if self.admitted else 0.0,
+            "p95_wait_ms": round(waits[int(0.95 * (len(waits) - 1))] * 1000, 1) if waits else 0.0,
+            "max_wait_ms": round(self.max_wait * 1000, 1),
+            "paused_for_seconds": round(max(0.0, self.paused_until - time.monotonic()), 1),
+            "retries": self.retries,
+            "rate_limited": self.rate_limited,
+            "circuit_rejections": self.circuit_rejections,
+            "circuits": {
+                model: {"state": circuit.state, "consecutive_failures": circuit.consecutive_failures, "opens": circuit.opens}
+                for model, circuit in self._circuits.items()
+            }
+        }
+
+_scheduler: Optional[LLMScheduler] = None
+
+def get_llm_scheduler() -> LLMScheduler:
+    """Return the shared scheduler for the configured limits"""
+    global _scheduler
+    if _scheduler is None:
+        _scheduler = LLMScheduler(
+            settings.LLM_RATE_LIMIT_RPM,
+            settings.LLM_RATE_LIMIT_TPM,
+            settings.LLM_MAX_RETRIES,
+            settings.LLM_RETRY_BASE_SECONDS,
+            settings.LLM_RETRY_MAX_SECONDS,
+            settings.LLM_CIRCUIT_FAILURE_THRESHOLD,
+            settings.LLM_CIRCUIT_RESET_SECONDS
+        )
+    return _scheduler
@@ -0,0 +1,129 @@
+import asyncio
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from sqlalchemy import case, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.models.llm_usage import LLMUsage
+
+GROUP_BY = ("model", "operation", "day")
+# Buffered rows beyond this are dropped rather than held in memory
+MAX_PENDING = 10000
+FLUSH_ATTEMPTS = 5
+FLUSH_RETRY_SECONDS = 1.0
+
+# Rows are buffered and written by a background task: the caller may be holding
+# SQLite's write lock in its own session, so an inline insert would wait on it
+_pending: List[Dict[str, Any]] = []
+_flush_task: Optional[asyncio.Task] = None
+# Records that could not be written; accounting never fails a generation
+dropped_records = 0
+
+def record(
+    model: str,
+    operation: str,
+    prompt_tokens: int,
+    completion_tokens: int,
+    latency_ms: int,
+    estimated: bool = False,
+    cached: bool = False,
+    truncated: bool = False,
+    error: Optional[str] = None
+):
+    """Queue one accounting row; returns immediately"""
+    global dropped_records
+    if not settings.LLM_USAGE_ACCOUNTING:
+        return
+    if len(_pending) >= MAX_PENDING:
+        dropped_records += 1
+        return
+    _pending.append(dict(
+        model=model, operation=operation, prompt_tokens=prompt_tokens, completion_tokens=completion_tokens,
+        estimated=estimated, latency_ms=latency_ms, cached=cached, truncated=truncated,
+        error=error[:1000] if error else None, created_at=datetime.utcnow()
+    ))
+    _schedule_flush()
+
+def _schedule_flush():
+    global _flush_task
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return  # written by the next flush()
+    if _flush_task is None or _flush_task.done() or _flush_task.get_loop() is not loop:
+        _flush_task = loop.create_task(_flush_pending())
+
+async def _flush_pending():
+    global dropped_records
+    attempts = 0
+    while _pending:
+        # Taken out before the first await so rows recorded meanwhile go in the next batch
+        batch = _pending[:]
+        del _pending[:len(batch)]
+        try:
+            async with AsyncSessionLocal() as session:
+                session.add_all([LLMUsage(**row) for row in batch])
+                await session.commit()
+        except Exception:
+            attempts += 1
+            if attempts < FLUSH_ATTEMPTS:
+                _pending[:0] = batch
+                await asyncio.sleep(FLUSH_RETRY_SECONDS)
+                continue
+            dropped_records += len(batch)
+        attempts = 0
+
+async def flush():
+    """Write buffered rows now (before aggregating, and on shutdown)"""
+    while _pending or (_flush_task is not None and not _flush_task.done()
+                       and _flush_task.get_loop() is asyncio.get_running_loop()):
+        _schedule_flush()
+        await _flush_task
+
+def _aggregates():
+    live = LLMUsage.cached == False  # noqa: E712
+    return [
+        func.count().label("requests"),
+        func.sum(case((LLMUsage.cached == True, 1), else_=0)).label("cached"),  # noqa: E712
+        func.count(LLMUsage.error).label("errors"),
+        func.sum(case((LLMUsage.truncated == True, 1), else_=0)).label("truncated"),  # noqa: E712
+        func.coalesce(func.sum(case((live, LLMUsage.prompt_tokens), else_=0)), 0).label("prompt_tokens"),
+        func.coalesce(func.sum(case((live, LLMUsage.completion_tokens), else_=0)), 0).label("completion_tokens"),
+        func.avg(case((live, LLMUsage.latency_ms))).label("avg_latency_ms"),
+        func.max(LLMUsage.latency_ms).label("max_latency_ms"),
+    ]
+
+def _row(row) -> Dict[str, Any]:
+    values = dict(row._mapping)
+    for name in ("requests", "cached", "errors", "truncated", "prompt_tokens", "completion_tokens", "max_latency_ms"):
+        values[name] = int(values[name] or 0)
+    values["avg_latency_ms"] = round(float(values["avg_latency_ms"]), 1) if values["avg_latency_ms"] is not None else None
+    return values
+
+async def summary(db: AsyncSession, since: Optional[datetime] = None, group_by: str = "model") -> Dict[str, Any]:
+    """Totals and per-group request counts, tokens and latency.
+
+    Token sums and latency cover requests that reached the provider; cache hits
+    are only counted. Buffered rows are written first.
+    """
+    if group_by not in GROUP_BY:
+        raise ValueError(f"group_by must be one of {', '.join(GROUP_BY)}")
+    await flush()
+    key = func.date(LLMUsage.created_at) if group_by == "day" else getattr(LLMUsage, group_by)
+    filters = [LLMUsage.created_at >= since] if since else []
+
+    totals = (await db.execute(select(*_aggregates()).where(*filters))).one()
+    result = await db.execute(
+        select(key.label("key"), *_aggregates()).where(*filters).group_by(key).order_by(key)
+    )
+    groups: List[Dict[str, Any]] = [_row(row) for row in result]
+    for group in groups:
+        group["key"] = str(group["key"])
+    return {
+        "since": since,
+        "group_by": group_by,
+        "totals": _row(totals),
+        "groups": groups,
+        "dropped_records": dropped_records
+    }
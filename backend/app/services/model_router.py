@@ -0,0 +1,144 @@
+import math
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
+from app.core.config import settings
+
+# Successful latencies kept per model for the hedging percentile
+LATENCY_WINDOW = 50
+# Samples needed before a model's p95 is trusted as a hedge delay
+MIN_HEDGE_SAMPLES = 5
+
+class ModelStats:
+    """EWMA latency and error rate of one model, fed by every routed request"""
+
+    def __init__(self, model: str):
+        self.model = model
+        self.ewma_latency: Optional[float] = None
+        self.error_rate = 0.0
+        self.requests = 0
+        self.failures = 0
+        self.last_failure_at: Optional[float] = None
+        self.last_request_at: Optional[float] = None
+        self.latencies: Deque[float] = deque(maxlen=LATENCY_WINDOW)
+
+    def p95(self) -> Optional[float]:
+        if len(self.latencies) < MIN_HEDGE_SAMPLES:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[max(0, math.ceil(0.95 * len(ordered)) - 1)]
+
+class ModelRouter:
+    """Orders the configured models for each request: healthy models by EWMA latency
+    (unmeasured ones first, so each gets measured), then unhealthy ones.
+
+    A model is unhealthy while its error-rate EWMA is at or above `max_error_rate`,
+    until `cooldown` seconds after its last failure, when it gets another chance.
+    A model that has not been tried for `stale_after` seconds counts as unmeasured
+    again, so one slow outlier does not rule it out for good.
+    """
+
+    def __init__(self, models: List[str], alpha: float, max_error_rate: float, cooldown: float, stale_after: float):
+        if not models:
+            raise ValueError("At least one model must be configured")
+        self.models = models
+        self.alpha = alpha
+        self.max_error_rate = max_error_rate
+        self.cooldown = cooldown
+        self.stale_after = stale_after
+        self._stats = {model: ModelStats(model) for model in models}
+        self.fallbacks = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+
+    def healthy(self, model: str) -> bool:
+        stats = self._stats[model]
+        if stats.error_rate < self.max_error_rate:
+            return True
+        return stats.last_failure_at is None or time.monotonic() - stats.last_failure_at >= self.cooldown
+
+    def ranked(self) -> List[str]:
+        order = {model: position for position, model in enumerate(self.models)}
+
+        now = time.monotonic()
+
+        def latency(model: str) -> float:
+            stats = self._stats[model]
+            if stats.last_request_at is None or now - stats.last_request_at >= self.stale_after:
+                return 0.0
+            return stats.ewma_latency or 0.0
+
+        healthy = sorted((m for m in self.models if self.healthy(m)), key=lambda m: (latency(m), order[m]))
+        unhealthy = sorted(
+            (m for m in self.models if not self.healthy(m)),
+            key=lambda m: (self._stats[m].error_rate, order[m])
+        )
+        return healthy + unhealthy
+
+    def record_success(self, model: str, latency: float):
+        stats = self._stats[model]
+        stats.requests += 1
+        stats.last_request_at = time.monotonic()
+        stats.latencies.append(latency)
+        self._update_latency(stats, latency)
+        stats.error_rate = (1 - self.alpha) * stats.error_rate
+
+    def record_failure(self, model: str, latency: float):
+        """A failed or timed-out request; its latency counts, so slow failures also rank the model down"""
+        stats = self._stats[model]
+        stats.requests += 1
+        stats.failures += 1
+        stats.last_failure_at = stats.last_request_at = time.monotonic()
+        self._update_latency(stats, latency)
+        stats.error_rate = self.alpha + (1 - self.alpha) * stats.error_rate
+
+    def _update_latency(self, stats: ModelStats, latency: float):
+        if stats.ewma_latency is None:
+            stats.ewma_latency = latency
+        else:
+            stats.ewma_latency = self.alpha * latency + (1 - self.alpha) * stats.ewma_latency
+
+    def hedge_delay(self, model: str) -> Optional[float]:
+        """Seconds to wait on `model` before hedging: its p95, once there are enough samples"""
+        return self._stats[model].p95()
+
+    def _model_stats(self, model: str) -> Dict[str, Any]:
+        stats = self._stats[model]
+        p95 = stats.p95()
+        return {
+            "model": model,
+            "healthy": self.healthy(model),
+            "ewma_latency_ms": round(stats.ewma_latency * 1000, 1) if stats.ewma_latency is not None else None,
+            "p95_latency_ms": round(p95 * 1000, 1) if p95 is not None else None,
+            "error_rate": round(stats.error_rate, 3),
+            "requests": stats.requests,
+            "failures": stats.failures
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        """Per-model figures in routing order, plus fallback and hedge counters"""
+        return {
+            "models": [self._model_stats(model) for model in self.ranked()],
+            "fallbacks": self.fallbacks,
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+            "hedging_enabled": settings.LLM_HEDGING_ENABLED
+        }
+
+_router: Optional[ModelRouter] = None
+
+def configured_models() -> List[str]:
+    return [model.strip() for model in settings.LLM_MODELS.split(",") if model.strip()]
+
+def get_model_router() -> ModelRouter:
+    """Return the shared router for LLM_MODELS"""
+    global _router
+    if _router is None:
+        _router = ModelRouter(
+            configured_models(),
+            settings.LLM_ROUTER_EWMA_ALPHA,
+            settings.LLM_ROUTER_MAX_ERROR_RATE,
+            settings.LLM_ROUTER_COOLDOWN_SECONDS,
+            settings.LLM_ROUTER_STALE_MINUTES * 60
+        )
+    return _router
@@ -0,0 +1,25 @@
+import re
+import textwrap
+
+# "Field: N/A"-style lines carry no information for the model
+EMPTY_FIELD = re.compile(r"^[ \t]*[A-Za-z][\w /-]{0,40}:[ \t]*(N/A|None|null|Unassigned|-)[ \t]*$")
+BLANK_RUN = re.compile(r"\n{3,}")
+FENCE = re.compile(r"^\s*```")
+
+def compact(text: str, drop_empty_fields: bool = True) -> str:
+    """Whitespace-normalised prompt text.
+
+    Removes the common indentation of indented triple-quoted templates, trailing
+    spaces, runs of blank lines and (optionally) `Field: N/A` lines outside fenced
+    code blocks. Relative indentation is kept.
+    """
+    text = textwrap.dedent(text.replace("\r\n", "\n").expandtabs(4))
+    lines = []
+    in_code = False
+    for line in text.split("\n"):
+        if FENCE.match(line):
+            in_code = not in_code
+        elif not in_code and drop_empty_fields and EMPTY_FIELD.match(line):
+            continue
+        lines.append(line.rstrip())
+    return BLANK_RUN.sub("\n\n", "\n".join(lines)).strip()
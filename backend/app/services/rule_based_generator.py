@@ -0,0 +1,207 @@
+import json
+from typing import Any, Dict, List, Optional, Tuple, Union
+from app.services.spec_index import SpecIndex
+
+EXAMPLE_STRINGS = {
+    "date-time": "2024-01-01T00:00:00Z",
+    "date": "2024-01-01",
+    "email": "user@example.com",
+    "uuid": "123e4567-e89b-12d3-a456-426614174000",
+    "uri": "https://example.com",
+    "password": "P@ssw0rd!"
+}
+
+class RuleBasedGenerator:
+    """Derives the mechanical test cases for a Swagger/OpenAPI spec without an LLM.
+
+    Per operation: a happy path with example values, one case per omitted required
+    parameter or body field, enum and numeric range boundaries, and one case per
+    documented error response. Output uses the same dict shape as the LLM path.
+    """
+
+    def generate(self, spec: Union[Dict[str, Any], SpecIndex]) -> List[Dict[str, Any]]:
+        index = spec if isinstance(spec, SpecIndex) else SpecIndex(spec)
+        test_cases = []
+        for endpoint in index.endpoints:
+            test_cases.extend(self.generate_for_endpoint(endpoint))
+        return test_cases
+
+    def generate_for_endpoint(self, endpoint: Dict[str, Any]) -> List[Dict[str, Any]]:
+        operation = f"{endpoint['method']} {endpoint['path']}"
+        parameters = [p for p in endpoint.get('parameters') or [] if isinstance(p, dict) and p.get('in') != 'body']
+        body_schema = self._body_schema(endpoint)
+        success_code, success_description = self._success_response(endpoint)
+        client_error = self._client_error_code(endpoint)
+
+        request = self._describe_request(endpoint, parameters, body_schema)
+        test_cases = [{
+            'title': f"Happy path: {operation}",
+            'description': endpoint.get('summary') or endpoint.get('description') or f"Valid {endpoint['method']} request",
+            'steps': self._steps(endpoint, request),
+            'expected_result': f"Returns {success_code}" + (f" ({success_description})" if success_description else "")
+        }]
+
+        for parameter in parameters:
+            if parameter.get('required') and parameter.get('in') != 'path':
+                name = f"{parameter['in']} parameter '{parameter.get('name')}'"
+                test_cases.append(self._missing_case(endpoint, operation, request, name, client_error))
+        for field in (body_schema or {}).get('required') or []:
+            test_cases.append(self._missing_case(endpoint, operation, request, f"body field '{field}'", client_error))
+        if body_schema is not None and self._body_required(endpoint):
+            test_cases.append(self._missing_case(endpoint, operation, request, "request body", client_error))
+
+        for name, schema in self._constrained_values(parameters, body_schema):
+            test_cases.extend(self._boundary_cases(endpoint, operation, request, name, schema, client_error))
+
+        validation_cases = len(test_cases) - 1
+        for code, response in (endpoint.get('responses') or {}).items():
+            code = str(code)
+            if code[:1] not in ('4', '5') or (code == client_error and validation_cases):
+                continue
+            description = response.get('description', '') if isinstance(response, dict) else ''
+            test_cases.append({
+                'title': f"Error {code}: {operation}",
+                'description': description or f"Documented {code} response",
+                'steps': self._steps(endpoint, request, f"Set up the condition for a {code} response: {description or 'see the API documentation'}"),
+                'expected_result': f"Returns {code}" + (f" ({description})" if description else "")
+            })
+        return test_cases
+
+    def example(self, schema: Any, depth: int = 0) -> Any:
+        """A plausible value for `schema`: example, default or first enum value, else by type"""
+        if not isinstance(schema, dict) or depth > 4:
+            return None
+        for key in ('example', 'default'):
+            if key in schema:
+                return schema[key]
+        if schema.get('enum'):
+            return schema['enum'][0]
+        for key in ('allOf', 'oneOf', 'anyOf'):
+            if schema.get(key):
+                return self.example(schema[key][0], depth + 1)
+        kind = schema.get('type')
+        if kind == 'integer':
+            return schema.get('minimum', 1)
+        if kind == 'number':
+            return schema.get('minimum', 1.0)
+        if kind == 'boolean':
+            return True
+        if kind == 'array':
+            return [self.example(schema.get('items'), depth + 1)]
+        if kind == 'object' or 'properties' in schema:
+            properties = schema.get('properties') or {}
+            names = schema.get('required') or list(properties)
+            return {name: self.example(properties.get(name), depth + 1) for name in names}
+        if kind == 'string':
+            return EXAMPLE_STRINGS.get(schema.get('format'), "example")
+        return None
+
+    def _missing_case(self, endpoint, operation: str, request: str, name: str, client_error: str) -> Dict[str, Any]:
+        return {
+            'title': f"Missing {name}: {operation}",
+            'description': f"The required {name} is omitted",
+            'steps': self._steps(endpoint, request, f"Remove the {name} from the request"),
+            'expected_result': f"Returns {client_error} and the error identifies the missing {name}"
+        }
+
+    def _boundary_cases(self, endpoint, operation: str, request: str, name: str, schema: Dict[str, Any], client_error: str):
+        if schema.get('enum'):
+            values = schema['enum']
+            accepted = [values[0], values[-1]] if len(values) > 1 else values
+            yield {
+                'title': f"Enum boundaries for {name}: {operation}",
+                'description': f"{name} accepts its first and last documented values",
+                'steps': self._steps(endpoint, request, f"Set {name} to each of {json.dumps(accepted)} in turn"),
+                'expected_result': f"Each request succeeds; {name} is echoed or applied as sent"
+            }
+            yield {
+                'title': f"Invalid enum value for {name}: {operation}",
+                'description': f"{name} rejects values outside {json.dumps(values)}",
+                'steps': self._steps(endpoint, request, f"Set {name} to \"__invalid__\""),
+                'expected_result': f"Returns {client_error} naming the allowed values"
+            }
+        for bound, step in (('minimum', -1), ('maximum', 1)):
+            if isinstance(schema.get(bound), (int, float)) and not isinstance(schema.get(bound), bool):
+                limit = schema[bound]
+                yield {
+                    'title': f"{bound.capitalize()} boundary for {name}: {operation}",
+                    'description': f"{name} at and beyond its {bound} of {limit}",
+                    'steps': self._steps(endpoint, request, f"Set {name} to {limit}, then repeat with {limit + step}"),
+                    'expected_result': f"{name}={limit} succeeds; {name}={limit + step} returns {client_error}"
+                }
+
+    def _constrained_values(self, parameters: List[Dict[str, Any]], body_schema: Optional[Dict[str, Any]]) -> List[Tuple[str, Dict[str, Any]]]:
+        values = []
+        for parameter in parameters:
+            schema = parameter.get('schema') if isinstance(parameter.get('schema'), dict) else parameter
+            values.append((f"{parameter.get('in')} parameter '{parameter.get('name')}'", schema))
+        for name, schema in ((body_schema or {}).get('properties') or {}).items():
+            if isinstance(schema, dict):
+                values.append((f"body field '{name}'", schema))
+        return [
+            (name, schema) for name, schema in values
+            if schema.get('enum') or any(isinstance(schema.get(bound), (int, float)) for bound in ('minimum', 'maximum'))
+        ]
+
+    def _describe_request(self, endpoint, parameters: List[Dict[str, Any]], body_schema: Optional[Dict[str, Any]]) -> str:
+        parts = []
+        for parameter in parameters:
+            if parameter.get('required') or parameter.get('in') == 'path':
+                schema = parameter.get('schema') if isinstance(parameter.get('schema'), dict) else parameter
+                parts.append(f"{parameter.get('in')} {parameter.get('name')}={json.dumps(self.example(schema))}")
+        if body_schema is not None:
+            parts.append(f"JSON body {json.dumps(self.example(body_schema), default=str)}")
+        return "; ".join(parts)
+
+    @staticmethod
+    def _steps(endpoint, request: str, action: Optional[str] = None) -> str:
+        steps = [f"Prepare a valid {endpoint['method']} {endpoint['path']} request" + (f" ({request})" if request else "")]
+        if action:
+            steps.append(action)
+        steps += ["Send the request", "Verify the response status and body"]
+        return "\n".join(f"{number}. {step}" for number, step in enumerate(steps, 1))
+
+    @staticmethod
+    def _body_schema(endpoint) -> Optional[Dict[str, Any]]:
+        body = endpoint.get('request_body')
+        if isinstance(body, dict):
+            content = body.get('content') or {}
+            media = content.get('application/json') or next(iter(content.values()), None)
+            if isinstance(media, dict) and isinstance(media.get('schema'), dict):
+                return media['schema']
+        for parameter in endpoint.get('parameters') or []:
+            if isinstance(parameter, dict) and parameter.get('in') == 'body' and isinstance(parameter.get('schema'), dict):
+                return parameter['schema']  # Swagger 2.0
+        return None
+
+    @staticmethod
+    def _body_required(endpoint) -> bool:
+        body = endpoint.get('request_body')
+        if isinstance(body, dict):
+            return bool(body.get('required'))
+        return any(
+            isinstance(parameter, dict) and parameter.get('in') == 'body' and parameter.get('required')
+            for parameter in endpoint.get('parameters') or []
+        )
+
+    @staticmethod
+    def _success_response(endpoint) -> Tuple[str, str]:
+        successes = sorted(
+            (str(code), response) for code, response in (endpoint.get('responses') or {}).items()
+            if str(code).startswith('2')
+        )
+        if not successes:
+            return "a 2xx status", ""
+        code, response = successes[0]
+        return code, response.get('description', '') if isinstance(response, dict) else ''
+
+    @staticmethod
+    def _client_error_code(endpoint) -> str:
+        """The documented validation error code (400 or 422), defaulting to 400"""
+        documented = {str(code) for code in (endpoint.get('responses') or {})}
+        for code in ('400', '422'):
+            if code in documented:
+                return code
+        return '400'
+
+rule_based_generator = RuleBasedGenerator()
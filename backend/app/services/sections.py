@@ -0,0 +1,100 @@
+import hashlib
+import re
+from collections import OrderedDict
+from typing import Any, Dict, List, NamedTuple, Optional, Set
+from app.models.input_source import InputSourceType
+from app.services.spec_index import HTTP_METHODS, endpoint_key, get_spec_index
+
+# Key for cases generated from a whole multi-section text source in one prompt
+WHOLE_DOCUMENT = "(document)"
+
+HEADING = re.compile(r"^\s{0,3}#{1,6}\s+(.+?)\s*#*\s*$")
+OPERATION = re.compile(r"\b(" + "|".join(HTTP_METHODS) + r")\s+(/[^\s\"'`,;()]*)")
+# Jira metadata that changes without changing what there is to test
+VOLATILE_JIRA_LINE = re.compile(r"^\s*(Status|Priority|Assignee|Reporter|Created|Updated):.*$", re.M)
+
+class Section(NamedTuple):
+    key: str
+    fingerprint: str
+    payload: Any  # the resolved endpoint (Swagger) or the section text
+
+def _digest(text: str) -> str:
+    return hashlib.sha256(" ".join(text.split()).encode("utf-8")).hexdigest()
+
+def swagger_sections(content: str) -> "OrderedDict[str, Section]":
+    """One section per operation, fingerprinted over its resolved definition"""
+    index = get_spec_index(content)
+    fingerprints = index.fingerprints()
+    return OrderedDict(
+        (endpoint_key(endpoint), Section(endpoint_key(endpoint), fingerprints[endpoint_key(endpoint)], endpoint))
+        for endpoint in index.endpoints
+    )
+
+def text_sections(content: str, ignore: Optional["re.Pattern"] = None) -> "OrderedDict[str, Section]":
+    """Markdown heading sections, or blank-line separated paragraphs when there are no headings.
+
+    Headed sections are keyed by their heading, so an edited body shows up as a
+    change. Paragraphs are keyed by their first line, so an edited paragraph
+    usually shows up as one removed and one added section.
+    """
+    blocks: List[List[str]] = []
+    headed = any(HEADING.match(line) for line in content.splitlines())
+    for line in content.splitlines():
+        if (HEADING.match(line) if headed else not line.strip()) or not blocks:
+            blocks.append([])
+        if headed or line.strip():
+            blocks[-1].append(line)
+
+    sections: "OrderedDict[str, Section]" = OrderedDict()
+    for block in blocks:
+        text = "\n".join(block).strip()
+        if not text:
+            continue
+        heading = HEADING.match(block[0]) if headed else None
+        key = heading.group(1) if heading else " ".join(text.splitlines()[0].split())[:120]
+        if key in sections:
+            key = next(f"{key} ({n})" for n in range(2, len(blocks) + 2) if f"{key} ({n})" not in sections)
+        sections[key] = Section(key, _digest(ignore.sub("", text) if ignore else text), text)
+    return sections
+
+def content_sections(source_type: InputSourceType, content: str) -> "OrderedDict[str, Section]":
+    """Sections of an input source's content; raises ValueError for an invalid Swagger spec"""
+    if source_type == InputSourceType.SWAGGER:
+        return swagger_sections(content)
+    return text_sections(content, VOLATILE_JIRA_LINE if source_type == InputSourceType.JIRA else None)
+
+def attribute(test_case: Dict[str, Any], sections: "OrderedDict[str, Section]", default: Optional[str] = None) -> Optional[str]:
+    """The section a generated case belongs to: its `section` field, else an operation it names, else `default`"""
+    named = test_case.get('section')
+    if isinstance(named, str) and named.strip() in sections:
+        return named.strip()
+    for field in ('title', 'steps', 'description'):
+        for method, path in OPERATION.findall(str(test_case.get(field) or '')):
+            key = f"{method} {path.rstrip('.:')}"
+            if key in sections:
+                return key
+    return default
+
+def tag_cases(test_cases: List[Dict[str, Any]], sections: "OrderedDict[str, Section]", default: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Stamp `section_key`/`section_hash` on generated cases; unattributable cases get `default`"""
+    for test_case in test_cases:
+        key = attribute(test_case, sections, default)
+        test_case['section_key'] = key
+        test_case['section_hash'] = sections[key].fingerprint if key in sections else None
+    return test_cases
+
+def diff_sections(current: "OrderedDict[str, Section]", stored: Dict[str, Set[str]]) -> Dict[str, List[str]]:
+    """Compare current sections with the fingerprints stored on active test cases.
+
+    A section is unchanged when some active case carries its current fingerprint.
+    """
+    diff: Dict[str, List[str]] = {"added": [], "changed": [], "unchanged": [], "removed": []}
+    for key, section in current.items():
+        if key not in stored:
+            diff["added"].append(key)
+        elif section.fingerprint in stored[key]:
+            diff["unchanged"].append(key)
+        else:
+            diff["changed"].append(key)
+    diff["removed"] = [key for key in stored if key not in current]
+    return diff
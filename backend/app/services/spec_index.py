@@ -0,0 +1,218 @@
+import hashlib
+import json
+import threading
+from bisect import bisect_left
+from collections import OrderedDict
+from typing import Any, Dict, FrozenSet, List, Optional
+from app.core.config import settings
+
+HTTP_METHODS = ('GET', 'POST', 'PUT', 'DELETE', 'PATCH')
+
+def endpoint_key(endpoint: Dict[str, Any]) -> str:
+    """Stable name of an operation, e.g. `GET /pets/{id}`"""
+    return f"{endpoint['method']} {endpoint['path']}"
+
+def group_endpoints(endpoints: List[Dict[str, Any]], max_group_size: int = 20) -> "OrderedDict[str, List[Dict[str, Any]]]":
+    """Split endpoints into groups by first tag, falling back to the first path segment.
+
+    Groups larger than `max_group_size` are split into numbered chunks so each
+    one fits comfortably in a single prompt.
+    """
+    groups: "OrderedDict[str, List[Dict[str, Any]]]" = OrderedDict()
+    for endpoint in endpoints:
+        if endpoint.get('tags'):
+            key = endpoint['tags'][0]
+        else:
+            segments = [s for s in endpoint['path'].split('/') if s]
+            key = f"/{segments[0]}" if segments else "/"
+        groups.setdefault(key, []).append(endpoint)
+
+    chunked: "OrderedDict[str, List[Dict[str, Any]]]" = OrderedDict()
+    for key, group in groups.items():
+        if len(group) <= max_group_size:
+            chunked[key] = group
+            continue
+        for i in range(0, len(group), max_group_size):
+            chunked[f"{key} #{i // max_group_size + 1}"] = group[i:i + max_group_size]
+    return chunked
+
+class SpecIndex:
+    """Endpoints of a parsed Swagger/OpenAPI document with local `$ref`s resolved once.
+
+    Resolved subtrees are shared between endpoints (a schema referenced a hundred
+    times exists once), and a recursive reference is left as its `$ref` where it
+    would loop. Endpoints use the same dict shape as `SwaggerService.extract_endpoints`.
+    """
+
+    def __init__(self, spec: Dict[str, Any]):
+        self.spec = spec if isinstance(spec, dict) else {}
+        info = self.spec.get('info')
+        self.info = info if isinstance(info, dict) else {}
+        self._refs: Dict[str, Any] = {}
+        self._groups: Dict[int, "OrderedDict[str, List[Dict[str, Any]]]"] = {}
+        self._fingerprints: Optional[Dict[str, str]] = None
+        self.endpoints: List[Dict[str, Any]] = []
+        self._by_tag: Dict[str, List[int]] = {}
+        self._by_method: Dict[str, List[int]] = {}
+
+        paths = self.spec.get('paths')
+        for path, item in (paths.items() if isinstance(paths, dict) else ()):
+            item = self._resolve(item, frozenset())
+            if not isinstance(item, dict):
+                continue
+            shared_parameters = item.get('parameters') or []
+            for method, details in item.items():
+                if method.upper() not in HTTP_METHODS or not isinstance(details, dict):
+                    continue
+                position = len(self.endpoints)
+                endpoint = {
+                    'path': path,
+                    'method': method.upper(),
+                    'operation_id': details.get('operationId'),
+                    'summary': details.get('summary', ''),
+                    'description': details.get('description', ''),
+                    'parameters': self._merge_parameters(shared_parameters, details.get('parameters') or []),
+                    'responses': details.get('responses', {}),
+                    'tags': details.get('tags', []),
+                    'request_body': details.get('requestBody')
+                }
+                self.endpoints.append(endpoint)
+                self._by_method.setdefault(endpoint['method'], []).append(position)
+                for tag in endpoint['tags'] or ():
+                    self._by_tag.setdefault(tag, []).append(position)
+        # Sorted for bisect; prefix lookups touch only the matching slice
+        self._paths = sorted((endpoint['path'], position) for position, endpoint in enumerate(self.endpoints))
+        self._refs = {}
+
+    @property
+    def tags(self) -> List[str]:
+        return list(self._by_tag)
+
+    def find(self, tag: Optional[str] = None, method: Optional[str] = None, path_prefix: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Endpoints matching every given filter, in document order"""
+        candidates = None
+        if tag is not None:
+            candidates = set(self._by_tag.get(tag, ()))
+        if method is not None:
+            matching = set(self._by_method.get(method.upper(), ()))
+            candidates = matching if candidates is None else candidates & matching
+        if path_prefix:
+            start = bisect_left(self._paths, (path_prefix,))
+            matching = set()
+            for path, position in self._paths[start:]:
+                if not path.startswith(path_prefix):
+                    break
+                matching.add(position)
+            candidates = matching if candidates is None else candidates & matching
+        if candidates is None:
+            return list(self.endpoints)
+        return [self.endpoints[position] for position in sorted(candidates)]
+
+    def groups(self, max_group_size: int = 20) -> "OrderedDict[str, List[Dict[str, Any]]]":
+        """Prompt-sized endpoint groups, computed once per group size"""
+        if max_group_size not in self._groups:
+            self._groups[max_group_size] = group_endpoints(self.endpoints, max_group_size)
+        return self._groups[max_group_size]
+
+    def fingerprints(self) -> Dict[str, str]:
+        """sha256 of each endpoint's resolved definition, keyed by endpoint_key(); computed once"""
+        if self._fingerprints is None:
+            self._fingerprints = {
+                endpoint_key(endpoint): hashlib.sha256(
+                    json.dumps(endpoint, sort_keys=True, separators=(",", ":"), default=str).encode("utf-8")
+                ).hexdigest()
+                for endpoint in self.endpoints
+            }
+        return self._fingerprints
+
+    @staticmethod
+    def _merge_parameters(shared: List[Any], own: List[Any]) -> List[Any]:
+        """Path-level parameters apply to every operation unless it redefines the same name and location"""
+        if not shared:
+            return own
+        key = lambda parameter: (parameter.get('name'), parameter.get('in')) if isinstance(parameter, dict) else id(parameter)
+        overridden = {key(parameter) for parameter in own}
+        return [parameter for parameter in shared if key(parameter) not in overridden] + list(own)
+
+    def _pointer(self, ref: str) -> Any:
+        node: Any = self.spec
+        for part in ref[2:].split('/'):
+            part = part.replace('~1', '/').replace('~0', '~')
+            node = node[int(part)] if isinstance(node, list) else node[part]
+        return node
+
+    def _resolve(self, node: Any, stack: FrozenSet[str]) -> Any:
+        if isinstance(node, dict):
+            ref = node.get('$ref')
+            if isinstance(ref, str) and ref.startswith('#/'):
+                if ref in stack:
+                    return node
+                if ref not in self._refs:
+                    try:
+                        target = self._pointer(ref)
+                    except (KeyError, IndexError, ValueError, TypeError):
+                        return node  # dangling reference: keep it visible
+                    self._refs[ref] = self._resolve(target, stack | {ref})
+                resolved = self._refs[ref]
+                if len(node) > 1 and isinstance(resolved, dict):
+                    # Sibling keywords (description, nullable, ...) refine the referenced object
+                    return {**resolved, **{key: value for key, value in node.items() if key != '$ref'}}
+                return resolved
+            resolved = {key: self._resolve(value, stack) for key, value in node.items()}
+            return node if all(resolved[key] is value for key, value in node.items()) else resolved
+        if isinstance(node, list):
+            resolved = [self._resolve(value, stack) for value in node]
+            return node if all(new is old for new, old in zip(resolved, node)) else resolved
+        return node
+
+class SpecIndexCache:
+    """LRU of SpecIndex objects keyed by the sha256 of the raw spec text"""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, SpecIndex]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(content: str) -> str:
+        return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+    def get(self, content: str) -> SpecIndex:
+        """Index for `content`, parsing it only on a miss; raises ValueError for invalid JSON"""
+        key = self.make_key(content)
+        with self._lock:
+            index = self._entries.get(key)
+            if index is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return index
+            self.misses += 1
+        try:
+            index = SpecIndex(json.loads(content))
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Invalid JSON: {str(e)}")
+        with self._lock:
+            self._entries[key] = index
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return index
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": (self.hits / lookups) if lookups else 0.0
+        }
+
+_cache: Optional[SpecIndexCache] = None
+
+def get_spec_index(content: str) -> SpecIndex:
+    """Shared, memoized index for a stored spec (InputSource.content)"""
+    global _cache
+    if _cache is None:
+        _cache = SpecIndexCache(settings.SPEC_INDEX_CACHE_SIZE)
+    return _cache.get(content)
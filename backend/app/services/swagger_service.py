@@ -1,6 +1,18 @@
 import json
 import requests
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Tuple, Union
+from collections import OrderedDict
+from app.services.spec_index import HTTP_METHODS, SpecIndex, get_spec_index, group_endpoints
+
+try:
+    import ijson
+except ImportError:  # in requirements.txt; without it uploaded JSON specs are loaded whole
+    ijson = None
+
+try:
+    import yaml
+except ImportError:  # in requirements.txt; without it .yaml/.yml uploads are rejected
+    yaml = None
 
 class SwaggerService:
     def fetch_swagger_from_url(self, url: str) -> Dict[str, Any]:
@@ -47,40 +59,112 @@ class SwaggerService:
         except Exception:
             return False
 
+    def yaml_supported(self) -> bool:
+        return yaml is not None
+
+    def scan_spec_file(self, file_path: str) -> Dict[str, Any]:
+        """Validate an uploaded JSON spec and collect its paths in one pass over the file.
+
+        With ijson the document is parsed as an event stream and never built in memory;
+        without it the file is loaded once. Raises ValueError if it is not a spec.
+        """
+        if ijson is None:
+            with open(file_path, 'rb') as f:
+                try:
+                    return self._summarize_spec(json.load(f))
+                except json.JSONDecodeError as e:
+                    raise ValueError(f"Invalid JSON: {str(e)}")
+
+        top_keys, paths, operations = {}, [], 0
+        depth, section = 0, None
+        with open(file_path, 'rb') as f:
+            try:
+                for _, event, value in ijson.parse(f):
+                    if event in ('start_map', 'start_array'):
+                        if depth == 0 and event == 'start_array':
+                            raise ValueError("Specification must be a JSON object")
+                        if depth == 1:
+                            top_keys[section] = event
+                        depth += 1
+                    elif event in ('end_map', 'end_array'):
+                        depth -= 1
+                    elif event == 'map_key':
+                        if depth == 1:
+                            section = value
+                        elif depth == 2 and section == 'paths':
+                            paths.append(value)
+                        elif depth == 3 and section == 'paths' and value.upper() in HTTP_METHODS:
+                            operations += 1
+                    elif depth == 0:
+                        raise ValueError("Specification must be a JSON object")
+                    elif depth == 1:
+                        top_keys[section] = value
+            except ijson.JSONError as e:
+                raise ValueError(f"Invalid JSON: {str(e)}")
+
+        if not self.validate_swagger(top_keys):
+            raise ValueError("Invalid Swagger/OpenAPI specification")
+        if 'paths' in top_keys and top_keys['paths'] != 'start_map':
+            raise ValueError("'paths' must be an object")
+        return {
+            'version': str(top_keys.get('openapi') or top_keys.get('swagger') or ''),
+            'paths': paths,
+            'operation_count': operations
+        }
+
+    def load_yaml_spec(self, file_path: str) -> Tuple[str, Dict[str, Any]]:
+        """Parse a YAML spec once and return it as JSON text (how specs are stored) with its summary"""
+        loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+        with open(file_path, 'rb') as f:
+            try:
+                data = yaml.load(f, Loader=loader)
+            except yaml.YAMLError as e:
+                raise ValueError(f"Invalid YAML: {str(e)}")
+        summary = self._summarize_spec(data)
+        return json.dumps(data, default=str), summary
+
+    def _summarize_spec(self, swagger_data: Any) -> Dict[str, Any]:
+        if not self.validate_swagger(swagger_data):
+            raise ValueError("Invalid Swagger/OpenAPI specification")
+        paths = swagger_data.get('paths', {})
+        if not isinstance(paths, dict):
+            raise ValueError("'paths' must be an object")
+        return {
+            'version': str(swagger_data.get('openapi') or swagger_data.get('swagger') or ''),
+            'paths': list(paths),
+            'operation_count': sum(
+                1 for methods in paths.values() if isinstance(methods, dict)
+                for method in methods if method.upper() in HTTP_METHODS
+            )
+        }
+
+    def index(self, content: str) -> SpecIndex:
+        """Memoized endpoint index for stored spec text; raises ValueError for invalid JSON"""
+        return get_spec_index(content)
+
     def extract_endpoints(self, swagger_data: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """Extract endpoints from Swagger/OpenAPI specification"""
-        endpoints = []
-        
+        """Extract endpoints from Swagger/OpenAPI specification, with local $refs resolved"""
         try:
-            paths = swagger_data.get('paths', {})
-            
-            for path, methods in paths.items():
-                for method, details in methods.items():
-                    if method.upper() in ['GET', 'POST', 'PUT', 'DELETE', 'PATCH']:
-                        endpoint = {
-                            'path': path,
-                            'method': method.upper(),
-                            'summary': details.get('summary', ''),
-                            'description': details.get('description', ''),
-                            'parameters': details.get('parameters', []),
-                            'responses': details.get('responses', {})
-                        }
-                        endpoints.append(endpoint)
-            
-            return endpoints
+            return list(SpecIndex(swagger_data).endpoints)
         except Exception:
             return []
 
-    def generate_test_cases_from_swagger(self, swagger_data: Dict[str, Any]) -> List[Dict[str, Any]]:
+    def group_endpoints(self, endpoints: List[Dict[str, Any]], max_group_size: int = 20) -> "OrderedDict[str, List[Dict[str, Any]]]":
+        """Split endpoints into prompt-sized groups (see spec_index.group_endpoints)"""
+        return group_endpoints(endpoints, max_group_size)
+
+    def generate_test_cases_from_swagger(self, swagger_data: Union[Dict[str, Any], SpecIndex]) -> List[Dict[str, Any]]:
         """Generate test cases from Swagger specification"""
-        endpoints = self.extract_endpoints(swagger_data)
+        index = swagger_data if isinstance(swagger_data, SpecIndex) else SpecIndex(swagger_data)
         test_cases = []
         
-        for endpoint in endpoints:
+        for endpoint in index.endpoints:
             test_case = {
                 'title': f"Test {endpoint['method']} {endpoint['path']}",
-                'description': endpoint.get('summary', f"Test {endpoint['method']} endpoint"),
+                'description': endpoint.get('summary') or f"Test {endpoint['method']} endpoint",
                 'steps': f"1. Send {endpoint['method']} request to {endpoint['path']}\n2. Verify response status\n3. Validate response body",
                 'expected_result': f"Should return appropriate status code and response for {endpoint['method']} {endpoint['path']}"
             }
-            test_cases.append(test_case) 
\ No newline at end of file
+            test_cases.append(test_case)
+        
+        return test_cases
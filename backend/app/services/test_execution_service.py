@@ -1,75 +1,317 @@
 import asyncio
+import os
 import random
-from typing import List, Dict, Any
+import signal
+import sys
+import tempfile
+import time
+from typing import List, Dict, Any, Optional, Callable, Awaitable
 from datetime import datetime
+from app.core.config import settings
+from app.services.test_scheduler import plan_shards, estimate_makespan
+
+try:
+    import resource
+except ImportError:  # Windows: no rlimits, scripts run without a memory cap
+    resource = None
+
+# Called with (stream name, line) for every line a script writes to stdout/stderr
+OutputCallback = Callable[[str, str], Awaitable[None]]
+
+# Environment variables a script inherits; everything else (API keys, DATABASE_URL) is withheld
+SCRIPT_ENV_ALLOWLIST = (
+    "PATH", "HOME", "LANG", "LC_ALL", "LC_CTYPE", "TZ", "TMPDIR", "TEMP", "TMP",
+    "SYSTEMROOT", "DISPLAY", "WAYLAND_DISPLAY", "XDG_RUNTIME_DIR", "PLAYWRIGHT_BROWSERS_PATH",
+)
+# How long a killed script and its output pipes get to wind down before they are abandoned
+KILL_GRACE_SECONDS = 5.0
+# Runs before the script on POSIX: caps memory with setrlimit, then execs the interpreter on the
+# script. Applied here rather than in preexec_fn, which is unsafe while the server runs threads.
+LIMIT_WRAPPER = (
+    "import os, resource, sys\n"
+    "limit = int(sys.argv[1]) * 1024 * 1024\n"
+    # RLIMIT_DATA rather than RLIMIT_AS: browsers reserve large virtual ranges they never touch
+    "resource.setrlimit(resource.RLIMIT_DATA, (limit, limit))\n"
+    "os.execv(sys.executable, [sys.executable, '-u'] + sys.argv[2:])\n"
+)
 
 class TestExecutionService:
     def __init__(self):
         self.execution_results = {}
+        self.max_workers = settings.EXECUTION_MAX_WORKERS or os.cpu_count() or 1
+        # _execute_test_case fakes outcomes; callers keep them out of anything a tester relies on
+        self.simulated = True
+        self._slots: Optional[asyncio.Semaphore] = None
+
+    @property
+    def slots(self) -> asyncio.Semaphore:
+        """Bounds how many script subprocesses run at once across all requests"""
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_workers)
+        return self._slots
+
+    async def execute_test_cases(
+        self,
+        test_cases: List[Dict[str, Any]],
+        shards: Optional[int] = None,
+        durations: Optional[Dict[int, float]] = None,
+        on_result: Optional[Callable[[Dict[str, Any]], Awaitable[None]]] = None,
+        flaky_ids: Optional[set] = None,
+        fail_fast: bool = False,
+        on_plan: Optional[Callable[[Dict[str, Any]], Awaitable[None]]] = None
+    ) -> Dict[str, Any]:
+        """Simulate test case execution, spread over shards that run concurrently.
 
-    async def execute_test_cases(self, test_cases: List[Dict[str, Any]]) -> Dict[str, Any]:
-        """Simulate test case execution"""
+        Cases are assigned with longest-processing-time-first using `durations`
+        (historical seconds per test case id), with `flaky_ids` at the front of each
+        shard. With `fail_fast`, shards stop picking up cases after the first failure.
+        `on_plan` is awaited once with the shard count and predicted wall time, and
+        `on_result` as each case finishes.
+        """
         results = {
             'total_tests': len(test_cases),
             'passed_tests': 0,
             'failed_tests': 0,
+            'skipped_tests': 0,
             'execution_time': 0,
+            'shards': 0,
+            'estimated_duration': 0.0,
+            'simulated': self.simulated,
             'test_results': []
         }
+        if not test_cases:
+            return results
         
-        start_time = datetime.now()
+        cases = [
+            test_case if test_case.get('id') is not None else {**test_case, 'id': i + 1}
+            for i, test_case in enumerate(test_cases)
+        ]
+        durations = durations or {}
+        plan = plan_shards(
+            cases,
+            durations,
+            shards or settings.EXECUTION_SHARDS,
+            settings.EXECUTION_DEFAULT_CASE_SECONDS,
+            first_ids=flaky_ids
+        )
+        results['shards'] = len(plan)
+        results['estimated_duration'] = estimate_makespan(plan, durations, settings.EXECUTION_DEFAULT_CASE_SECONDS)
+        if on_plan:
+            await on_plan({'shards': results['shards'], 'estimated_duration': results['estimated_duration']})
         
-        for i, test_case in enumerate(test_cases):
-            # Simulate test execution with random delay
-            await asyncio.sleep(random.uniform(0.1, 0.5))
-            
-            # Simulate pass/fail with 80% pass rate
-            passed = random.random() < 0.8
-            
-            test_result = {
-                'test_case_id': i + 1,
-                'title': test_case.get('title', f'Test Case {i + 1}'),
-                'status': 'passed' if passed else 'failed',
-                'execution_time': random.uniform(0.5, 2.0),
-                'error_message': None if passed else 'Simulated test failure'
-            }
-            
-            results['test_results'].append(test_result)
-            
-            if passed:
-                results['passed_tests'] += 1
-            else:
-                results['failed_tests'] += 1
+        failed = False
         
+        async def run_shard(shard_index: int, shard_cases: List[Dict[str, Any]]):
+            nonlocal failed
+            for position, test_case in enumerate(shard_cases):
+                if fail_fast and failed:
+                    results['skipped_tests'] += len(shard_cases) - position
+                    return
+                test_result = await self._execute_test_case(test_case)
+                test_result['shard'] = shard_index
+                results['test_results'].append(test_result)
+                if test_result['status'] == 'passed':
+                    results['passed_tests'] += 1
+                else:
+                    results['failed_tests'] += 1
+                    failed = True
+                if on_result:
+                    await on_result(test_result)
+        
+        start_time = datetime.now()
+        await asyncio.gather(*[run_shard(index, shard_cases) for index, shard_cases in enumerate(plan)])
         end_time = datetime.now()
         results['execution_time'] = (end_time - start_time).total_seconds()
         
         return results
 
-    async def run_automation_script(self, script_content: str, script_type: str) -> Dict[str, Any]:
-        """Simulate running an automation script"""
+    async def _execute_test_case(self, test_case: Dict[str, Any]) -> Dict[str, Any]:
+        """Simulate a single test case execution"""
+        start_time = time.perf_counter()
+        # Simulate test execution with random delay
+        await asyncio.sleep(random.uniform(0.1, 0.5))
+        
+        # Simulate pass/fail with 80% pass rate
+        passed = random.random() < 0.8
+        
+        return {
+            'test_case_id': test_case['id'],
+            'title': test_case.get('title', f"Test Case {test_case['id']}"),
+            'status': 'passed' if passed else 'failed',
+            'execution_time': time.perf_counter() - start_time,
+            'error_message': None if passed else 'Simulated test failure'
+        }
+
+    async def run_automation_script(
+        self,
+        script_content: str,
+        script_type: str,
+        timeout: Optional[float] = None,
+        on_output: Optional[OutputCallback] = None
+    ) -> Dict[str, Any]:
+        """Run a script in an isolated subprocess; pass/fail is decided by its exit code"""
+        timeout = timeout or settings.EXECUTION_TIMEOUT_SECONDS
+        async with self.slots:
+            start_time = time.perf_counter()
+            try:
+                with tempfile.TemporaryDirectory(prefix="scriptodon-run-") as work_dir:
+                    script_path = os.path.join(work_dir, "script.py")
+                    with open(script_path, "w", encoding="utf-8") as f:
+                        f.write(script_content)
+                    exit_code, output, timed_out = await self._run_subprocess(script_path, work_dir, timeout, on_output)
+            except Exception as e:
+                return {
+                    'status': 'failed',
+                    'exit_code': None,
+                    'execution_time': time.perf_counter() - start_time,
+                    'output': '',
+                    'error': str(e)
+                }
+        
+        execution_time = time.perf_counter() - start_time
+        if timed_out:
+            error = f"Script timed out after {timeout:.0f} seconds"
+        elif exit_code != 0:
+            error = f"Script exited with code {exit_code}"
+        else:
+            error = None
+        return {
+            'status': 'completed' if error is None else 'failed',
+            'exit_code': exit_code,
+            'execution_time': execution_time,
+            'output': output,
+            'error': error
+        }
+
+    async def run_automation_scripts(
+        self,
+        scripts: List[Dict[str, Any]],
+        on_output: Optional[Callable[[Any, str, str], Awaitable[None]]] = None
+    ) -> Dict[str, Any]:
+        """Run many scripts in parallel on the bounded pool and report throughput.
+
+        Each script dict needs `id`, `content` and `script_type`; `on_output` is
+        called with (script id, stream name, line).
+        """
+        start_time = time.perf_counter()
+        
+        async def run_one(script: Dict[str, Any]) -> Dict[str, Any]:
+            callback = None
+            if on_output:
+                async def callback(stream: str, line: str):
+                    await on_output(script['id'], stream, line)
+            result = await self.run_automation_script(script['content'], script['script_type'], on_output=callback)
+            return {'script_id': script['id'], **result}
+        
+        results = await asyncio.gather(*[run_one(script) for script in scripts])
+        execution_time = time.perf_counter() - start_time
+        passed = sum(1 for result in results if result['status'] == 'completed')
+        return {
+            'total_scripts': len(results),
+            'passed_scripts': passed,
+            'failed_scripts': len(results) - passed,
+            'execution_time': execution_time,
+            'scripts_per_minute': (len(results) / execution_time * 60) if execution_time > 0 else 0.0,
+            'max_workers': self.max_workers,
+            'results': results
+        }
+
+    async def _run_subprocess(
+        self,
+        script_path: str,
+        work_dir: str,
+        timeout: float,
+        on_output: Optional[OutputCallback]
+    ):
+        """Start the interpreter on `script_path`, stream its output and enforce the timeout"""
+        kwargs = {}
+        if os.name == "posix":
+            # New session so a timeout can kill the script together with any browsers it spawned
+            kwargs["start_new_session"] = True
+        limit_mb = settings.EXECUTION_MEMORY_LIMIT_MB
+        if resource is not None and limit_mb > 0:
+            command = [sys.executable, "-c", LIMIT_WRAPPER, str(limit_mb), script_path]
+        else:
+            command = [sys.executable, "-u", script_path]
+        process = await asyncio.create_subprocess_exec(
+            *command,
+            cwd=work_dir,
+            env=self._script_env(),
+            stdin=asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            limit=1024 * 1024,
+            **kwargs
+        )
+        
+        output: List[str] = []
+        captured = 0
+        
+        async def pump(stream, name: str):
+            nonlocal captured
+            async for raw in stream:
+                line = raw.decode("utf-8", errors="replace")
+                if captured < settings.EXECUTION_MAX_OUTPUT_BYTES:
+                    output.append(line if name == "stdout" else f"[stderr] {line}")
+                    captured += len(raw)
+                if on_output:
+                    await on_output(name, line)
+        
+        timed_out = False
+        deadline = time.monotonic() + timeout
+        pumps = asyncio.gather(pump(process.stdout, "stdout"), pump(process.stderr, "stderr"))
         try:
-            # Simulate script execution
-            await asyncio.sleep(random.uniform(1, 3))
-            
-            # Simulate success/failure
-            success = random.random() < 0.9  # 90% success rate
-            
-            return {
-                'status': 'completed' if success else 'failed',
-                'execution_time': random.uniform(2, 5),
-                'output': f"Script executed successfully using {script_type}" if success else "Script execution failed",
-                'error': None if success else "Simulated script execution error"
-            }
-        except Exception as e:
-            return {
-                'status': 'failed',
-                'execution_time': 0,
-                'output': '',
-                'error': str(e)
-            }
-
-    def generate_execution_report(self, results: Dict[str, Any]) -> str:
+            await asyncio.wait_for(asyncio.shield(pumps), timeout)
+            # Output closed, but the script may keep running without it (a second at least to exit)
+            await asyncio.wait_for(process.wait(), max(deadline - time.monotonic(), 1.0))
+        except asyncio.TimeoutError:
+            timed_out = True
+            self._kill(process)
+            await self._reap(process, pumps)
+        except asyncio.CancelledError:
+            self._kill(process)
+            raise
+        
+        return process.returncode, "".join(output), timed_out
+
+    @staticmethod
+    def _script_env() -> Dict[str, str]:
+        names = SCRIPT_ENV_ALLOWLIST + tuple(
+            name.strip() for name in settings.EXECUTION_ENV_PASSTHROUGH.split(",") if name.strip()
+        )
+        env = {name: os.environ[name] for name in names if name in os.environ}
+        env["PYTHONUNBUFFERED"] = "1"
+        return env
+
+    @staticmethod
+    async def _reap(process, pumps):
+        """Wait a bounded time for a killed script and its output pumps.
+
+        A grandchild that left the process group can hold the pipes open; its
+        output is then abandoned rather than hanging the run.
+        """
+        try:
+            await asyncio.wait_for(process.wait(), KILL_GRACE_SECONDS)
+        except asyncio.TimeoutError:
+            pass
+        try:
+            await asyncio.wait_for(pumps, KILL_GRACE_SECONDS)
+        except asyncio.TimeoutError:
+            pass
+
+    @staticmethod
+    def _kill(process):
+        if process.returncode is not None:
+            return
+        try:
+            if os.name == "posix":
+                os.killpg(process.pid, signal.SIGKILL)
+            else:
+                process.kill()
+        except ProcessLookupError:
+            pass
+
+    def generate_execution_report(self, results: Dict[str, Any], include_details: bool = True) -> str:
         """Generate a human-readable execution report"""
         report = f"""
         Test Execution Report
@@ -81,7 +323,11 @@ class TestExecutionService:
         Execution Time: {results['execution_time']:.2f} seconds
         
         Success Rate: {(results['passed_tests'] / results['total_tests'] * 100):.1f}%
+        """
+        if not include_details:
+            return report
         
+        report += """
         Detailed Results:
         """
         
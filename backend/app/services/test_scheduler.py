@@ -0,0 +1,46 @@
+import heapq
+from typing import List, Dict, Any, Optional, Set
+
+def predicted_duration(test_case: Dict[str, Any], durations: Dict[int, float], default: float) -> float:
+    return durations.get(test_case.get('id'), default)
+
+def plan_shards(
+    test_cases: List[Dict[str, Any]],
+    durations: Dict[int, float],
+    shard_count: int,
+    default_duration: float = 1.0,
+    first_ids: Optional[Set[int]] = None
+) -> List[List[Dict[str, Any]]]:
+    """Spread test cases over `shard_count` shards with longest-processing-time-first.
+
+    Cases are taken in descending order of predicted duration and each one goes to
+    the shard with the smallest total so far, which keeps the slowest shard (and so
+    the run's wall time) close to optimal. Cases with no history use `default_duration`.
+    Within a shard, cases in `first_ids` (e.g. historically flaky ones) run first.
+    """
+    shard_count = max(1, min(shard_count, len(test_cases)))
+    shards: List[List[Dict[str, Any]]] = [[] for _ in range(shard_count)]
+    loads = [(0.0, index) for index in range(shard_count)]
+    heapq.heapify(loads)
+
+    ordered = sorted(
+        test_cases,
+        key=lambda test_case: predicted_duration(test_case, durations, default_duration),
+        reverse=True
+    )
+    for test_case in ordered:
+        load, index = heapq.heappop(loads)
+        shards[index].append(test_case)
+        heapq.heappush(loads, (load + predicted_duration(test_case, durations, default_duration), index))
+    
+    if first_ids:
+        # sorted() is stable, so the slow-first order is kept inside each group
+        shards = [sorted(shard, key=lambda test_case: test_case.get('id') not in first_ids) for shard in shards]
+    return shards
+
+def estimate_makespan(shards: List[List[Dict[str, Any]]], durations: Dict[int, float], default_duration: float = 1.0) -> float:
+    """Predicted wall time of a plan: the total of its slowest shard"""
+    return max(
+        (sum(predicted_duration(test_case, durations, default_duration) for test_case in shard) for shard in shards),
+        default=0.0
+    )
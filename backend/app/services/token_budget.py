@@ -0,0 +1,85 @@
+import math
+from functools import lru_cache
+from typing import Callable, Dict, List, Tuple, TypeVar
+from app.core.config import settings
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+T = TypeVar("T")
+
+# Without tiktoken: JSON and code tokenise denser than prose, so err on the high side
+CHARS_PER_TOKEN = 3.5
+# Headroom for the chat template and estimation error
+SAFETY_MARGIN = 0.05
+TRUNCATION_MARKER = "\n[... truncated: {omitted} of {total} estimated tokens omitted]"
+
+# Context windows of models we have used; LLM_CONTEXT_WINDOWS overrides, LLM_CONTEXT_TOKENS is the default
+KNOWN_CONTEXT_WINDOWS: Dict[str, int] = {
+    "qwen/qwen-2.5-72b-instruct": 32768,
+    "qwen/qwen-2.5-72b-instruct:free": 32768,
+}
+
+@lru_cache(maxsize=1)
+def _encoding():
+    return tiktoken.get_encoding("cl100k_base") if tiktoken else None
+
+def estimate_tokens(text: str) -> int:
+    """Token count of `text`: exact for cl100k_base when tiktoken is installed, an estimate otherwise"""
+    if not text:
+        return 0
+    encoding = _encoding()
+    if encoding is not None:
+        return len(encoding.encode(text, disallowed_special=()))
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+@lru_cache(maxsize=1)
+def _configured_windows() -> Dict[str, int]:
+    windows = {}
+    for entry in settings.LLM_CONTEXT_WINDOWS.split(","):
+        model, _, tokens = entry.strip().rpartition("=")
+        if model and tokens.strip().isdigit():
+            windows[model.strip()] = int(tokens)
+    return windows
+
+def context_window(model: str) -> int:
+    return _configured_windows().get(model) or KNOWN_CONTEXT_WINDOWS.get(model) or settings.LLM_CONTEXT_TOKENS
+
+def prompt_budget(model: str) -> int:
+    """Tokens a prompt for `model` may use: its window less the completion reserve and a safety margin"""
+    window = context_window(model)
+    return max(int(window * (1 - SAFETY_MARGIN)) - settings.LLM_MAX_COMPLETION_TOKENS, 256)
+
+def truncate_to_budget(text: str, max_tokens: int) -> Tuple[str, bool]:
+    """Cut `text` at a line boundary so it fits `max_tokens`, noting how much was dropped"""
+    total = estimate_tokens(text)
+    if total <= max_tokens:
+        return text, False
+    keep = len(text) * max_tokens // total
+    while keep > 0:
+        cut = text.rfind("\n", 0, keep)
+        head = text[:cut if cut > keep // 2 else keep]
+        marker = TRUNCATION_MARKER.format(omitted=total - estimate_tokens(head), total=total)
+        if estimate_tokens(head + marker) <= max_tokens:
+            return head + marker, True
+        keep = int(keep * 0.9)
+    return "", True
+
+def split_to_budget(items: List[T], cost: Callable[[T], int], max_tokens: int) -> List[List[T]]:
+    """Pack items in order into batches whose summed cost fits `max_tokens`.
+
+    An item that alone exceeds the budget gets a batch of its own (and is
+    truncated when its prompt is sent).
+    """
+    batches: List[List[T]] = []
+    used = 0
+    for item in items:
+        size = cost(item)
+        if not batches or used + size > max_tokens:
+            batches.append([])
+            used = 0
+        batches[-1].append(item)
+        used += size
+    return batches
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Benchmark: saving generated test cases, one ORM object each vs the bulk repository path.
+
+    orm add     the previous run_test_generation loop: db.add per case, flush, serialize
+    bulk        app.repositories.test_cases.bulk_create: fingerprint lookup, multi-row
+                INSERT (RETURNING where the dialect has it), serialize the returned rows
+
+Each batch goes to a fresh input source on a temporary SQLite database, so the
+duplicate check finds nothing and both paths insert every row.
+
+    python benchmarks/bench_bulk_insert.py --batch-sizes 100 500 1000 --repeat 5
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+def make_cases(count: int, salt: int):
+    return [
+        {
+            "title": f"Case {salt}-{i}: POST /resource{i % 50}/items",
+            "description": "Generated for the benchmark",
+            "steps": f"1. Prepare a valid request ({i})\n2. Send the request\n3. Verify the response status and body",
+            "expected_result": "Returns 201"
+        }
+        for i in range(count)
+    ]
+
+async def orm_add(db, input_source_id: int, cases):
+    from app.models.test_case import TestCase
+    from app.schemas.test_case import TestCaseResponse
+
+    saved = []
+    for case in cases:
+        test_case = TestCase(
+            title=case.get('title', 'Generated Test Case'),
+            description=case.get('description', ''),
+            steps=case.get('steps', ''),
+            expected_result=case.get('expected_result', ''),
+            input_source_id=input_source_id
+        )
+        db.add(test_case)
+        saved.append(test_case)
+    await db.flush()
+    payload = [TestCaseResponse.model_validate(test_case).model_dump(mode="json") for test_case in saved]
+    await db.commit()
+    return payload
+
+async def bulk(db, input_source_id: int, cases):
+    from app.repositories import test_cases as test_cases_repository
+    from app.schemas.test_case import TestCaseResponse
+
+    rows, _ = await test_cases_repository.bulk_create(db, input_source_id, cases)
+    payload = [TestCaseResponse.model_validate(row).model_dump(mode="json") for row in rows]
+    await db.commit()
+    return payload
+
+async def run(batch_sizes, repeat: int):
+    from app.core.database import AsyncSessionLocal, create_tables
+    from app.models.input_source import InputSource, InputSourceType
+
+    create_tables()
+    salt = 0
+    print(f"{'batch':>6} {'orm add (rows/s)':>17} {'bulk (rows/s)':>14} {'speedup':>8}")
+    for size in batch_sizes:
+        rates = {}
+        for name, save in (("orm", orm_add), ("bulk", bulk)):
+            samples = []
+            for _ in range(repeat):
+                salt += 1
+                async with AsyncSessionLocal() as db:
+                    source = InputSource(name=f"Bench {salt}", source_type=InputSourceType.USER_PROMPT, content="bench")
+                    db.add(source)
+                    await db.commit()
+                    cases = make_cases(size, salt)
+                    start = time.perf_counter()
+                    payload = await save(db, source.id, cases)
+                    samples.append(time.perf_counter() - start)
+                    assert len(payload) == size
+            rates[name] = size / statistics.median(samples)
+        print(f"{size:>6} {rates['orm']:>17,.0f} {rates['bulk']:>14,.0f} {rates['bulk'] / rates['orm']:>7.1f}x")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[100, 500, 1000, 5000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bulk.db')}"
+    asyncio.run(run(args.batch_sizes, args.repeat))
+
+if __name__ == "__main__":
+    main()
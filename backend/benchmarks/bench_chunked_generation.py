@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Benchmark: chunked test generation for a large Swagger spec at different
+concurrency limits. Wall time should fall roughly in proportion to the limit.
+
+    python benchmarks/bench_chunked_generation.py --endpoints 500 --latency 0.2
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+def build_spec(endpoint_count: int, tags: int = 25):
+    """Synthetic OpenAPI spec with `endpoint_count` operations spread over `tags` tags"""
+    paths = {}
+    for i in range(endpoint_count):
+        tag = f"resource{i % tags}"
+        paths[f"/{tag}/items{i}"] = {
+            "get": {
+                "tags": [tag],
+                "summary": f"Get item {i}",
+                "parameters": [{"name": "id", "in": "query", "required": True, "schema": {"type": "integer"}}],
+                "responses": {"200": {"description": "OK"}, "404": {"description": "Not found"}}
+            }
+        }
+    return {"openapi": "3.0.0", "info": {"title": "Benchmark API", "version": "1.0"}, "paths": paths}
+
+async def run(spec, concurrencies, chunk_size):
+    from app.services.ai_service import AIService
+
+    ai_service = AIService()
+    baseline = None
+    print(f"{'Concurrency':>11} {'Wall (s)':>9} {'Speedup':>8}")
+    for concurrency in concurrencies:
+        start = time.perf_counter()
+        await ai_service.generate_test_cases_chunked(
+            spec, bypass_cache=True, chunk_size=chunk_size, concurrency=concurrency
+        )
+        elapsed = time.perf_counter() - start
+        baseline = baseline or elapsed
+        print(f"{concurrency:>11} {elapsed:>9.2f} {baseline / elapsed:>7.1f}x")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--endpoints", type=int, default=500)
+    parser.add_argument("--chunk-size", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.2)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--port", type=int, default=9100)
+    args = parser.parse_args()
+
+    from stub_openrouter import StubServer, create_stub_app
+
+    with StubServer(create_stub_app(args.latency), args.port) as stub:
+        os.environ["OPENROUTER_API_KEY"] = "stub-key"
+        os.environ["OPENROUTER_BASE_URL"] = stub.base_url
+        spec = build_spec(args.endpoints)
+        groups = -(-args.endpoints // args.chunk_size)
+        print(f"{args.endpoints} endpoints in ~{groups} groups, {args.latency:.2f}s per LLM call")
+        asyncio.run(run(spec, args.concurrency, args.chunk_size))
+
+if __name__ == "__main__":
+    main()
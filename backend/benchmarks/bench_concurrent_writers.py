@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Benchmark: concurrent test case status writes against SQLite under three configurations.
+
+    default     rollback journal, synchronous=FULL (SQLite's out-of-the-box settings)
+    wal         WAL journal with the tuned pragmas from app/core/database.py
+    coalesced   WAL plus the write coalescer (one commit per tick per process)
+
+Several writer processes (think uvicorn workers plus the job runner) share one
+database file, each with many concurrent coroutines issuing the same UPDATE as
+/api/manual-testing/update-test-case-status. HTTP is left out so the numbers
+reflect the database rather than request parsing. Settings are read at import
+time, so every configuration gets fresh processes and a fresh database.
+
+    python benchmarks/bench_concurrent_writers.py --processes 4 --writers 25 --updates 1000
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+MODES = {
+    "default": {
+        "SQLITE_WAL_ENABLED": "false",
+        "SQLITE_SYNCHRONOUS": "FULL",
+        "SQLITE_MMAP_SIZE": "0",
+        "SQLITE_CACHE_SIZE_KB": "2000",
+        "WRITE_COALESCING_ENABLED": "false"
+    },
+    "wal": {"SQLITE_WAL_ENABLED": "true", "WRITE_COALESCING_ENABLED": "false"},
+    "coalesced": {"SQLITE_WAL_ENABLED": "true", "WRITE_COALESCING_ENABLED": "true"}
+}
+
+def seed(cases: int):
+    from app.core.database import SessionLocal, create_tables
+    from app.models.input_source import InputSource, InputSourceType
+    from app.models.test_case import TestCase
+
+    create_tables()
+    db = SessionLocal()
+    source = InputSource(name="Writers", source_type=InputSourceType.USER_PROMPT, content="Manual testing")
+    db.add(source)
+    db.flush()
+    db.add_all(TestCase(title=f"Case {i}", steps="1. Do it", input_source_id=source.id) for i in range(cases))
+    db.commit()
+    db.close()
+
+async def run_writers(updates: int, writers: int, cases: int, offset: int):
+    from sqlalchemy import update
+    from app.core.write_coalescer import write_coalescer
+    from app.models.test_case import TestCase, TestCaseStatus
+
+    statuses = [TestCaseStatus.PASSED, TestCaseStatus.FAILED, TestCaseStatus.PENDING]
+    latencies = []
+    queue = asyncio.Queue()
+    for i in range(offset, offset + updates):
+        queue.put_nowait(i)
+
+    async def writer():
+        while not queue.empty():
+            i = queue.get_nowait()
+
+            async def set_status(session):
+                result = await session.execute(
+                    update(TestCase).where(TestCase.id == i % cases + 1).values(status=statuses[i % len(statuses)])
+                )
+                return result.rowcount
+
+            start = time.perf_counter()
+            await write_coalescer.submit(set_status)
+            latencies.append(time.perf_counter() - start)
+
+    await write_coalescer.start()
+    try:
+        await asyncio.gather(*(writer() for _ in range(writers)))
+    finally:
+        await write_coalescer.stop()
+    return latencies
+
+def run_worker(args):
+    latencies = asyncio.run(run_writers(args.updates, args.writers, args.cases, args.offset))
+    print(json.dumps(latencies))
+
+def run_mode(mode: str, args) -> dict:
+    env = dict(
+        os.environ,
+        DATABASE_URL=f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'writers.db')}",
+        **MODES[mode]
+    )
+    script = os.path.abspath(__file__)
+    subprocess.run([sys.executable, script, "--seed", "--cases", str(args.cases)], env=env, check=True)
+
+    start = time.perf_counter()
+    workers = [
+        subprocess.Popen(
+            [sys.executable, script, "--worker", "--offset", str(index * args.updates),
+             "--updates", str(args.updates), "--writers", str(args.writers), "--cases", str(args.cases)],
+            env=env, stdout=subprocess.PIPE, text=True
+        )
+        for index in range(args.processes)
+    ]
+    latencies = []
+    for worker in workers:
+        output, _ = worker.communicate()
+        if worker.returncode:
+            raise RuntimeError(f"{mode} writer exited with code {worker.returncode}")
+        latencies.extend(json.loads(output.strip().splitlines()[-1]))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "updates_per_second": len(latencies) / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--processes", type=int, default=4, help="Writer processes sharing the database")
+    parser.add_argument("--writers", type=int, default=25, help="Concurrent coroutines per process")
+    parser.add_argument("--updates", type=int, default=1000, help="Status updates per process")
+    parser.add_argument("--cases", type=int, default=200, help="Test cases to spread updates over")
+    parser.add_argument("--seed", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--offset", type=int, default=0, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.seed:
+        seed(args.cases)
+        return
+    if args.worker:
+        run_worker(args)
+        return
+
+    results = {mode: run_mode(mode, args) for mode in MODES}
+
+    print(f"{args.processes} processes x {args.writers} writers, {args.processes * args.updates} updates")
+    print(f"{'Mode':<10} {'updates/s':>10} {'p50 (ms)':>10} {'p99 (ms)':>10}")
+    for mode, result in results.items():
+        print(f"{mode:<10} {result['updates_per_second']:>10.1f} {result['p50_ms']:>10.1f} {result['p99_ms']:>10.1f}")
+    print(f"Coalesced vs default: {results['coalesced']['updates_per_second'] / results['default']['updates_per_second']:.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Benchmark: LLM cost of bringing test cases up to date after a spec revision.
+
+    full          regenerate everything: chunked generation over every endpoint
+    incremental   /regenerate: only changed and added operations go to the LLM,
+                  cases of changed and removed operations are retired
+
+The revision edits the summary of `--changed` operations, removes `--removed`
+and adds `--added`. LLM calls go to the local OpenRouter stub, which counts
+requests and prompt characters; tokens are estimated at 4 characters each.
+
+    python benchmarks/bench_incremental_regeneration.py --endpoints 500 --changed 5 --removed 2 --added 3
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+def revise(spec: dict, changed: int, removed: int, added: int) -> dict:
+    spec = json.loads(json.dumps(spec))
+    paths = list(spec["paths"])
+    for path in paths[:changed]:
+        spec["paths"][path]["get"]["summary"] += " (revised)"
+    for path in paths[-removed:] if removed else ():
+        del spec["paths"][path]
+    for i in range(added):
+        spec["paths"][f"/new/items{i}"] = {
+            "get": {"tags": ["new"], "summary": f"New item {i}", "responses": {"200": {"description": "OK"}}}
+        }
+    return spec
+
+async def run(stub_state, original: str, revised: str):
+    from app.core.database import AsyncSessionLocal, create_tables
+    from app.models.input_source import InputSource, InputSourceType
+    from app.routers.test_generation import run_test_generation, run_test_regeneration
+
+    create_tables()
+    async with AsyncSessionLocal() as db:
+        source = InputSource(name="Bench", source_type=InputSourceType.SWAGGER, content=original)
+        db.add(source)
+        await db.commit()
+        # Baseline: every operation generated once with its section recorded
+        await run_test_regeneration(db, source.id, bypass_cache=True)
+        source.content = revised
+        await db.commit()
+
+        async def measure(generate):
+            requests, prompt_chars = stub_state.requests, stub_state.prompt_chars
+            start = time.perf_counter()
+            result = await generate()
+            return (
+                stub_state.requests - requests,
+                stub_state.prompt_chars - prompt_chars,
+                time.perf_counter() - start,
+                result
+            )
+
+        incremental = await measure(lambda: run_test_regeneration(db, source.id, bypass_cache=True))
+        full = await measure(lambda: run_test_generation(db, source.id, bypass_cache=True, chunked=True))
+
+    diff = incremental[3]
+    print(f"Revision: {len(diff['changed'])} changed, {len(diff['added'])} added, {len(diff['removed'])} removed "
+          f"of {diff['sections']} operations; {diff['retired']} cases retired")
+    print(f"{'Mode':<12} {'LLM calls':>9} {'prompt tokens':>14} {'wall (s)':>9}")
+    for name, (calls, chars, elapsed, _) in (("full", full), ("incremental", incremental)):
+        print(f"{name:<12} {calls:>9} {chars // 4:>14,} {elapsed:>9.2f}")
+    print(f"Reduction: {full[1] / max(incremental[1], 1):.0f}x prompt tokens, {full[2] / incremental[2]:.1f}x wall time")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--endpoints", type=int, default=500)
+    parser.add_argument("--schemas", type=int, default=50)
+    parser.add_argument("--changed", type=int, default=5)
+    parser.add_argument("--removed", type=int, default=2)
+    parser.add_argument("--added", type=int, default=3)
+    parser.add_argument("--latency", type=float, default=1.0)
+    parser.add_argument("--port", type=int, default=9100)
+    args = parser.parse_args()
+
+    from bench_spec_index import build_spec
+    from stub_openrouter import StubServer, create_stub_app
+
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'regenerate.db')}"
+    with StubServer(create_stub_app(args.latency), args.port) as stub:
+        os.environ["OPENROUTER_API_KEY"] = "stub-key"
+        os.environ["OPENROUTER_BASE_URL"] = stub.base_url
+        spec = build_spec(args.endpoints, args.schemas, max(1, args.endpoints // 20))
+        original = json.dumps(spec)
+        revised = json.dumps(revise(spec, args.changed, args.removed, args.added))
+        asyncio.run(run(stub.app.state, original, revised))
+
+if __name__ == "__main__":
+    main()
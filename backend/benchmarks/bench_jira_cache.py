@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Benchmark: keeping Jira-backed input sources current, with and without the issue cache.
+
+    re-ingest   fetch the content of every imported issue again, as /api/input-sources/jira
+                does per key: uncached each key is a remote GET, cached it is a local read
+    sync        bring the input sources up to date after `--touched` issues were edited:
+                uncached re-imports everything with one JQL search, cached runs
+                /api/jira/cache/refresh (`key in (...) AND updated >= -Nm` per 100 keys)
+
+Both run against the local Jira stub with `--latency` seconds per response.
+
+    python benchmarks/bench_jira_cache.py --issues 500 --touched 5 --latency 0.05
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+async def reingest_uncached(db, jira_service, keys):
+    for key in keys:
+        jira_service.parse_jira_issue(await jira_service.fetch_issue_data(key))
+
+async def reingest_cached(db, jira_service, keys):
+    from app.services import jira_cache
+
+    for key in keys:
+        jira_service.parse_jira_issue(await jira_cache.get_issue(db, key))
+
+async def sync_uncached(db, jira_service, keys):
+    from sqlalchemy import select
+    from app.models.input_source import InputSource, InputSourceType
+
+    issues = {issue['key']: issue for issue in await jira_service.search_issues('project = STUB ORDER BY key')}
+    result = await db.execute(select(InputSource).where(InputSource.source_type == InputSourceType.JIRA))
+    for source in result.scalars():
+        source.content = jira_service.parse_jira_issue(issues[source.jira_issue_key])
+    await db.commit()
+
+async def sync_cached(db, jira_service, keys):
+    from app.services import jira_cache
+
+    return await jira_cache.refresh(db, jira_service)
+
+async def run(stub, issue_count: int, touched: int):
+    from app.core.database import AsyncSessionLocal, create_tables
+    from app.core.http_client import close_http_client
+    from app.models.input_source import InputSource, InputSourceType
+    from app.services import jira_cache
+    from app.services.jira_service import JiraService
+    from stub_jira import touch
+
+    create_tables()
+    jira_service = JiraService()
+    keys = list(stub.app.state.issues)
+
+    async with AsyncSessionLocal() as db:
+        issues = await jira_service.search_issues('project = STUB ORDER BY key')
+        db.add_all([
+            InputSource(
+                name=issue['key'], source_type=InputSourceType.JIRA, content=jira_service.parse_jira_issue(issue),
+                jira_url=jira_service.issue_url(issue['key']), jira_issue_key=issue['key']
+            )
+            for issue in issues
+        ])
+        await jira_cache.store_issues(db, issues)
+        await db.commit()
+
+        rows = []
+        for step, name, measure in (
+            ("re-ingest", "uncached", reingest_uncached),
+            ("re-ingest", "cached", reingest_cached),
+            ("sync", "uncached", sync_uncached),
+            ("sync", "cached", sync_cached)
+        ):
+            if step == "sync":
+                for key in keys[:touched]:
+                    touch(stub.app.state.issues[key], f"Edited before {name} sync")
+            requests_before, bytes_before = stub.app.state.requests, stub.app.state.bytes_sent
+            start = time.perf_counter()
+            await measure(db, jira_service, keys)
+            elapsed = time.perf_counter() - start
+            rows.append((step, name, stub.app.state.requests - requests_before, stub.app.state.bytes_sent - bytes_before, elapsed))
+    await close_http_client()
+
+    print(f"{issue_count} imported issues, {touched} edited before each sync, {stub.app.state.latency * 1000:.0f} ms per Jira response")
+    print(f"{'Step':<10} {'Mode':<9} {'requests':>9} {'KB received':>12} {'wall (s)':>9}")
+    for step, name, requests, sent, elapsed in rows:
+        print(f"{step:<10} {name:<9} {requests:>9} {sent / 1024:>12,.0f} {elapsed:>9.2f}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--issues", type=int, default=500)
+    parser.add_argument("--touched", type=int, default=5)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--port", type=int, default=9200)
+    args = parser.parse_args()
+
+    from stub_jira import create_stub_app
+    from stub_openrouter import StubServer
+
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'jira_cache.db')}"
+    with StubServer(create_stub_app(args.issues, args.latency), args.port) as stub:
+        os.environ["JIRA_SERVER_URL"] = f"http://127.0.0.1:{args.port}"
+        os.environ["JIRA_USERNAME"] = "bench"
+        os.environ["JIRA_API_TOKEN"] = "token"
+        os.environ["JIRA_SEARCH_MAX_ISSUES"] = str(max(args.issues, 1000))
+        asyncio.run(run(stub, args.issues, args.touched))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Benchmark: importing N Jira issues as input sources, one at a time vs one JQL import.
+
+    per issue   the previous /api/input-sources/jira flow repeated per key: a blocking
+                requests.get of the full issue, then one commit per input source
+    bulk        JiraService.search_issues (pooled httpx client, parallel pages,
+                only the needed fields) and one transaction, as /jira/search runs it
+
+Both run against the local Jira stub with `--latency` seconds per response.
+
+    python benchmarks/bench_jira_ingestion.py --issues 500 --latency 0.05
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+async def per_issue(keys, jira_service):
+    import requests
+    from app.core.database import AsyncSessionLocal
+    from app.models.input_source import InputSource, InputSourceType
+
+    received = 0
+    for key in keys:
+        response = requests.get(f"{jira_service.base_url}/rest/api/3/issue/{key}", auth=("bench", "token"))
+        response.raise_for_status()
+        received += len(response.content)
+        async with AsyncSessionLocal() as db:
+            db.add(InputSource(
+                name=key, source_type=InputSourceType.JIRA, content=jira_service.parse_jira_issue(response.json()),
+                jira_url=jira_service.issue_url(key), jira_issue_key=key
+            ))
+            await db.commit()
+    return received
+
+async def bulk(jira_service, concurrency: int):
+    from app.core.database import AsyncSessionLocal
+    from app.models.input_source import InputSource, InputSourceType
+
+    issues = await jira_service.search_issues('project = STUB ORDER BY key', concurrency=concurrency)
+    async with AsyncSessionLocal() as db:
+        db.add_all([
+            InputSource(
+                name=issue['key'], source_type=InputSourceType.JIRA, content=jira_service.parse_jira_issue(issue),
+                jira_url=jira_service.issue_url(issue['key']), jira_issue_key=issue['key']
+            )
+            for issue in issues
+        ])
+        await db.commit()
+    return len(issues)
+
+async def run(stub, issue_count: int, concurrency: int):
+    from app.core.database import create_tables
+    from app.core.http_client import close_http_client
+    from app.services.jira_service import JiraService
+
+    create_tables()
+    jira_service = JiraService()
+    keys = list(stub.app.state.issues)
+
+    rows = []
+    for name, measure in (
+        ("per issue", lambda: per_issue(keys, jira_service)),
+        ("bulk", lambda: bulk(jira_service, concurrency))
+    ):
+        requests_before, bytes_before = stub.app.state.requests, stub.app.state.bytes_sent
+        start = time.perf_counter()
+        await measure()
+        elapsed = time.perf_counter() - start
+        rows.append((name, stub.app.state.requests - requests_before, stub.app.state.bytes_sent - bytes_before, elapsed))
+    await close_http_client()
+
+    print(f"{issue_count} issues, {stub.app.state.latency * 1000:.0f} ms per Jira response, search concurrency {concurrency}")
+    print(f"{'Mode':<10} {'requests':>9} {'KB received':>12} {'wall (s)':>9} {'issues/s':>9}")
+    for name, requests, sent, elapsed in rows:
+        print(f"{name:<10} {requests:>9} {sent / 1024:>12,.0f} {elapsed:>9.2f} {issue_count / elapsed:>9.0f}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--issues", type=int, default=500)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--port", type=int, default=9200)
+    args = parser.parse_args()
+
+    from stub_jira import create_stub_app
+    from stub_openrouter import StubServer
+
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'jira.db')}"
+    with StubServer(create_stub_app(args.issues, args.latency), args.port) as stub:
+        os.environ["JIRA_SERVER_URL"] = f"http://127.0.0.1:{args.port}"
+        os.environ["JIRA_USERNAME"] = "bench"
+        os.environ["JIRA_API_TOKEN"] = "token"
+        os.environ["JIRA_SEARCH_MAX_ISSUES"] = str(max(args.issues, 1000))
+        asyncio.run(run(stub, args.issues, args.concurrency))
+
+if __name__ == "__main__":
+    main()
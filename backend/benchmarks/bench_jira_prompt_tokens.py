@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Report: prompt tokens for Jira issues before and after ADF rendering and prompt compaction.
+
+    before   the previous parse_jira_issue (an indented f-string with the ADF
+             description dict inlined and N/A lines) in the previous prompt template
+    after    parse_jira_issue (Markdown, acceptance criteria, subtasks and links)
+             in the compacted prompt built by AIService
+
+Runs offline on benchmarks/fixtures/jira_issues.json. Tokens are counted with
+tiktoken (cl100k_base) when it is installed and estimated at 4 characters each otherwise.
+
+    python benchmarks/bench_jira_prompt_tokens.py [--fixtures path/to/issues.json]
+"""
+
+import argparse
+import json
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "jira_issues.json")
+
+try:
+    import tiktoken
+    _encoding = tiktoken.get_encoding("cl100k_base")
+    TOKENIZER = "cl100k_base"
+
+    def count_tokens(text: str) -> int:
+        return len(_encoding.encode(text))
+except ImportError:
+    TOKENIZER = "~4 chars/token"
+
+    def count_tokens(text: str) -> int:
+        return (len(text) + 3) // 4
+
+def legacy_content(issue_data: dict) -> str:
+    fields = issue_data.get('fields', {})
+    return f"""
+        Issue Key: {issue_data.get('key', 'N/A')}
+        Summary: {fields.get('summary', 'N/A')}
+        Description: {fields.get('description', 'N/A')}
+        Status: {(fields.get('status') or {}).get('name', 'N/A')}
+        Priority: {(fields.get('priority') or {}).get('name', 'N/A')}
+        Assignee: {(fields.get('assignee') or {}).get('displayName', 'N/A')}
+        Reporter: {(fields.get('reporter') or {}).get('displayName', 'N/A')}
+        Created: {fields.get('created', 'N/A')}
+        Updated: {fields.get('updated', 'N/A')}
+        """
+
+def legacy_prompt(input_content: str) -> str:
+    return f"""
+        Generate comprehensive test cases based on the following jira input.
+        Return the response as a JSON array with the following structure:
+        [
+            {{
+                "title": "Test case title",
+                "description": "Test case description",
+                "steps": "Step 1. Do this\\nStep 2. Do that\\nStep 3. Verify this",
+                "expected_result": "Expected outcome"
+            }}
+        ]
+        
+        Input content:
+        {input_content}
+        """
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--fixtures", default=FIXTURES)
+    parser.add_argument("--acceptance-criteria-field", default="customfield_10035")
+    parser.add_argument("--show", help="print both prompts for this issue key")
+    args = parser.parse_args()
+
+    os.environ["JIRA_ACCEPTANCE_CRITERIA_FIELD"] = args.acceptance_criteria_field
+    from app.services.ai_service import AIService
+    from app.services.jira_service import JiraService
+
+    jira_service = JiraService()
+    ai_service = AIService()
+    with open(args.fixtures) as handle:
+        issues = json.load(handle)
+
+    print(f"{len(issues)} issues from {os.path.relpath(args.fixtures)}, tokens: {TOKENIZER}")
+    print(f"{'Issue':<10} {'content before':>15} {'content after':>14} {'prompt before':>14} {'prompt after':>13} {'saved':>6}")
+    totals = [0, 0, 0, 0]
+    for issue in issues:
+        before = legacy_content(issue)
+        after = jira_service.parse_jira_issue(issue)
+        row = [
+            count_tokens(before),
+            count_tokens(after),
+            count_tokens(legacy_prompt(before)),
+            count_tokens(ai_service._build_test_case_prompt(after, "jira"))
+        ]
+        totals = [total + value for total, value in zip(totals, row)]
+        print(f"{issue['key']:<10} {row[0]:>15} {row[1]:>14} {row[2]:>14} {row[3]:>13} {1 - row[3] / row[2]:>6.0%}")
+        if args.show == issue['key']:
+            print(legacy_prompt(before), "\n----\n", ai_service._build_test_case_prompt(after, "jira"), sep="")
+    print(f"{'total':<10} {totals[0]:>15} {totals[1]:>14} {totals[2]:>14} {totals[3]:>13} {1 - totals[3] / totals[2]:>6.0%}")
+
+if __name__ == "__main__":
+    main()
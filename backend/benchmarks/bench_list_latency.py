@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Benchmark: latency of GET /api/input-sources/ under concurrent load, blocking vs async sessions.
+
+The baseline route is the pre-async implementation (an `async def` endpoint
+querying through the sync Session, which blocks the event loop for every query);
+it is mounted next to the real route on the same uvicorn server.
+
+    python benchmarks/bench_list_latency.py --sources 500 --requests 400 --concurrency 50
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+from typing import List
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+def percentile(values, percent: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * percent / 100))]
+
+async def run_load(base_url: str, path: str, total: int, concurrency: int):
+    import httpx
+
+    latencies = []
+    semaphore = asyncio.Semaphore(concurrency)
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, timeout=None, limits=limits) as client:
+        async def one():
+            async with semaphore:
+                start = time.perf_counter()
+                response = await client.get(path)
+                response.raise_for_status()
+                latencies.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(total)))
+        elapsed = time.perf_counter() - start
+    return latencies, elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sources", type=int, default=500, help="Input sources to seed")
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--port", type=int, default=9102)
+    args = parser.parse_args()
+
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'latency.db')}"
+
+    from fastapi import Depends
+    from sqlalchemy.orm import Session
+    from stub_openrouter import StubServer
+    from main import app
+    from app.core.database import SessionLocal, create_tables, get_db
+    from app.models.input_source import InputSource, InputSourceType
+    from app.schemas.input_source import InputSourceResponse
+
+    create_tables()
+    db = SessionLocal()
+    db.add_all(
+        InputSource(name=f"Source {i}", source_type=InputSourceType.USER_PROMPT, content="Users can log in. " * 50)
+        for i in range(args.sources)
+    )
+    db.commit()
+    db.close()
+
+    @app.get("/baseline/input-sources/", response_model=List[InputSourceResponse])
+    async def baseline_input_sources(db: Session = Depends(get_db)):
+        return db.query(InputSource).all()
+
+    base_url = f"http://127.0.0.1:{args.port}"
+    results = {}
+    with StubServer(app, args.port):
+        for mode, path in (("blocking", "/baseline/input-sources/"), ("async", "/api/input-sources/")):
+            asyncio.run(run_load(base_url, path, args.concurrency, args.concurrency))  # warm up the pools
+            results[mode] = asyncio.run(run_load(base_url, path, args.requests, args.concurrency))
+
+    print(f"{args.requests} requests, concurrency {args.concurrency}, {args.sources} rows")
+    print(f"{'Session':<10} {'p50 (ms)':>10} {'p99 (ms)':>10} {'mean (ms)':>10} {'req/s':>8}")
+    for mode, (latencies, elapsed) in results.items():
+        print(
+            f"{mode:<10} {percentile(latencies, 50) * 1000:>10.1f} {percentile(latencies, 99) * 1000:>10.1f}"
+            f" {statistics.mean(latencies) * 1000:>10.1f} {len(latencies) / elapsed:>8.1f}"
+        )
+
+if __name__ == "__main__":
+    main()
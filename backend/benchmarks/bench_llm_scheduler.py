@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Benchmark: a burst of test generations against a rate-limited OpenRouter key.
+
+The local OpenRouter stub accepts `--limit` requests per `--period` seconds and
+answers the rest with 429 and a Retry-After; `--error-rate` of accepted requests
+fail with 503. `--requests` generations start at once, as when many users
+generate together.
+
+    no retries    LLM_MAX_RETRIES=0 and no client-side limit: one attempt each
+    retries       jittered exponential backoff honouring Retry-After, no client-side limit
+    scheduled     retries plus the token bucket sized to the key's limit, so requests
+                  queue instead of collecting 429s
+
+Reports generations that succeeded and failed, the 429s the stub sent, latency
+percentiles and the scheduler's queue metrics (GET /api/test-generation/llm-scheduler).
+
+    python benchmarks/bench_llm_scheduler.py --requests 150 --limit 30 --period 5
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+def percentile(values, fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))] if ordered else 0.0
+
+async def run_mode(stub, args, retries: int, bucket: bool):
+    from app.core.config import settings
+    from app.services import llm_scheduler, model_router
+    from app.services.ai_service import AIService
+
+    settings.LLM_MAX_RETRIES = retries
+    llm_scheduler._scheduler = None
+    model_router._router = None
+    scheduler = llm_scheduler.get_llm_scheduler()
+    if bucket:
+        # The stub's window is shorter than a minute to keep the run short
+        scheduler.request_bucket = llm_scheduler.TokenBucket(args.limit, args.period)
+    ai_service = AIService()
+    # Let the previous mode's window drain
+    await asyncio.sleep(args.period)
+    stub.app.state.accepted_at.clear()
+    rate_limited, requests = stub.app.state.rate_limited, sum(stub.app.state.model_requests.values())
+    latencies, failures = [], 0
+
+    async def generate(i: int):
+        nonlocal failures
+        started = time.perf_counter()
+        try:
+            await ai_service.generate_test_cases(f"Users can export reports as CSV (request {i})", "user_prompt", bypass_cache=True)
+            latencies.append(time.perf_counter() - started)
+        except Exception:
+            failures += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(generate(i) for i in range(args.requests)))
+    elapsed = time.perf_counter() - start
+    calls = sum(stub.app.state.model_requests.values()) - requests
+    return latencies, failures, stub.app.state.rate_limited - rate_limited, calls, elapsed, scheduler.stats()
+
+async def run(stub, args):
+    from app.core.config import settings
+    from app.core.database import create_tables
+    from app.core.http_client import close_http_client
+
+    create_tables()
+    settings.LLM_RETRY_BASE_SECONDS = args.retry_base
+    print(f"{args.requests} generations at once; key limit {args.limit} requests per {args.period:g}s, "
+          f"{args.error_rate:.0%} 503s, {args.latency * 1000:.0f} ms per completion")
+    print(f"{'Mode':<11} {'ok':>4} {'failed':>7} {'calls':>6} {'429s':>5} {'retries':>8} {'p50 s':>6} {'p95 s':>6} "
+          f"{'wall s':>7} {'max queue':>10} {'avg wait ms':>12} {'p95 wait ms':>12}")
+    for mode, retries, bucket in (
+        ("no retries", 0, False),
+        ("retries", args.retries, False),
+        ("scheduled", args.retries, True)
+    ):
+        latencies, failures, rate_limited, calls, elapsed, stats = await run_mode(stub, args, retries, bucket)
+        print(f"{mode:<11} {len(latencies):>4} {failures:>7} {calls:>6} {rate_limited:>5} {stats['retries']:>8} "
+              f"{percentile(latencies, 0.5):>6.2f} {percentile(latencies, 0.95):>6.2f} {elapsed:>7.2f} "
+              f"{stats['max_queue_depth']:>10} {stats['avg_wait_ms']:>12.0f} {stats['p95_wait_ms']:>12.0f}")
+    await close_http_client()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=150)
+    parser.add_argument("--limit", type=int, default=30)
+    parser.add_argument("--period", type=float, default=5.0)
+    parser.add_argument("--error-rate", type=float, default=0.05)
+    parser.add_argument("--latency", type=float, default=0.2)
+    parser.add_argument("--retries", type=int, default=8)
+    parser.add_argument("--retry-base", type=float, default=0.5)
+    parser.add_argument("--port", type=int, default=9100)
+    args = parser.parse_args()
+
+    from stub_openrouter import StubServer, create_stub_app
+
+    model = "qwen/qwen-2.5-72b-instruct:free"
+    profiles = {model: {"latency": args.latency, "error_rate": args.error_rate}}
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'scheduler.db')}"
+    os.environ["LLM_CACHE_ENABLED"] = "false"
+    os.environ["LLM_MODELS"] = model
+    with StubServer(create_stub_app(args.latency, model_profiles=profiles, rate_limit=(args.limit, args.period)), args.port) as stub:
+        os.environ["OPENROUTER_API_KEY"] = "stub-key"
+        os.environ["OPENROUTER_BASE_URL"] = stub.base_url
+        asyncio.run(run(stub, args))
+
+if __name__ == "__main__":
+    main()
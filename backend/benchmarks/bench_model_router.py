@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Benchmark: test generation through one model versus the latency-aware model router.
+
+The local OpenRouter stub serves three models:
+
+    stub/spiky    fast (`--latency`), but `--spike-rate` of requests take `--spike-latency`
+    stub/steady   always `--steady-latency`
+    stub/down     fails every request with 503
+
+Modes:
+
+    single        LLM_MODELS=stub/spiky, as with one configured model
+    routed        all three models: fastest healthy first, falling back on error or
+                  after LLM_REQUEST_TIMEOUT_SECONDS (`--timeout`); a model is re-tried
+                  after LLM_ROUTER_COOLDOWN_SECONDS (`--cooldown`) and measured afresh
+                  after LLM_ROUTER_STALE_MINUTES (`--stale-minutes`)
+    hedged        routed, plus a second model once the first passes its p95
+
+Each mode runs `--requests` generations, `--concurrency` at a time, and reports
+end-to-end latency percentiles, failed generations and calls per model.
+
+    python benchmarks/bench_model_router.py --requests 300 --concurrency 8
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+MODELS = ("stub/spiky", "stub/steady", "stub/down")
+
+def percentile(values, fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))] if ordered else 0.0
+
+async def run_mode(stub, models, hedging: bool, requests: int, concurrency: int):
+    from app.core.config import settings
+    from app.services import llm_scheduler, model_router
+    from app.services.ai_service import AIService
+
+    settings.LLM_MODELS = ",".join(models)
+    settings.LLM_HEDGING_ENABLED = hedging
+    model_router._router = None
+    # Circuit breakers opened by the previous mode would keep models out of this one
+    llm_scheduler._scheduler = None
+    ai_service = AIService()
+    stub.app.state.model_requests.clear()
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies, failures = [], 0
+
+    async def generate(i: int):
+        nonlocal failures
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                await ai_service.generate_test_cases(f"Users can reset their password (request {i})", "user_prompt", bypass_cache=True)
+                latencies.append(time.perf_counter() - started)
+            except Exception:
+                failures += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(generate(i) for i in range(requests)))
+    elapsed = time.perf_counter() - start
+    return latencies, failures, elapsed, dict(stub.app.state.model_requests), model_router.get_model_router().stats()
+
+async def run(stub, args):
+    from app.core.config import settings
+    from app.core.database import create_tables
+    from app.core.http_client import close_http_client
+
+    create_tables()
+    settings.LLM_REQUEST_TIMEOUT_SECONDS = args.timeout
+    settings.LLM_ROUTER_COOLDOWN_SECONDS = args.cooldown
+    settings.LLM_ROUTER_STALE_MINUTES = args.stale_minutes
+    print(f"{args.requests} generations, concurrency {args.concurrency}; stub/spiky {args.latency * 1000:.0f} ms "
+          f"({args.spike_rate:.0%} at {args.spike_latency * 1000:.0f} ms), stub/steady {args.steady_latency * 1000:.0f} ms, "
+          f"stub/down 503; timeout {args.timeout:g}s, cooldown {args.cooldown:g}s, stale after {args.stale_minutes:g} min")
+    print(f"{'Mode':<8} {'p50 ms':>7} {'p95 ms':>7} {'p99 ms':>7} {'mean ms':>8} {'failed':>7} {'wall s':>7} "
+          f"{'fallbacks':>10} {'hedges':>7} {'hedge wins':>11}  calls per model")
+    for mode, models, hedging in (
+        ("single", MODELS[:1], False),
+        ("routed", MODELS, False),
+        ("hedged", MODELS, True)
+    ):
+        latencies, failures, elapsed, calls, stats = await run_mode(stub, models, hedging, args.requests, args.concurrency)
+        per_model = ", ".join(f"{model.split('/')[1]}={calls.get(model, 0)}" for model in MODELS if model in models)
+        print(f"{mode:<8} {percentile(latencies, 0.5) * 1000:>7.0f} {percentile(latencies, 0.95) * 1000:>7.0f} "
+              f"{percentile(latencies, 0.99) * 1000:>7.0f} {statistics.mean(latencies or [0]) * 1000:>8.0f} {failures:>7} "
+              f"{elapsed:>7.2f} {stats['fallbacks']:>10} {stats['hedges']:>7} {stats['hedge_wins']:>11}  {per_model}")
+    await close_http_client()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=300)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--latency", type=float, default=0.1)
+    parser.add_argument("--spike-rate", type=float, default=0.04)
+    parser.add_argument("--spike-latency", type=float, default=3.0)
+    parser.add_argument("--steady-latency", type=float, default=0.3)
+    parser.add_argument("--timeout", type=float, default=2.0)
+    parser.add_argument("--cooldown", type=float, default=2.0)
+    # Stub latencies are ~1000x shorter than real completions; scale staleness to match
+    parser.add_argument("--stale-minutes", type=float, default=0.05)
+    parser.add_argument("--port", type=int, default=9100)
+    args = parser.parse_args()
+
+    from stub_openrouter import StubServer, create_stub_app
+
+    profiles = {
+        "stub/spiky": {"latency": args.latency, "spike_rate": args.spike_rate, "spike_latency": args.spike_latency},
+        "stub/steady": {"latency": args.steady_latency},
+        "stub/down": {"latency": 0.02, "status": 503}
+    }
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'router.db')}"
+    os.environ["LLM_CACHE_ENABLED"] = "false"
+    with StubServer(create_stub_app(args.latency, model_profiles=profiles), args.port) as stub:
+        os.environ["OPENROUTER_API_KEY"] = "stub-key"
+        os.environ["OPENROUTER_BASE_URL"] = stub.base_url
+        asyncio.run(run(stub, args))
+
+if __name__ == "__main__":
+    main()
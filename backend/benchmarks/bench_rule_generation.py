@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Benchmark: test-case generation throughput, rule-based vs LLM, for a Swagger spec.
+
+    rules     RuleBasedGenerator over the spec index (no network)
+    llm       chunked LLM generation against the local OpenRouter stub
+    hybrid    rules plus chunked exploratory LLM cases, as strategy=hybrid runs them
+
+The stub answers each call after `--latency` seconds with the same canned case
+(merged away as a duplicate), so compare wall time and endpoints/s; the LLM rows
+are a lower bound for a real model.
+
+    python benchmarks/bench_rule_generation.py --endpoints 500 --latency 1.0 --concurrency 4
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+async def run(content: str, chunk_size: int, concurrency: int):
+    from app.services.ai_service import AIService
+    from app.services.rule_based_generator import RuleBasedGenerator
+    from app.services.spec_index import SpecIndex
+
+    ai_service = AIService()
+    generator = RuleBasedGenerator()
+    index = SpecIndex(json.loads(content))
+    endpoints = len(index.endpoints)
+
+    async def llm(exploratory: bool):
+        return await ai_service.generate_test_cases_chunked(
+            index, bypass_cache=True, chunk_size=chunk_size, concurrency=concurrency, exploratory=exploratory
+        )
+
+    async def hybrid():
+        rules = generator.generate(index)
+        return ai_service.merge_test_cases([rules, await llm(True)])
+
+    results = {}
+    start = time.perf_counter()
+    results["rules"] = (len(generator.generate(index)), time.perf_counter() - start)
+    for name, generate in (("llm", lambda: llm(False)), ("hybrid", hybrid)):
+        start = time.perf_counter()
+        cases = await generate()
+        results[name] = (len(cases), time.perf_counter() - start)
+
+    calls = {"rules": 0, "llm": len(index.groups(chunk_size)), "hybrid": len(index.groups(chunk_size))}
+    print(f"{'Strategy':<8} {'LLM calls':>9} {'cases':>7} {'wall (s)':>9} {'cases/s':>10} {'endpoints/s':>12}")
+    for name, (cases, elapsed) in results.items():
+        print(f"{name:<8} {calls[name]:>9} {cases:>7} {elapsed:>9.3f} {cases / elapsed:>10.0f} {endpoints / elapsed:>12.0f}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--endpoints", type=int, default=500)
+    parser.add_argument("--schemas", type=int, default=50)
+    parser.add_argument("--chunk-size", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--latency", type=float, default=1.0)
+    parser.add_argument("--port", type=int, default=9100)
+    args = parser.parse_args()
+
+    from bench_spec_index import build_spec
+    from stub_openrouter import StubServer, create_stub_app
+
+    with StubServer(create_stub_app(args.latency), args.port) as stub:
+        os.environ["OPENROUTER_API_KEY"] = "stub-key"
+        os.environ["OPENROUTER_BASE_URL"] = stub.base_url
+        content = json.dumps(build_spec(args.endpoints, args.schemas, max(1, args.endpoints // 20)))
+        print(f"{args.endpoints} endpoints, LLM calls take {args.latency:.2f}s at concurrency {args.concurrency}")
+        asyncio.run(run(content, args.chunk_size, args.concurrency))
+
+if __name__ == "__main__":
+    main()
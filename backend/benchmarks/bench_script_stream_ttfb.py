@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Benchmark: time-to-first-byte of script generation, buffered vs SSE streaming.
+
+Both the backend and the OpenRouter stub run under uvicorn so bytes reach the
+client as soon as the server flushes them.
+
+    python benchmarks/bench_script_stream_ttfb.py --latency 5
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+def measure(client, url: str):
+    """Return (time to first body byte, time to first script content, total time)"""
+    start = time.perf_counter()
+    first_byte = first_content = None
+    with client.stream("POST", url) as response:
+        response.raise_for_status()
+        streaming = response.headers["content-type"].startswith("text/event-stream")
+        for chunk in response.iter_raw():
+            now = time.perf_counter() - start
+            if first_byte is None:
+                first_byte = now
+            if first_content is None and (not streaming or b"event: token" in chunk):
+                first_content = now
+    return first_byte, first_content, time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--latency", type=float, default=5.0, help="Stub generation time in seconds")
+    parser.add_argument("--stub-port", type=int, default=9100)
+    parser.add_argument("--api-port", type=int, default=9101)
+    args = parser.parse_args()
+
+    from stub_openrouter import StubServer, create_stub_app
+
+    with StubServer(create_stub_app(args.latency), args.stub_port) as stub:
+        os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'ttfb.db')}"
+        os.environ["OPENROUTER_API_KEY"] = "stub-key"
+        os.environ["OPENROUTER_BASE_URL"] = stub.base_url
+
+        import httpx
+        from main import app
+        from app.core.database import create_tables
+
+        create_tables()
+        with StubServer(app, args.api_port):
+            with httpx.Client(base_url=f"http://127.0.0.1:{args.api_port}", timeout=None) as client:
+                source_id = client.post("/api/input-sources/user-prompt", json={
+                    "name": "TTFB source",
+                    "source_type": "user_prompt",
+                    "content": "Users can reset their password"
+                }).json()["id"]
+                client.post(f"/api/test-generation/generate/{source_id}")
+
+                query = "script_type=playwright_python&bypass_cache=true"
+                buffered = measure(client, f"/api/script-output/generate/{source_id}?{query}")
+                streamed = measure(client, f"/api/script-output/generate/{source_id}/stream?{query}")
+
+    print(f"{'Mode':<10} {'TTFB (s)':>10} {'First token (s)':>16} {'Total (s)':>10}")
+    for mode, (ttfb, first_token, total) in (("buffered", buffered), ("streaming", streamed)):
+        print(f"{mode:<10} {ttfb:>10.3f} {first_token:>16.3f} {total:>10.3f}")
+    print(f"Time-to-first-token improvement: {buffered[1] / streamed[1]:.1f}x")
+
+if __name__ == "__main__":
+    main()
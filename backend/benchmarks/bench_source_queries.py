@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Benchmark: hot per-input-source queries before and after the composite index migration.
+
+Seeds a SQLite database at the baseline revision (primary-key indexes only),
+times the queries the routers issue, upgrades to head and times them again.
+
+    python benchmarks/bench_source_queries.py --test-cases 1000000 --sources 1000
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+def seed(engine, test_cases: int, sources: int, runs_per_source: int, scripts_per_source: int):
+    """Bulk-load rows with executemany; going through the ORM would dominate the benchmark"""
+    base = datetime(2025, 1, 1)
+    per_source = test_cases // sources
+    statuses = ["PENDING", "PASSED", "FAILED", "RUNNING"]
+    connection = engine.raw_connection()
+    try:
+        cursor = connection.cursor()
+        cursor.executemany(
+            "INSERT INTO input_sources (id, name, source_type, content, created_at) VALUES (?, ?, 'USER_PROMPT', ?, ?)",
+            ((i, f"Source {i}", "Users can log in", base) for i in range(1, sources + 1))
+        )
+        # Cases of a source arrive together (one generation run), interleaved with other sources over time
+        cursor.executemany(
+            "INSERT INTO test_cases (title, steps, expected_result, status, input_source_id, created_at, is_automated)"
+            " VALUES (?, ?, ?, ?, ?, ?, 0)",
+            (
+                (f"Case {i}", "1. Open the page\n2. Submit the form", "Form is accepted",
+                 statuses[i % len(statuses)], i % sources + 1, base + timedelta(seconds=i))
+                for i in range(per_source * sources)
+            )
+        )
+        cursor.executemany(
+            "INSERT INTO test_runs (name, status, total_tests, passed_tests, failed_tests, input_source_id, started_at)"
+            " VALUES (?, 'COMPLETED', ?, ?, 0, ?, ?)",
+            (
+                (f"Run {i}", per_source, per_source, i % sources + 1, base + timedelta(minutes=i))
+                for i in range(runs_per_source * sources)
+            )
+        )
+        cursor.executemany(
+            "INSERT INTO scripts (name, script_type, content, input_source_id, created_at)"
+            " VALUES (?, 'PLAYWRIGHT_PYTHON', 'print(1)', ?, ?)",
+            ((f"Script {i}", i % sources + 1, base + timedelta(hours=i)) for i in range(scripts_per_source * sources))
+        )
+        connection.commit()
+        cursor.execute("ANALYZE")
+    finally:
+        connection.close()
+
+def queries():
+    from sqlalchemy import func, select
+    from app.models.script import Script
+    from app.models.test_case import TestCase
+    from app.models.test_run import TestRun
+
+    # Baseline columns only: the "before" timings run ahead of the revisions adding the rest
+    return {
+        "test cases by source": lambda source_id: select(
+            TestCase.id, TestCase.title, TestCase.status, TestCase.created_at).where(
+            TestCase.input_source_id == source_id).order_by(TestCase.created_at),
+        "status counts by source": lambda source_id: select(TestCase.status, func.count()).where(
+            TestCase.input_source_id == source_id).group_by(TestCase.status),
+        "test runs by source": lambda source_id: select(
+            TestRun.id, TestRun.name, TestRun.status, TestRun.started_at).where(
+            TestRun.input_source_id == source_id).order_by(TestRun.started_at),
+        "scripts by source": lambda source_id: select(
+            Script.id, Script.name, Script.created_at).where(Script.input_source_id == source_id)
+    }
+
+def time_queries(engine, source_ids):
+    timings = {}
+    with engine.connect() as connection:
+        for name, build in queries().items():
+            samples = []
+            for source_id in source_ids:
+                start = time.perf_counter()
+                connection.execute(build(source_id)).fetchall()
+                samples.append(time.perf_counter() - start)
+            timings[name] = statistics.median(samples) * 1000
+    return timings
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--test-cases", type=int, default=1_000_000)
+    parser.add_argument("--sources", type=int, default=1000)
+    parser.add_argument("--runs-per-source", type=int, default=20)
+    parser.add_argument("--scripts-per-source", type=int, default=2)
+    parser.add_argument("--samples", type=int, default=25, help="Sources queried per measurement")
+    args = parser.parse_args()
+
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'queries.db')}"
+
+    from alembic import command
+    from alembic.config import Config
+    from app.core.database import BASELINE_REVISION, MIGRATIONS_DIR, engine
+    from app.core.config import settings
+
+    config = Config()
+    config.set_main_option("script_location", MIGRATIONS_DIR)
+    config.set_main_option("sqlalchemy.url", settings.DATABASE_URL)
+
+    command.upgrade(config, BASELINE_REVISION)
+    start = time.perf_counter()
+    seed(engine, args.test_cases, args.sources, args.runs_per_source, args.scripts_per_source)
+    print(f"Seeded {args.test_cases} test cases over {args.sources} sources in {time.perf_counter() - start:.1f}s")
+
+    source_ids = random.Random(0).sample(range(1, args.sources + 1), min(args.samples, args.sources))
+    before = time_queries(engine, source_ids)
+    start = time.perf_counter()
+    command.upgrade(config, "head")
+    print(f"Migration to head took {time.perf_counter() - start:.1f}s")
+    with engine.begin() as connection:
+        connection.exec_driver_sql("ANALYZE")
+    after = time_queries(engine, source_ids)
+
+    print(f"{'Query':<26} {'baseline (ms)':>14} {'indexed (ms)':>13} {'speedup':>8}")
+    for name in before:
+        print(f"{name:<26} {before[name]:>14.2f} {after[name]:>13.2f} {before[name] / after[name]:>7.0f}x")
+
+if __name__ == "__main__":
+    main()
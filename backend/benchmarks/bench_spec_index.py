@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Benchmark: cost of the Swagger endpoint index against re-walking the raw spec.
+
+    build       json.loads + SpecIndex for a new spec (a cache miss)
+    memo hit    get_spec_index on content already indexed (hashing the text)
+    rewalk      the pre-index path per generation request: json.loads, walk paths, group
+    lookups     find() by tag / method / path prefix vs a linear scan of the endpoint list
+
+Schemas reference each other through $ref (including one recursive schema), so
+the index also reports how much resolving references grows the prompt payload.
+
+    python benchmarks/bench_spec_index.py --endpoints 5000 --schemas 200
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+def build_spec(endpoint_count: int, schema_count: int, tags: int) -> dict:
+    schemas = {
+        f"Model{i}": {
+            "type": "object",
+            "properties": {
+                "id": {"type": "integer"},
+                "name": {"type": "string", "description": "Display name"},
+                "related": {"$ref": f"#/components/schemas/Model{(i + 1) % schema_count}"} if i % 10 else {"type": "string"}
+            }
+        }
+        for i in range(schema_count)
+    }
+    schemas["Tree"] = {"type": "object", "properties": {"children": {"type": "array", "items": {"$ref": "#/components/schemas/Tree"}}}}
+    paths = {}
+    for i in range(endpoint_count // 2):
+        tag = f"resource{i % tags}"
+        model = {"$ref": f"#/components/schemas/Model{i % schema_count}"}
+        paths[f"/{tag}/items{i}/{{id}}"] = {
+            "parameters": [{"$ref": "#/components/parameters/Id"}],
+            "get": {
+                "tags": [tag],
+                "summary": f"Get item {i}",
+                "responses": {"200": {"description": "OK", "content": {"application/json": {"schema": model}}}}
+            },
+            "put": {
+                "tags": [tag],
+                "summary": f"Update item {i}",
+                "requestBody": {"content": {"application/json": {"schema": model}}},
+                "responses": {"200": {"description": "OK"}, "404": {"description": "Not found"}}
+            }
+        }
+    return {
+        "openapi": "3.0.0",
+        "info": {"title": "Benchmark API", "version": "1.0"},
+        "components": {
+            "schemas": schemas,
+            "parameters": {"Id": {"name": "id", "in": "path", "required": True, "schema": {"type": "integer"}}}
+        },
+        "paths": paths
+    }
+
+def legacy_endpoints(swagger_data: dict) -> list:
+    """The pre-index SwaggerService.extract_endpoints: a fresh walk, $refs left in place"""
+    endpoints = []
+    for path, methods in swagger_data.get('paths', {}).items():
+        for method, details in methods.items():
+            if method.upper() in ['GET', 'POST', 'PUT', 'DELETE', 'PATCH']:
+                endpoints.append({
+                    'path': path,
+                    'method': method.upper(),
+                    'summary': details.get('summary', ''),
+                    'description': details.get('description', ''),
+                    'parameters': details.get('parameters', []),
+                    'responses': details.get('responses', {}),
+                    'tags': details.get('tags', []),
+                    'request_body': details.get('requestBody')
+                })
+    return endpoints
+
+def timed(function, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--endpoints", type=int, default=5000)
+    parser.add_argument("--schemas", type=int, default=200)
+    parser.add_argument("--tags", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    from app.services.spec_index import SpecIndex, SpecIndexCache, group_endpoints
+
+    content = json.dumps(build_spec(args.endpoints, args.schemas, args.tags))
+    cache = SpecIndexCache(max_entries=4)
+    index = cache.get(content)
+    legacy = legacy_endpoints(json.loads(content))
+    print(f"Spec: {len(content) / 1024 / 1024:.1f} MB, {len(index.endpoints)} endpoints, {args.schemas} schemas")
+
+    tracemalloc.start()
+    SpecIndex(json.loads(content))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    rows = [
+        ("build (miss)", timed(lambda: SpecIndex(json.loads(content)), max(3, args.repeat // 4))),
+        ("memo hit", timed(lambda: cache.get(content), args.repeat)),
+        ("rewalk per request", timed(lambda: group_endpoints(legacy_endpoints(json.loads(content)), 20), max(3, args.repeat // 4))),
+        ("groups (memoized)", timed(lambda: index.groups(20), args.repeat)),
+        ("find tag", timed(lambda: index.find(tag="resource7"), args.repeat)),
+        ("scan tag", timed(lambda: [e for e in legacy if "resource7" in e['tags']], args.repeat)),
+        ("find method", timed(lambda: index.find(method="PUT"), args.repeat)),
+        ("scan method", timed(lambda: [e for e in legacy if e['method'] == "PUT"], args.repeat)),
+        ("find path prefix", timed(lambda: index.find(path_prefix="/resource7/items7"), args.repeat)),
+        ("scan path prefix", timed(lambda: [e for e in legacy if e['path'].startswith("/resource7/items7")], args.repeat))
+    ]
+    print(f"{'Operation':<20} {'median (ms)':>12}")
+    for name, milliseconds in rows:
+        print(f"{name:<20} {milliseconds:>12.3f}")
+
+    resolved = len(json.dumps(index.groups(20)[next(iter(index.groups(20)))]))
+    unresolved = len(json.dumps(group_endpoints(legacy, 20)[next(iter(index.groups(20)))]))
+    print(f"Peak memory while building: {peak / 1024 / 1024:.1f} MB")
+    print(f"First prompt group payload: {unresolved} bytes with $refs, {resolved} bytes resolved")
+
+if __name__ == "__main__":
+    main()
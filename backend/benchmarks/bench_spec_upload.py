@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Benchmark: server peak RSS while uploading a large Swagger spec, buffered vs streaming.
+
+    baseline    the pre-streaming handler (UploadFile, file.read(), json.loads, decoded copies)
+    streaming   POST /api/input-sources/swagger (chunks to disk, one streaming validation pass)
+    oversize    streaming with MAX_FILE_SIZE below the spec size; time until the 413
+
+Every run gets a fresh uvicorn process so its peak RSS (VmHWM, Linux only) covers
+that upload alone. SQLite mmap and the large page cache are disabled so RSS reflects
+the request path rather than memory SQLite would reuse across requests.
+
+    python benchmarks/bench_spec_upload.py --size-mb 50
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+def write_spec(path: str, size_mb: int) -> int:
+    """Write an OpenAPI document of roughly `size_mb` megabytes without holding it in memory"""
+    target = size_mb * 1024 * 1024
+    with open(path, "w") as f:
+        f.write('{"openapi": "3.0.0", "info": {"title": "Bench", "version": "1"}, "paths": {')
+        index = 0
+        while f.tell() < target:
+            operation = {
+                "summary": f"Operation {index}",
+                "description": "Returns the resource. " * 20,
+                "parameters": [{"name": "id", "in": "path", "required": True, "schema": {"type": "integer"}}],
+                "responses": {"200": {"description": "OK"}, "404": {"description": "Not found"}}
+            }
+            prefix = "," if index else ""
+            f.write(f'{prefix}"/resources{index}/{{id}}": {json.dumps({"get": operation, "delete": operation})}')
+            index += 1
+        f.write("}}")
+        return f.tell()
+
+def memory_kb(pid: int, field: str) -> int:
+    with open(f"/proc/{pid}/status") as f:
+        for line in f:
+            if line.startswith(field + ":"):
+                return int(line.split()[1])
+    raise RuntimeError(f"{field} not found")
+
+def serve(port: int):
+    from fastapi import Depends, File, Form, HTTPException, UploadFile
+    from sqlalchemy.ext.asyncio import AsyncSession
+    import uvicorn
+    from main import app
+    from app.core.config import settings
+    from app.core.database import create_tables, get_async_db
+    from app.models.input_source import InputSource, InputSourceType
+    from app.routers.input_sources import swagger_service
+    from app.schemas.input_source import InputSourceResponse
+
+    create_tables()
+
+    @app.post("/baseline/swagger", response_model=InputSourceResponse)
+    async def baseline_swagger(file: UploadFile = File(...), name: str = Form(...), db: AsyncSession = Depends(get_async_db)):
+        content = await file.read()
+        swagger_data = json.loads(content.decode())
+        if not swagger_service.validate_swagger(swagger_data):
+            raise HTTPException(status_code=400, detail="Invalid Swagger/OpenAPI specification")
+        file_path = os.path.join(settings.UPLOAD_DIR, file.filename)
+        with open(file_path, "wb") as f:
+            f.write(content)
+        input_source = InputSource(
+            name=name, source_type=InputSourceType.SWAGGER, content=content.decode(), file_path=file_path
+        )
+        db.add(input_source)
+        await db.commit()
+        await db.refresh(input_source)
+        return input_source
+
+    uvicorn.run(app, host="127.0.0.1", port=port, log_level="warning")
+
+def run(mode: str, spec_path: str, port: int, max_file_size: int) -> dict:
+    import httpx
+
+    workdir = tempfile.mkdtemp()
+    env = dict(
+        os.environ,
+        DATABASE_URL=f"sqlite:///{os.path.join(workdir, 'upload.db')}",
+        UPLOAD_DIR=os.path.join(workdir, "uploads"),
+        MAX_FILE_SIZE=str(max_file_size),
+        SQLITE_MMAP_SIZE="0",
+        SQLITE_CACHE_SIZE_KB="2000",
+        JOB_QUEUE_PERSISTENT="false"
+    )
+    server = subprocess.Popen([sys.executable, os.path.abspath(__file__), "--serve", "--port", str(port)], env=env)
+    try:
+        base_url = f"http://127.0.0.1:{port}"
+        for _ in range(200):
+            try:
+                httpx.get(f"{base_url}/health")
+                break
+            except httpx.TransportError:
+                time.sleep(0.1)
+        idle = memory_kb(server.pid, "VmRSS")
+        path = "/baseline/swagger" if mode == "baseline" else "/api/input-sources/swagger"
+        start = time.perf_counter()
+        with open(spec_path, "rb") as spec:
+            response = httpx.post(
+                base_url + path,
+                files={"file": ("spec.json", spec, "application/json")},
+                data={"name": "Bench"},
+                timeout=None
+            )
+        elapsed = time.perf_counter() - start
+        return {
+            "status": response.status_code,
+            "seconds": elapsed,
+            "idle_mb": idle / 1024,
+            "peak_mb": memory_kb(server.pid, "VmHWM") / 1024
+        }
+    finally:
+        server.terminate()
+        server.wait()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size-mb", type=int, default=50)
+    parser.add_argument("--port", type=int, default=9103)
+    parser.add_argument("--serve", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(args.port)
+        return
+
+    spec_path = os.path.join(tempfile.mkdtemp(), "spec.json")
+    size = write_spec(spec_path, args.size_mb)
+    print(f"Spec: {size / 1024 / 1024:.1f} MB")
+
+    results = {
+        "baseline": run("baseline", spec_path, args.port, size * 2),
+        "streaming": run("streaming", spec_path, args.port, size * 2),
+        "oversize": run("streaming", spec_path, args.port, size // 5)
+    }
+    print(f"{'Mode':<10} {'status':>6} {'seconds':>8} {'idle RSS (MB)':>14} {'peak RSS (MB)':>14} {'growth (MB)':>12}")
+    for mode, result in results.items():
+        print(
+            f"{mode:<10} {result['status']:>6} {result['seconds']:>8.2f} {result['idle_mb']:>14.1f}"
+            f" {result['peak_mb']:>14.1f} {result['peak_mb'] - result['idle_mb']:>12.1f}"
+        )
+
+if __name__ == "__main__":
+    main()
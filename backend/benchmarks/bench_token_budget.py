@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Benchmark: oversized prompts with and without per-model token budgets.
+
+    unbudgeted   AIService with an unlimited prompt budget, so one prompt carries
+                 everything, as before budgets existed
+    budgeted     prompts are sized to the model's window (`--context-tokens`) less
+                 the completion reserve: scripts split their test cases, text input
+                 is split at blank lines
+
+Runs a script generation over `--test-cases` cases and a test generation over a
+text input of `--paragraphs` paragraphs against the local OpenRouter stub, which
+rejects prompts over `--context-tokens` like a real model. Prints the usage the
+accounting table recorded, as GET /api/test-generation/llm-usage reports it.
+
+    python benchmarks/bench_token_budget.py --test-cases 1500 --paragraphs 1000 --context-tokens 32768
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+def build_test_cases(count: int):
+    return [
+        {
+            "title": f"Checkout with saved card {i}",
+            "description": f"Customer {i} pays for a basket with a saved card and a discount code",
+            "steps": "1. Log in\n2. Add two products to the cart\n3. Apply code SPRING10\n4. Pay with the saved card",
+            "expected_result": "Order is confirmed and the discount is shown on the receipt"
+        }
+        for i in range(count)
+    ]
+
+def build_text(paragraphs: int) -> str:
+    return "\n\n".join(
+        f"Requirement {i}: when a customer with role {('guest', 'member', 'admin')[i % 3]} updates item {i}, "
+        f"the change is validated, audited and visible to other sessions within two seconds."
+        for i in range(paragraphs)
+    )
+
+async def run(stub, test_cases, text, context_tokens: int):
+    from app.core.config import settings
+    from app.core.database import AsyncSessionLocal, create_tables
+    from app.core.http_client import close_http_client
+    from app.services import llm_usage
+    from app.services.ai_service import AIService
+    from app.services.token_budget import estimate_tokens
+
+    class UnbudgetedAIService(AIService):
+        prompt_budget = 10 ** 9
+
+    create_tables()
+    settings.LLM_CONTEXT_WINDOWS = f"{AIService().model}={context_tokens}"
+    rows = []
+    for mode, ai_service in (("unbudgeted", UnbudgetedAIService()), ("budgeted", AIService())):
+        for job, generate in (
+            ("script", lambda: ai_service.generate_automation_script(test_cases, "playwright_python", bypass_cache=True)),
+            ("test cases", lambda: ai_service.generate_test_cases(text, "user_prompt", bypass_cache=True))
+        ):
+            requests, rejected, stub.app.state.max_prompt_chars = stub.app.state.requests, stub.app.state.rejected, 0
+            start = time.perf_counter()
+            try:
+                await generate()
+                outcome = "ok"
+            except Exception:
+                outcome = "rejected (context length)"
+            rows.append((
+                mode, job, stub.app.state.requests - requests + stub.app.state.rejected - rejected,
+                stub.app.state.max_prompt_chars // 4, time.perf_counter() - start, outcome
+            ))
+    await close_http_client()
+
+    print(f"{len(test_cases)} test cases (~{estimate_tokens(str(test_cases)):,} tokens), "
+          f"{text.count(chr(10) * 2) + 1} paragraphs (~{estimate_tokens(text):,} tokens), model window {context_tokens:,}")
+    print(f"{'Mode':<11} {'Job':<11} {'calls':>6} {'largest prompt':>15} {'wall (s)':>9}  outcome")
+    for mode, job, calls, largest, elapsed, outcome in rows:
+        print(f"{mode:<11} {job:<11} {calls:>6} {largest:>15,} {elapsed:>9.2f}  {outcome}")
+
+    async with AsyncSessionLocal() as db:
+        usage = await llm_usage.summary(db, group_by="operation")
+    print("\nRecorded usage (GET /api/test-generation/llm-usage?group_by=operation):")
+    print(f"{'operation':<11} {'requests':>9} {'errors':>7} {'prompt tok':>11} {'completion tok':>15} {'avg ms':>7}")
+    for group in usage["groups"] + [{**usage["totals"], "key": "total"}]:
+        print(f"{group['key']:<11} {group['requests']:>9} {group['errors']:>7} {group['prompt_tokens']:>11,} "
+              f"{group['completion_tokens']:>15,} {group['avg_latency_ms'] or 0:>7.0f}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--test-cases", type=int, default=1500)
+    parser.add_argument("--paragraphs", type=int, default=1000)
+    parser.add_argument("--context-tokens", type=int, default=32768)
+    parser.add_argument("--latency", type=float, default=0.2)
+    parser.add_argument("--port", type=int, default=9100)
+    args = parser.parse_args()
+
+    from stub_openrouter import StubServer, create_stub_app
+
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'budget.db')}"
+    os.environ["LLM_CACHE_ENABLED"] = "false"
+    with StubServer(create_stub_app(args.latency, args.context_tokens), args.port) as stub:
+        os.environ["OPENROUTER_API_KEY"] = "stub-key"
+        os.environ["OPENROUTER_BASE_URL"] = stub.base_url
+        asyncio.run(run(stub, build_test_cases(args.test_cases), build_text(args.paragraphs), args.context_tokens))
+
+if __name__ == "__main__":
+    main()
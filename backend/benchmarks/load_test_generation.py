@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Load test: N concurrent /api/test-generation/generate/{id} calls against a stub
+OpenRouter server. With the non-blocking client the calls overlap, so wall time
+stays close to one round trip instead of N round trips.
+
+    python benchmarks/load_test_generation.py --concurrency 20 --latency 1.0
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+def configure_environment(stub_base_url: str):
+    """Point the backend at the stub and a throwaway database before importing it"""
+    db_path = os.path.join(tempfile.mkdtemp(), "load_test.db")
+    os.environ["DATABASE_URL"] = f"sqlite:///{db_path}"
+    os.environ["OPENROUTER_API_KEY"] = "stub-key"
+    os.environ["OPENROUTER_BASE_URL"] = stub_base_url
+
+async def run_load_test(concurrency: int, latency: float) -> float:
+    import httpx
+    from main import app
+    from app.core.database import create_tables
+
+    create_tables()
+    async with httpx.AsyncClient(app=app, base_url="http://test", timeout=None) as client:
+        response = await client.post("/api/input-sources/user-prompt", json={
+            "name": "Load test source",
+            "source_type": "user_prompt",
+            "content": "Users can log in with email and password"
+        })
+        input_source_id = response.json()["id"]
+
+        start = time.perf_counter()
+        responses = await asyncio.gather(*[
+            client.post(f"/api/test-generation/generate/{input_source_id}?bypass_cache=true")
+            for _ in range(concurrency)
+        ])
+        elapsed = time.perf_counter() - start
+
+    failures = [r for r in responses if r.status_code != 200]
+    print(f"Requests:        {concurrency} ({len(failures)} failed)")
+    print(f"Stub latency:    {latency:.2f}s per call")
+    print(f"Wall time:       {elapsed:.2f}s")
+    print(f"Serialized time: {concurrency * latency:.2f}s (if calls blocked the event loop)")
+    print(f"Overlap factor:  {concurrency * latency / elapsed:.1f}x")
+    return elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=1.0)
+    parser.add_argument("--port", type=int, default=9100)
+    args = parser.parse_args()
+
+    from stub_openrouter import StubServer, create_stub_app
+
+    stub_app = create_stub_app(args.latency)
+    with StubServer(stub_app, args.port) as stub:
+        configure_environment(stub.base_url)
+        elapsed = asyncio.run(run_load_test(args.concurrency, args.latency))
+        print(f"Max in-flight at stub: {stub_app.state.max_in_flight}")
+
+    if elapsed > args.concurrency * args.latency * 0.5:
+        print("❌ Calls appear to serialize")
+        sys.exit(1)
+    print("✅ Calls overlap")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Local stub of the Jira Cloud REST API (issue and search endpoints) for benchmarks.
+
+Serves `--issues` generated stories in project STUB. `/rest/api/3/search` honours
+startAt, maxResults (capped at 100 like Jira Cloud) and `fields`, and ignores the
+JQL apart from `key in (...)`, `updated >= "..."` and `updated >= -Nm` clauses.
+Every response waits `--latency` seconds.
+
+Run standalone:
+    python benchmarks/stub_jira.py --port 9200 --issues 500 --latency 0.05
+and point the backend at it with JIRA_SERVER_URL=http://127.0.0.1:9200 (any username/token)
+"""
+
+import argparse
+import asyncio
+import re
+from datetime import datetime, timedelta
+
+import uvicorn
+from fastapi import FastAPI, HTTPException, Request
+
+MAX_RESULTS_CAP = 100
+UPDATED_SINCE = re.compile(r'updated\s*>=\s*"([^"]+)"')
+UPDATED_WITHIN = re.compile(r'updated\s*>=\s*-(\d+)m\b')
+KEY_IN = re.compile(r'key\s+in\s*\(([^)]*)\)', re.I)
+UPDATED_FORMAT = "%Y-%m-%dT%H:%M:%S.000+0000"
+
+def make_issue(number: int, updated: datetime) -> dict:
+    """A story with the fields a real issue carries, including a large changelog-like comment field"""
+    return {
+        "id": str(10000 + number),
+        "key": f"STUB-{number}",
+        "fields": {
+            "summary": f"User can manage widget {number}",
+            "description": {
+                "type": "doc",
+                "version": 1,
+                "content": [
+                    {"type": "paragraph", "content": [{"type": "text", "text": f"As a user I want to manage widget {number}."}]},
+                    {"type": "heading", "attrs": {"level": 3}, "content": [{"type": "text", "text": "Acceptance criteria"}]},
+                    {"type": "bulletList", "content": [
+                        {"type": "listItem", "content": [{"type": "paragraph", "content": [{"type": "text", "text": f"Widget {number} can be created"}]}]},
+                        {"type": "listItem", "content": [{"type": "paragraph", "content": [{"type": "text", "text": f"Widget {number} can be deleted"}]}]}
+                    ]}
+                ]
+            },
+            "issuetype": {"name": "Story"},
+            "status": {"name": "To Do"},
+            "priority": {"name": "Medium"},
+            "assignee": None if number % 3 else {"displayName": "Stub Assignee"},
+            "reporter": {"displayName": "Stub Reporter"},
+            "created": "2025-01-01T00:00:00.000+0000",
+            "updated": updated.strftime(UPDATED_FORMAT),
+            "comment": {"comments": [{"body": "x" * 200} for _ in range(20)]}
+        }
+    }
+
+def _project(issue: dict, fields: str) -> dict:
+    if not fields or fields in ("*all", "*navigable"):
+        return issue
+    wanted = set(fields.split(","))
+    return {**issue, "fields": {name: value for name, value in issue["fields"].items() if name in wanted}}
+
+def touch(issue: dict, summary: str = None) -> dict:
+    """Simulate an edit in Jira: bump `updated` to now (UTC), optionally changing the summary"""
+    issue["fields"]["updated"] = datetime.utcnow().strftime(UPDATED_FORMAT)
+    if summary is not None:
+        issue["fields"]["summary"] = summary
+    return issue
+
+def create_stub_app(issue_count: int = 500, latency: float = 0.05) -> FastAPI:
+    """Build a stub Jira app; `app.state.issues` can be edited to simulate updates"""
+    app = FastAPI()
+    app.state.latency = latency
+    app.state.requests = 0
+    app.state.bytes_sent = 0
+    base = datetime(2025, 1, 1)
+    app.state.issues = {
+        f"STUB-{number}": make_issue(number, base + timedelta(minutes=number))
+        for number in range(1, issue_count + 1)
+    }
+
+    def count(payload: dict) -> dict:
+        app.state.requests += 1
+        app.state.bytes_sent += len(str(payload))
+        return payload
+
+    @app.get("/rest/api/3/issue/{issue_key}")
+    async def get_issue(issue_key: str, fields: str = ""):
+        await asyncio.sleep(app.state.latency)
+        issue = app.state.issues.get(issue_key)
+        if issue is None:
+            raise HTTPException(status_code=404, detail="Issue does not exist")
+        return count(_project(issue, fields))
+
+    @app.get("/rest/api/3/search")
+    async def search(request: Request, jql: str = "", startAt: int = 0, maxResults: int = 50, fields: str = ""):
+        await asyncio.sleep(app.state.latency)
+        issues = list(app.state.issues.values())
+        keys = KEY_IN.search(jql)
+        if keys:
+            wanted = {key.strip().strip('"') for key in keys.group(1).split(",")}
+            issues = [issue for issue in issues if issue["key"] in wanted]
+        within = UPDATED_WITHIN.search(jql)
+        if within:
+            threshold = (datetime.utcnow() - timedelta(minutes=int(within.group(1)))).strftime(UPDATED_FORMAT)
+            issues = [issue for issue in issues if issue["fields"]["updated"] >= threshold]
+        since = UPDATED_SINCE.search(jql)
+        if since:
+            threshold = since.group(1).replace("/", "-")
+            issues = [issue for issue in issues if issue["fields"]["updated"][:16].replace("T", " ") >= threshold]
+        page_size = min(maxResults, MAX_RESULTS_CAP)
+        return count({
+            "startAt": startAt,
+            "maxResults": page_size,
+            "total": len(issues),
+            "issues": [_project(issue, fields) for issue in issues[startAt:startAt + page_size]]
+        })
+
+    return app
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local Jira stub")
+    parser.add_argument("--port", type=int, default=9200)
+    parser.add_argument("--issues", type=int, default=500)
+    parser.add_argument("--latency", type=float, default=0.05)
+    args = parser.parse_args()
+    uvicorn.run(create_stub_app(args.issues, args.latency), host="127.0.0.1", port=args.port)
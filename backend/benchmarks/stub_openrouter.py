@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Local stub of the OpenRouter chat completions API for load tests and benchmarks.
+
+Responses report `usage` (prompt tokens estimated at 4 characters each). With
+`--context-tokens`, prompts longer than that are rejected with 400 like a real
+model's context limit. `model_profiles` gives individual models their own
+latency, occasional latency spikes, a failing status code or a random `error_rate`
+of 503s, for routing tests. `rate_limit=(requests, seconds)` answers requests over
+that limit with 429 and a Retry-After, like a rate-limited key.
+
+Run standalone:
+    python benchmarks/stub_openrouter.py --port 9100 --latency 1.0
+and point the backend at it with OPENROUTER_BASE_URL=http://127.0.0.1:9100/api/v1
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import random
+import re
+import threading
+import time
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from starlette.requests import ClientDisconnect
+from collections import Counter, deque
+from typing import Any, Dict, Optional, Tuple
+
+SAMPLE_TEST_CASES = [
+    {
+        "title": "Stub happy path",
+        "description": "Returned by the local OpenRouter stub",
+        "steps": "1. Send request\n2. Verify response",
+        "expected_result": "Request succeeds"
+    }
+]
+
+STREAM_CHUNKS = 50
+CHARS_PER_TOKEN = 4
+
+# Section-scoped prompts list the sections each case must name
+SECTION_LIST = re.compile(r'exactly as one of: (\[.*?\])\s*$', re.M)
+
+def _test_cases_for(prompt: str):
+    """One case per listed section, so regeneration can attribute them; the canned case otherwise"""
+    match = SECTION_LIST.search(prompt)
+    if not match:
+        return SAMPLE_TEST_CASES
+    return [
+        {**SAMPLE_TEST_CASES[0], "title": f"Stub case for {key}", "section": key}
+        for key in json.loads(match.group(1))
+    ]
+
+def _sse_chunks(latency: float, prompt_tokens: int = 0):
+    """Spread STREAM_CHUNKS content deltas evenly over `latency` seconds, like a real model"""
+    async def stream():
+        yield ": OPENROUTER PROCESSING\n\n"
+        for i in range(STREAM_CHUNKS):
+            await asyncio.sleep(latency / STREAM_CHUNKS)
+            chunk = {"choices": [{"delta": {"content": f"# line {i}\n"}}]}
+            yield f"data: {json.dumps(chunk)}\n\n"
+        usage = {"prompt_tokens": prompt_tokens, "completion_tokens": STREAM_CHUNKS * 3}
+        yield f"data: {json.dumps({'choices': [], 'usage': usage})}\n\n"
+        yield "data: [DONE]\n\n"
+    return stream()
+
+def _profile_latency(profile: Dict[str, Any], default: float) -> float:
+    """`latency`, or `spike_latency` with probability `spike_rate`"""
+    if profile.get("spike_rate") and random.random() < profile["spike_rate"]:
+        return profile["spike_latency"]
+    return profile.get("latency", default)
+
+def create_stub_app(
+    latency: float = 1.0,
+    context_tokens: Optional[int] = None,
+    model_profiles: Optional[Dict[str, Dict[str, Any]]] = None,
+    rate_limit: Optional[Tuple[int, float]] = None
+) -> FastAPI:
+    """Build a stub app that answers every completion after `latency` seconds.
+
+    A model in `model_profiles` answers after its own `latency` (or `spike_latency`
+    for a `spike_rate` fraction of requests), and with `status` set fails with that
+    status code instead (or 503 for an `error_rate` fraction of requests).
+    """
+    app = FastAPI()
+    app.state.latency = latency
+    app.state.model_profiles = model_profiles or {}
+    app.state.model_requests = Counter()
+    app.state.rate_limit = rate_limit
+    app.state.accepted_at = deque()
+    app.state.rate_limited = 0
+    app.state.context_tokens = context_tokens
+    app.state.rejected = 0
+    app.state.max_prompt_chars = 0
+    app.state.in_flight = 0
+    app.state.max_in_flight = 0
+    app.state.requests = 0
+    app.state.prompt_chars = 0
+
+    @app.post("/api/v1/chat/completions")
+    async def chat_completions(request: Request):
+        try:
+            body = await request.json()
+        except ClientDisconnect:
+            # A hedged or timed-out request the client has already given up on
+            return Response(status_code=499)
+        prompt = "".join(message.get("content", "") for message in body.get("messages", []))
+        prompt_tokens = len(prompt) // CHARS_PER_TOKEN
+        app.state.max_prompt_chars = max(app.state.max_prompt_chars, len(prompt))
+        if app.state.context_tokens and prompt_tokens + (body.get("max_tokens") or 0) > app.state.context_tokens:
+            app.state.rejected += 1
+            return JSONResponse(status_code=400, content={"error": {
+                "code": 400,
+                "message": f"This endpoint's maximum context length is {app.state.context_tokens} tokens. "
+                           f"However, you requested about {prompt_tokens + (body.get('max_tokens') or 0)} tokens."
+            }})
+        app.state.model_requests[body.get("model")] += 1
+        if app.state.rate_limit:
+            limit, period = app.state.rate_limit
+            now = time.monotonic()
+            while app.state.accepted_at and now - app.state.accepted_at[0] >= period:
+                app.state.accepted_at.popleft()
+            if len(app.state.accepted_at) >= limit:
+                app.state.rate_limited += 1
+                retry_after = math.ceil(app.state.accepted_at[0] + period - now)
+                return JSONResponse(status_code=429, headers={"Retry-After": str(retry_after)}, content={"error": {
+                    "code": 429, "message": "Rate limit exceeded"
+                }})
+            app.state.accepted_at.append(now)
+        profile = app.state.model_profiles.get(body.get("model"), {})
+        delay = _profile_latency(profile, app.state.latency)
+        status = profile.get("status") or (503 if random.random() < profile.get("error_rate", 0) else None)
+        if status:
+            await asyncio.sleep(delay)
+            return JSONResponse(status_code=status, content={"error": {
+                "code": status, "message": f"Stub failure for {body.get('model')}"
+            }})
+        if body.get("stream"):
+            return StreamingResponse(_sse_chunks(delay, prompt_tokens), media_type="text/event-stream")
+        app.state.requests += 1
+        app.state.prompt_chars += len(prompt)
+        app.state.in_flight += 1
+        app.state.max_in_flight = max(app.state.max_in_flight, app.state.in_flight)
+        try:
+            await asyncio.sleep(delay)
+        finally:
+            app.state.in_flight -= 1
+        content = json.dumps(_test_cases_for(prompt))
+        return {
+            "choices": [
+                {"message": {"role": "assistant", "content": content}}
+            ],
+            "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": len(content) // CHARS_PER_TOKEN}
+        }
+
+    return app
+
+class StubServer:
+    """Run a stub app with uvicorn on a background thread"""
+
+    def __init__(self, app: FastAPI, port: int):
+        self.app = app
+        self.port = port
+        self.server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+        self.thread = threading.Thread(target=self.server.run, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.port}/api/v1"
+
+    def __enter__(self):
+        self.thread.start()
+        while not self.server.started:
+            time.sleep(0.05)
+        return self
+
+    def __exit__(self, *exc):
+        self.server.should_exit = True
+        self.thread.join()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local OpenRouter stub")
+    parser.add_argument("--port", type=int, default=9100)
+    parser.add_argument("--latency", type=float, default=1.0)
+    parser.add_argument("--context-tokens", type=int, default=None)
+    args = parser.parse_args()
+    uvicorn.run(create_stub_app(args.latency, args.context_tokens), host="127.0.0.1", port=args.port)
@@ -3,7 +3,7 @@
 Database initialization script
 """
 
-from app.core.database import create_tables
+from app.core.database import run_migrations
 from app.core.config import settings
 import os
 
@@ -17,7 +17,7 @@ def init_database():
     
     # Create database tables
     try:
-        create_tables()
+        run_migrations()
         print("✅ Database tables created successfully")
     except Exception as e:
         print(f"❌ Error creating database tables: {str(e)}")
@@ -7,8 +7,14 @@ from app.routers.input_sources import router as input_sources_router
 from app.routers.test_generation import router as test_generation_router
 from app.routers.script_output import router as script_output_router
 from app.routers.manual_testing import router as manual_testing_router
+from app.routers.jobs import router as jobs_router
+from app.routers.jira import router as jira_router
 from app.core.config import settings
-from app.core.database import create_tables
+from app.core.database import run_migrations, dispose_engines
+from app.core.http_client import close_http_client
+from app.core.write_coalescer import write_coalescer
+from app.services.job_queue import job_queue
+from app.services import llm_usage
 
 app = FastAPI(
     title="Scriptodon Test Automation Platform",
@@ -22,6 +28,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "Link", "Content-Disposition", "ETag"],  # pagination cursors, export filenames, script revalidation
 )
 
 # Create static directory if it doesn't exist
@@ -32,12 +39,25 @@ app.include_router(input_sources_router, prefix="/api/input-sources", tags=["Inp
 app.include_router(test_generation_router, prefix="/api/test-generation", tags=["Test Generation"])
 app.include_router(script_output_router, prefix="/api/script-output", tags=["Script Output"])
 app.include_router(manual_testing_router, prefix="/api/manual-testing", tags=["Manual Testing"])
+app.include_router(jobs_router, prefix="/api/jobs", tags=["Jobs"])
+app.include_router(jira_router, prefix="/api/jira", tags=["Jira"])
 
 @app.on_event("startup")
 async def startup_event():
-    """Initialize database tables on startup"""
-    create_tables()
+    """Apply database migrations on startup"""
+    run_migrations()
     print("Database tables initialized successfully")
+    await job_queue.start()
+    await write_coalescer.start()
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop background workers and release pooled HTTP and database connections"""
+    await job_queue.stop()
+    await write_coalescer.stop()
+    await llm_usage.flush()
+    await close_http_client()
+    await dispose_engines()
 
 @app.get("/")
 async def root():
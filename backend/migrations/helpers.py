@@ -0,0 +1,28 @@
+"""Schema checks for revisions that may meet objects which already exist.
+
+Databases created by create_tables() before migrations were introduced are
+stamped at the baseline, but the models of the time may already have added some
+of what a later revision creates. In offline (--sql) mode there is no database
+to inspect, so everything counts as missing.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+def _inspector():
+    return None if op.get_context().as_sql else sa.inspect(op.get_bind())
+
+
+def has_table(table):
+    inspector = _inspector()
+    return inspector is not None and table in inspector.get_table_names()
+
+
+def existing_columns(table):
+    inspector = _inspector()
+    return set() if inspector is None else {column['name'] for column in inspector.get_columns(table)}
+
+
+def existing_indexes(table):
+    inspector = _inspector()
+    return set() if inspector is None else {index['name'] for index in inspector.get_indexes(table)}
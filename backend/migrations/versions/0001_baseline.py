@@ -0,0 +1,93 @@
+"""baseline schema
+
+The four tables of the original schema. Databases created by create_tables()
+before migrations were introduced are stamped with this revision instead of
+running it; 0008 catches up the ones created before test runs stored results.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '0001'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+input_source_type = sa.Enum('SWAGGER', 'JIRA', 'USER_PROMPT', name='inputsourcetype')
+script_type = sa.Enum('PLAYWRIGHT_PYTHON', 'PLAYWRIGHT_SELENIUM', name='scripttype')
+test_case_status = sa.Enum('PENDING', 'PASSED', 'FAILED', 'RUNNING', name='testcasestatus')
+test_run_status = sa.Enum('RUNNING', 'COMPLETED', 'FAILED', name='testrunstatus')
+
+
+def upgrade():
+    op.create_table(
+        'input_sources',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('name', sa.String(255), nullable=False),
+        sa.Column('source_type', input_source_type, nullable=False),
+        sa.Column('content', sa.Text(), nullable=False),
+        sa.Column('file_path', sa.String(500), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.Column('jira_url', sa.String(500), nullable=True),
+        sa.Column('jira_issue_key', sa.String(100), nullable=True),
+        sa.Column('swagger_url', sa.String(500), nullable=True)
+    )
+    op.create_index('ix_input_sources_id', 'input_sources', ['id'])
+
+    op.create_table(
+        'scripts',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('name', sa.String(255), nullable=False),
+        sa.Column('script_type', script_type, nullable=False),
+        sa.Column('content', sa.Text(), nullable=False),
+        sa.Column('file_path', sa.String(500), nullable=True),
+        sa.Column('input_source_id', sa.Integer(), sa.ForeignKey('input_sources.id'), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True)
+    )
+    op.create_index('ix_scripts_id', 'scripts', ['id'])
+
+    op.create_table(
+        'test_cases',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('title', sa.String(255), nullable=False),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('steps', sa.Text(), nullable=False),
+        sa.Column('expected_result', sa.Text(), nullable=True),
+        sa.Column('status', test_case_status, nullable=True),
+        sa.Column('input_source_id', sa.Integer(), sa.ForeignKey('input_sources.id'), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.Column('is_automated', sa.Boolean(), nullable=True)
+    )
+    op.create_index('ix_test_cases_id', 'test_cases', ['id'])
+
+    op.create_table(
+        'test_runs',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('name', sa.String(255), nullable=False),
+        sa.Column('status', test_run_status, nullable=True),
+        sa.Column('total_tests', sa.Integer(), nullable=True),
+        sa.Column('passed_tests', sa.Integer(), nullable=True),
+        sa.Column('failed_tests', sa.Integer(), nullable=True),
+        sa.Column('input_source_id', sa.Integer(), sa.ForeignKey('input_sources.id'), nullable=True),
+        sa.Column('started_at', sa.DateTime(), nullable=True),
+        sa.Column('completed_at', sa.DateTime(), nullable=True),
+        sa.Column('results_summary', sa.Text(), nullable=True)
+    )
+    op.create_index('ix_test_runs_id', 'test_runs', ['id'])
+
+
+def downgrade():
+    op.drop_table('test_runs')
+    op.drop_table('test_cases')
+    op.drop_table('scripts')
+    op.drop_table('input_sources')
+    bind = op.get_bind()
+    for enum_type in (test_run_status, test_case_status, script_type, input_source_type):
+        enum_type.drop(bind, checkfirst=True)
@@ -0,0 +1,34 @@
+"""composite indexes for per-input-source queries
+
+Nearly every listing, export and status count filters on input_source_id and
+then orders or groups by time or status.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18
+"""
+from alembic import op
+
+
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+INDEXES = [
+    ('ix_test_cases_source_created', 'test_cases', ['input_source_id', 'created_at']),
+    ('ix_test_cases_source_status', 'test_cases', ['input_source_id', 'status']),
+    ('ix_test_runs_source_started', 'test_runs', ['input_source_id', 'started_at']),
+    ('ix_test_runs_source_status', 'test_runs', ['input_source_id', 'status']),
+    ('ix_scripts_source_created', 'scripts', ['input_source_id', 'created_at'])
+]
+
+
+def upgrade():
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns)
+
+
+def downgrade():
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
@@ -0,0 +1,40 @@
+"""script content hash
+
+Strong ETag for script downloads without re-hashing the content per request.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18
+"""
+import hashlib
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '0003'
+down_revision = '0002'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('scripts', sa.Column('content_hash', sa.String(64), nullable=True))
+    if op.get_context().as_sql:
+        return
+    bind = op.get_bind()
+
+    scripts = sa.table('scripts', sa.column('id', sa.Integer), sa.column('content', sa.Text), sa.column('content_hash', sa.String))
+    rows = bind.execute(
+        sa.select(scripts.c.id, scripts.c.content).where(scripts.c.content_hash.is_(None))
+    ).fetchall()
+    for script_id, content in rows:
+        bind.execute(
+            scripts.update().where(scripts.c.id == script_id)
+            .values(content_hash=hashlib.sha256(content.encode('utf-8')).hexdigest())
+        )
+
+
+def downgrade():
+    with op.batch_alter_table('scripts') as batch_op:
+        batch_op.drop_column('content_hash')
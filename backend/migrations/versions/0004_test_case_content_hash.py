@@ -0,0 +1,62 @@
+"""test case content hash
+
+Fingerprint of title and steps so generated cases can be de-duplicated per
+input source with an index lookup.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18
+"""
+import hashlib
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '0004'
+down_revision = '0003'
+branch_labels = None
+depends_on = None
+
+BACKFILL_BATCH = 5000
+
+
+def _fingerprint(title, steps):
+    # Frozen copy of app.models.test_case.test_case_fingerprint
+    return hashlib.sha256(
+        "\x00".join(" ".join(str(value or '').lower().split()) for value in (title, steps)).encode("utf-8")
+    ).hexdigest()
+
+
+def upgrade():
+    op.add_column('test_cases', sa.Column('content_hash', sa.String(64), nullable=True))
+    op.create_index('ix_test_cases_source_hash', 'test_cases', ['input_source_id', 'content_hash'])
+    if op.get_context().as_sql:
+        return
+    bind = op.get_bind()
+
+    test_cases = sa.table(
+        'test_cases',
+        sa.column('id', sa.Integer), sa.column('title', sa.String),
+        sa.column('steps', sa.Text), sa.column('content_hash', sa.String)
+    )
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.select(test_cases.c.id, test_cases.c.title, test_cases.c.steps)
+            .where(test_cases.c.id > last_id, test_cases.c.content_hash.is_(None))
+            .order_by(test_cases.c.id).limit(BACKFILL_BATCH)
+        ).fetchall()
+        if not rows:
+            break
+        bind.execute(
+            test_cases.update().where(test_cases.c.id == sa.bindparam('row_id')).values(content_hash=sa.bindparam('hash')),
+            [{'row_id': row.id, 'hash': _fingerprint(row.title, row.steps)} for row in rows]
+        )
+        last_id = rows[-1].id
+
+
+def downgrade():
+    op.drop_index('ix_test_cases_source_hash', table_name='test_cases')
+    with op.batch_alter_table('test_cases') as batch_op:
+        batch_op.drop_column('content_hash')
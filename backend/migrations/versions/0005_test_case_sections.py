@@ -0,0 +1,36 @@
+"""test case sections
+
+Section key and fingerprint of the content a test case was generated from, and
+a retirement timestamp, for incremental regeneration.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '0005'
+down_revision = '0004'
+branch_labels = None
+depends_on = None
+
+COLUMNS = (
+    ('section_key', sa.String(512)),
+    ('section_hash', sa.String(64)),
+    ('retired_at', sa.DateTime())
+)
+
+
+def upgrade():
+    for name, column_type in COLUMNS:
+        op.add_column('test_cases', sa.Column(name, column_type, nullable=True))
+    op.create_index('ix_test_cases_source_section', 'test_cases', ['input_source_id', 'section_key'])
+
+
+def downgrade():
+    op.drop_index('ix_test_cases_source_section', table_name='test_cases')
+    with op.batch_alter_table('test_cases') as batch_op:
+        for name, _ in reversed(COLUMNS):
+            batch_op.drop_column(name)
@@ -0,0 +1,33 @@
+"""jira issue cache
+
+Raw Jira issues keyed by issue key with their remote `updated` timestamp, so
+re-ingestion can skip the remote fetch and refreshes only pull changed issues.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '0006'
+down_revision = '0005'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'jira_issues',
+        sa.Column('issue_key', sa.String(100), primary_key=True),
+        sa.Column('raw', sa.Text(), nullable=False),
+        sa.Column('remote_updated_at', sa.DateTime(), nullable=True),
+        sa.Column('fetched_at', sa.DateTime(), nullable=True)
+    )
+    op.create_index('ix_jira_issues_remote_updated_at', 'jira_issues', ['remote_updated_at'])
+
+
+def downgrade():
+    op.drop_index('ix_jira_issues_remote_updated_at', table_name='jira_issues')
+    op.drop_table('jira_issues')
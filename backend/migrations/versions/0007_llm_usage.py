@@ -0,0 +1,42 @@
+"""llm usage accounting
+
+One row per completion request or LLM cache hit: model, operation, prompt and
+completion tokens, latency and outcome, aggregated by /llm-usage.
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '0007'
+down_revision = '0006'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'llm_usage',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('model', sa.String(200), nullable=False),
+        sa.Column('operation', sa.String(50), nullable=False),
+        sa.Column('prompt_tokens', sa.Integer(), nullable=False),
+        sa.Column('completion_tokens', sa.Integer(), nullable=False),
+        sa.Column('estimated', sa.Boolean(), nullable=False),
+        sa.Column('latency_ms', sa.Integer(), nullable=False),
+        sa.Column('cached', sa.Boolean(), nullable=False),
+        sa.Column('truncated', sa.Boolean(), nullable=False),
+        sa.Column('error', sa.Text(), nullable=True)
+    )
+    op.create_index('ix_llm_usage_id', 'llm_usage', ['id'])
+    op.create_index('ix_llm_usage_created_at', 'llm_usage', ['created_at'])
+
+
+def downgrade():
+    op.drop_index('ix_llm_usage_created_at', table_name='llm_usage')
+    op.drop_index('ix_llm_usage_id', table_name='llm_usage')
+    op.drop_table('llm_usage')
@@ -0,0 +1,90 @@
+"""test run results and duration history
+
+Script and timing columns on test_runs, per-case results and per-case duration
+statistics, added to the models before migrations were introduced. Databases
+created by create_tables() at that time may already have any of them.
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from migrations.helpers import existing_columns, existing_indexes, has_table
+
+
+revision = '0008'
+down_revision = '0007'
+branch_labels = None
+depends_on = None
+
+test_case_status = sa.Enum('PENDING', 'PASSED', 'FAILED', 'RUNNING', name='testcasestatus', create_type=False)
+
+TEST_RUN_COLUMNS = (
+    ('script_id', sa.Integer()),
+    ('output_log', sa.Text()),
+    ('execution_time', sa.Float()),
+    ('throughput_per_minute', sa.Float()),
+    ('shard_count', sa.Integer()),
+    ('estimated_duration', sa.Float())
+)
+
+RESULT_INDEXES = [
+    ('ix_test_case_results_id', ['id']),
+    ('ix_test_case_results_test_run_id', ['test_run_id']),
+    ('ix_test_case_results_test_case_id', ['test_case_id'])
+]
+
+
+def upgrade():
+    missing = [(name, column_type) for name, column_type in TEST_RUN_COLUMNS if name not in existing_columns('test_runs')]
+    if missing:
+        # SQLite can only add the script_id foreign key by copying the table
+        with op.batch_alter_table('test_runs') as batch_op:
+            for name, column_type in missing:
+                batch_op.add_column(sa.Column(name, column_type, nullable=True))
+                if name == 'script_id':
+                    batch_op.create_foreign_key('fk_test_runs_script_id', 'scripts', ['script_id'], ['id'])
+
+    if not has_table('test_case_results'):
+        op.create_table(
+            'test_case_results',
+            sa.Column('id', sa.Integer(), primary_key=True),
+            sa.Column('test_run_id', sa.Integer(), sa.ForeignKey('test_runs.id'), nullable=False),
+            sa.Column('test_case_id', sa.Integer(), sa.ForeignKey('test_cases.id'), nullable=False),
+            sa.Column('status', test_case_status, nullable=False),
+            sa.Column('execution_time', sa.Float(), nullable=False),
+            sa.Column('error_message', sa.Text(), nullable=True),
+            sa.Column('shard', sa.Integer(), nullable=True),
+            sa.Column('completed_at', sa.DateTime(), nullable=True)
+        )
+    indexes = existing_indexes('test_case_results') if has_table('test_case_results') else set()
+    for name, columns in RESULT_INDEXES:
+        if name not in indexes:
+            op.create_index(name, 'test_case_results', columns)
+
+    if not has_table('test_case_durations'):
+        op.create_table(
+            'test_case_durations',
+            sa.Column('test_case_id', sa.Integer(), sa.ForeignKey('test_cases.id'), primary_key=True),
+            sa.Column('sample_count', sa.Integer(), nullable=False),
+            sa.Column('mean_duration', sa.Float(), nullable=False),
+            sa.Column('p95_duration', sa.Float(), nullable=False),
+            sa.Column('recent_durations', sa.Text(), nullable=False),
+            sa.Column('run_count', sa.Integer(), nullable=False),
+            sa.Column('fail_count', sa.Integer(), nullable=False),
+            sa.Column('flip_count', sa.Integer(), nullable=False),
+            sa.Column('last_status', sa.String(20), nullable=True),
+            sa.Column('updated_at', sa.DateTime(), nullable=True)
+        )
+
+
+def downgrade():
+    op.drop_table('test_case_durations')
+    for name, _ in reversed(RESULT_INDEXES):
+        op.drop_index(name, table_name='test_case_results')
+    op.drop_table('test_case_results')
+    with op.batch_alter_table('test_runs') as batch_op:
+        for name, _ in reversed(TEST_RUN_COLUMNS):
+            batch_op.drop_column(name)
@@ -1,10 +1,10 @@
 import uvicorn
 import os
-from app.core.database import create_tables
+from app.core.database import run_migrations
 
 def main():
     print("Initializing Scriptodon Test Automation Platform...")
-    create_tables()
+    run_migrations()
     print("Database tables created successfully!")
     
     # Get port from environment (Render sets PORT env var)
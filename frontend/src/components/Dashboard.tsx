@@ -214,8 +214,7 @@ const Dashboard: React.FC = () => {
   const handleExportCSV = async (inputSourceId: number) => {
     try {
       setLoading(true);
-      const result = await apiService.exportTestCasesCSV(inputSourceId);
-      apiService.downloadCSV(result.content, result.filename);
+      await apiService.exportTestCasesCSV(inputSourceId);
       setError(null);
     } catch (err) {
       setError(`Failed to export CSV: ${err instanceof Error ? err.message : 'Unknown error'}`);
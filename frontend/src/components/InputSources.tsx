@@ -218,11 +218,17 @@ const InputSources: React.FC = () => {
     }
   };
 
-  const handleViewSource = (source: InputSource) => {
+  const handleViewSource = async (source: InputSource) => {
     // For now, just show the content in an alert
     // In a real app, you'd want to show this in a modal or separate page
-    const content = source.content ? JSON.stringify(JSON.parse(source.content), null, 2) : 'No content';
-    alert(`Input Source: ${source.name}\n\nContent:\n${content}`);
+    // The list endpoint omits content, so fetch the full source on demand
+    try {
+      const detail = source.content ? source : await inputSourcesService.getInputSource(source.id);
+      const content = detail.content ? JSON.stringify(JSON.parse(detail.content), null, 2) : 'No content';
+      alert(`Input Source: ${source.name}\n\nContent:\n${content}`);
+    } catch (err) {
+      setError(err instanceof Error ? err.message : 'Failed to load input source');
+    }
   };
 
   const handleDeleteSource = async (sourceId: number) => {
@@ -102,14 +102,37 @@ export class ApiService {
     }
   }
 
+  // Follow X-Next-Cursor headers of a keyset-paginated list endpoint and concatenate the pages
+  private async fetchAllPages<T>(endpoint: string): Promise<T[]> {
+    const items: T[] = [];
+    let cursor: string | null = null;
+    do {
+      const separator = endpoint.includes('?') ? '&' : '?';
+      const pageEndpoint: string = cursor ? `${endpoint}${separator}cursor=${encodeURIComponent(cursor)}` : endpoint;
+      const response = await fetch(`${this.baseUrl}${pageEndpoint}`, {
+        headers: { 'Content-Type': 'application/json' },
+      });
+      if (!response.ok) {
+        const errorData = await response.json().catch(() => ({}));
+        const error = new Error(errorData.detail || `HTTP error! status: ${response.status}`);
+        console.error(`API Error (${pageEndpoint}):`, error);
+        throw error;
+      }
+      items.push(...(await response.json()));
+      cursor = response.headers.get('X-Next-Cursor');
+    } while (cursor);
+    return items;
+  }
+
   // Health Check
   async healthCheck(): Promise<{ status: string; service: string }> {
     return this.fetchApi('/health');
   }
 
   // Input Sources API
+  // List items carry no `content`; use getInputSource(id) for it
   async getInputSources(): Promise<any[]> {
-    return this.fetchApi('/api/input-sources/');
+    return this.fetchAllPages('/api/input-sources/');
   }
 
   async getInputSource(id: number): Promise<any> {
@@ -229,11 +252,11 @@ export class ApiService {
   }
 
   async getTestCases(inputSourceId: number): Promise<any[]> {
-    return this.fetchApi(`/api/test-generation/test-cases/${inputSourceId}`);
+    return this.fetchAllPages(`/api/test-generation/test-cases/${inputSourceId}`);
   }
 
   async getTestRuns(inputSourceId: number): Promise<any[]> {
-    return this.fetchApi(`/api/test-generation/test-runs/${inputSourceId}`);
+    return this.fetchAllPages(`/api/test-generation/test-runs/${inputSourceId}`);
   }
 
   // Script Output API
@@ -276,17 +299,31 @@ export class ApiService {
     });
   }
 
-  async exportTestCasesCSV(inputSourceId: number): Promise<any> {
-    return this.fetchApi(`/api/manual-testing/test-cases/${inputSourceId}/csv`);
+  // Exports stream a file (CSV by default; format can also be 'ndjson' or 'parquet')
+  async exportTestCasesCSV(inputSourceId: number, format: string = 'csv'): Promise<void> {
+    return this.downloadExport(`/api/manual-testing/test-cases/${inputSourceId}/export?format=${format}&gzip=true`);
   }
 
-  async exportTestRunsCSV(inputSourceId: number): Promise<any> {
-    return this.fetchApi(`/api/manual-testing/test-runs/${inputSourceId}/csv`);
+  async exportTestRunsCSV(inputSourceId: number, format: string = 'csv'): Promise<void> {
+    return this.downloadExport(`/api/manual-testing/test-runs/${inputSourceId}/export?format=${format}&gzip=true`);
+  }
+
+  // Fetch a streamed export and save it under the server-provided filename
+  private async downloadExport(endpoint: string): Promise<void> {
+    const response = await fetch(`${this.baseUrl}${endpoint}`);
+    if (!response.ok) {
+      const errorData = await response.json().catch(() => ({}));
+      const error = new Error(errorData.detail || `HTTP error! status: ${response.status}`);
+      console.error(`API Error (${endpoint}):`, error);
+      throw error;
+    }
+    const disposition = response.headers.get('Content-Disposition') || '';
+    const filename = /filename="([^"]+)"/.exec(disposition)?.[1] || 'export';
+    this.downloadFile(await response.blob(), filename);
   }
 
-  // Utility method to download CSV
-  downloadCSV(csvContent: string, filename: string): void {
-    const blob = new Blob([csvContent], { type: 'text/csv' });
+  // Utility method to save a blob as a file
+  downloadFile(blob: Blob, filename: string): void {
     const url = window.URL.createObjectURL(blob);
     const a = document.createElement('a');
     a.href = url;
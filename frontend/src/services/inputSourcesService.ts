@@ -4,7 +4,7 @@ export interface InputSource {
   id: number;
   name: string;
   source_type: string;
-  content: string;
+  content?: string;  // only returned by the detail endpoint and on create
   url?: string;
   project_id: number;
   created_at: string;